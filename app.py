@@ -10,18 +10,17 @@ Developed by: Python Code Gear-1 with Claude Sonnet
 import sys
 import os
 import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
+from tkinter import messagebox
 
 # إضافة مسار المشروع إلى sys.path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 # استيراد الوحدات المحلية
+# وحدات المعالجة (core) تُحمّل بعد رسم النافذة في finish_startup وليس هنا
 try:
     from ui.main_window import MainWindow
     from config.settings import AppConfig
-    from core.media_processor import MediaProcessor
 except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
@@ -34,8 +33,12 @@ class MediaCutProApp:
         self.root = None
         self.main_window = None
         self.config = None
-        self.media_processor = None
         
+    @property
+    def media_processor(self):
+        """معالج الوسائط الذي تملكه النافذة الرئيسية (None قبل إنشائه)"""
+        return self.main_window.media_processor if self.main_window else None
+    
     def initialize(self):
         """تهيئة مكونات التطبيق"""
         try:
@@ -46,11 +49,12 @@ class MediaCutProApp:
             self.root = tk.Tk()
             self.setup_root_window()
             
-            # تهيئة معالج الوسائط
-            self.media_processor = MediaProcessor(self.config)
+            # تهيئة واجهة المستخدم (بدون معالج الوسائط)
+            self.main_window = MainWindow(self.root, self.config)
             
-            # تهيئة واجهة المستخدم
-            self.main_window = MainWindow(self.root, self.config, self.media_processor)
+            # إكمال التهيئة بعد أول رسم للنافذة: after_idle يأتي بعد أحداث الرسم
+            # المنتظرة، وafter(0) داخله يترك حلقة الأحداث ترسم قبل التحميل الثقيل
+            self.root.after_idle(lambda: self.root.after(0, self.finish_startup))
             
             return True
             
@@ -58,6 +62,18 @@ class MediaCutProApp:
             messagebox.showerror("Initialization Error", f"Failed to initialize application:\n{str(e)}")
             return False
     
+    def finish_startup(self):
+        """تحميل وحدات المعالجة والتحقق من FFmpeg بعد ظهور النافذة"""
+        try:
+            self.main_window.get_media_processor()
+        except Exception as e:
+            messagebox.showerror("Initialization Error", f"Failed to initialize application:\n{str(e)}")
+            return
+        
+        is_valid, message = self.config.validate_ffmpeg_installation()
+        if not is_valid:
+            self.main_window.status_var.set(f"⚠️ {message}")
+    
     def setup_root_window(self):
         """إعداد النافذة الجذرية"""
         if self.root:
@@ -118,8 +134,10 @@ class MediaCutProApp:
         """معالج حدث إغلاق التطبيق"""
         try:
             # إيقاف أي عمليات جارية
-            if self.media_processor and hasattr(self.media_processor, 'stop_processing'):
-                self.media_processor.stop_processing()
+            # النافذة قد تنشئ المعالج قبل finish_startup إذا بدأ المستخدم مهمة مبكراً
+            media_processor = self.media_processor
+            if media_processor and hasattr(media_processor, 'stop_processing'):
+                media_processor.stop_processing()
             
             # إغلاق النافذة
             if self.root:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Cancel Latency Check
+====================================
+
+Starts a split job, calls MediaProcessor.stop_processing() while FFmpeg is
+running and measures how long it takes until every FFmpeg process is gone and
+the completion callback has fired. Exits with status 1 when the latency exceeds
+the bound, so it can be used as a regression check.
+
+Usage:
+    python benchmarks/cancel_latency.py --bound 0.5
+    python benchmarks/cancel_latency.py --input recording.mkv --split-mode per_segment
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+
+
+def generate_input(config, work_dir, duration):
+    """Generate a long, cheap-to-encode synthetic input"""
+    path = os.path.join(work_dir, f"synthetic_{int(duration)}s.mkv")
+    cmd = [
+        config.ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=160x120:rate=25:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=22050:duration={duration}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", "250",
+        "-c:a", "aac", "-shortest", path
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def measure(processor, input_file, output_dir, split_mode, delay):
+    """Run one job, cancel it after `delay` seconds of FFmpeg activity, return latencies"""
+    os.makedirs(output_dir, exist_ok=True)
+    finished = threading.Event()
+    processor.set_completion_callback(lambda success, message, path: finished.set())
+
+    worker = threading.Thread(
+        target=processor.process_media_file,
+        args=(input_file, 1, "mkv", output_dir, split_mode),
+        daemon=True
+    )
+    worker.start()
+
+    # Wait until FFmpeg is actually running
+    deadline = time.monotonic() + 30
+    while processor.process_registry.active_count() == 0:
+        if finished.is_set() or time.monotonic() > deadline:
+            return None
+        time.sleep(0.005)
+    time.sleep(delay)
+
+    started = time.perf_counter()
+    processor.stop_processing()
+
+    while processor.process_registry.active_count() > 0:
+        time.sleep(0.001)
+    processes_gone = time.perf_counter() - started
+
+    finished.wait(timeout=30)
+    worker.join(timeout=30)
+    job_returned = time.perf_counter() - started
+
+    return processes_gone, job_returned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cancellation latency check")
+    parser.add_argument("--input", help="Existing media file (default: synthetic input)")
+    parser.add_argument("--duration", type=float, default=3600, help="Synthetic input duration in seconds")
+    parser.add_argument("--split-mode", default="single_pass", choices=("single_pass", "per_segment"))
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds to let FFmpeg run before cancelling")
+    parser.add_argument("--bound", type=float, default=0.5, help="Maximum accepted latency in seconds")
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    if args.ffmpeg:
+        config.ffmpeg_path = args.ffmpeg
+    if args.ffprobe:
+        config.ffprobe_path = args.ffprobe
+    processor = MediaProcessor(config)
+
+    work_dir = tempfile.mkdtemp(prefix="mediacut_cancel_")
+    try:
+        input_file = args.input or generate_input(config, work_dir, args.duration)
+        result = measure(processor, input_file, os.path.join(work_dir, "out"), args.split_mode, args.delay)
+        if result is None:
+            print("❌ The job finished before it could be cancelled; use a longer input")
+            sys.exit(1)
+
+        processes_gone, job_returned = result
+        leftovers = []
+        for root, _, files in os.walk(os.path.join(work_dir, "out")):
+            leftovers.extend(files)
+
+        print(f"⏹️  processes gone after {processes_gone * 1000:.1f} ms")
+        print(f"⏹️  job returned after  {job_returned * 1000:.1f} ms")
+        print(f"📁 files left in output dir: {len(leftovers)}")
+
+        if job_returned > args.bound:
+            print(f"❌ cancel latency above bound ({args.bound * 1000:.0f} ms)")
+            sys.exit(1)
+        print(f"✅ cancel latency within bound ({args.bound * 1000:.0f} ms)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Batch Probe Benchmark
+=====================================
+
+Measures how many files per second can be probed:
+
+- sequential/default:     one ffprobe after another with subprocess defaults
+- sequential/posix_spawn: one after another with close_fds=False, which lets
+                          subprocess use posix_spawn
+- probe_many/N:           ProbeCache.get_many with N concurrent ffprobe processes,
+                          using the platform's SPAWN_OPTIONS
+
+ffprobe accepts a single input per run, so batching means overlapping the
+process start-up of many runs rather than passing many paths to one run.
+The two sequential rows show which spawn options are faster on this host
+(process_registry.SPAWN_OPTIONS picks posix_spawn only where it usually wins).
+
+Usage:
+    python benchmarks/probe_benchmark.py --files 500 --workers 4 8 16
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core import process_registry
+from core.probe_cache import ProbeCache
+from benchmarks.synthetic_media import generate_media
+
+
+def make_files(source, work_dir, count):
+    """Create `count` distinct paths with the same content (hard links when possible)"""
+    extension = os.path.splitext(source)[1]
+    paths = []
+    for i in range(count):
+        path = os.path.join(work_dir, f"probe_{i:05d}{extension}")
+        try:
+            os.link(source, path)
+        except OSError:
+            shutil.copyfile(source, path)
+        paths.append(path)
+    return paths
+
+
+def run_sequential(ffprobe_path, paths, spawn_options):
+    """Probe every file one after another and return files per second"""
+    saved = process_registry.SPAWN_OPTIONS
+    process_registry.SPAWN_OPTIONS = spawn_options
+    try:
+        cache = ProbeCache(len(paths))
+        started = time.perf_counter()
+        ok = sum(1 for path in paths if cache.get(ffprobe_path, path) is not None)
+        elapsed = time.perf_counter() - started
+    finally:
+        process_registry.SPAWN_OPTIONS = saved
+    return ok, len(paths) / elapsed
+
+
+def run_batch(ffprobe_path, paths, workers):
+    """Probe all files with ProbeCache.get_many and return files per second"""
+    cache = ProbeCache(len(paths))
+    started = time.perf_counter()
+    results = cache.get_many(ffprobe_path, paths, workers=workers)
+    elapsed = time.perf_counter() - started
+    return sum(1 for probe in results.values() if probe is not None), len(paths) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch probe throughput benchmark")
+    parser.add_argument("--files", type=int, default=200, help="Number of files to probe")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Concurrent ffprobe processes for probe_many")
+    parser.add_argument("--input", help="Existing media file to probe (default: synthetic input)")
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    ffmpeg_path = args.ffmpeg or config.ffmpeg_path
+    ffprobe_path = args.ffprobe or config.ffprobe_path
+
+    work_dir = tempfile.mkdtemp(prefix="mediacut_probe_")
+    try:
+        source = args.input or generate_media(ffmpeg_path, work_dir, "h264_multi_mkv", 10)
+        paths = make_files(source, work_dir, args.files)
+        print(f"📁 {args.files} files, {os.cpu_count()} CPUs")
+
+        rows = [
+            ("sequential/default", run_sequential(ffprobe_path, paths, {})),
+            ("sequential/posix_spawn", run_sequential(ffprobe_path, paths, {"close_fds": False})),
+        ]
+        for workers in args.workers:
+            rows.append((f"probe_many/{workers}", run_batch(ffprobe_path, paths, workers)))
+
+        baseline = rows[0][1][1]
+        print(f"{'mode':>23} {'files/s':>9} {'speedup':>8} {'ok':>6}")
+        for name, (ok, rate) in rows:
+            print(f"{name:>23} {rate:>9.1f} {rate / baseline:>7.2f}x {ok:>6d}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Seek Benchmark
+==============================
+
+Measures the per-segment cost of MediaProcessor.build_ffmpeg_command for each
+seek mode. With output-side seeking (the legacy behaviour) the time of a
+segment grows with its index because FFmpeg demuxes everything before it; with
+input-side seeking ("fast") the time should stay flat.
+
+Usage:
+    python benchmarks/seek_benchmark.py --duration 1800 --segment 60
+    python benchmarks/seek_benchmark.py --input recording.mkv --segment 600
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+
+SEEK_MODES = ("output", "fast", "accurate")
+
+
+def generate_input(config, work_dir, duration):
+    """Generate a synthetic H.264/AAC input with FFmpeg's lavfi sources"""
+    path = os.path.join(work_dir, f"synthetic_{int(duration)}s.mp4")
+    cmd = [
+        config.ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=320x240:rate=25:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={duration}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", "50",
+        "-c:a", "aac", "-shortest", path
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def run_mode(processor, input_file, work_dir, segments, seek_mode, output_format):
+    """Run every segment with the given seek mode and return per-segment timings"""
+    timings = []
+    for i, (start, end) in enumerate(segments):
+        output_file = os.path.join(work_dir, f"{seek_mode}_{i + 1:03d}.{output_format}")
+        cmd = processor.build_ffmpeg_command(
+            input_file, output_file, start, end - start, output_format, seek_mode=seek_mode
+        )
+        started = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - started)
+        os.remove(output_file)
+    return timings
+
+
+def print_report(results):
+    """Print per-segment timings and the first/last ratio for each mode"""
+    modes = list(results)
+    print(f"{'segment':>8} " + " ".join(f"{mode:>10}" for mode in modes))
+    for i in range(len(results[modes[0]])):
+        print(f"{i + 1:>8} " + " ".join(f"{results[mode][i]:>10.3f}" for mode in modes))
+
+    print("-" * 60)
+    for mode in modes:
+        timings = results[mode]
+        head = sum(timings[:3]) / len(timings[:3])
+        tail = sum(timings[-3:]) / len(timings[-3:])
+        print(f"{mode:>10}: total {sum(timings):7.2f}s  "
+              f"first {head:.3f}s  last {tail:.3f}s  last/first x{tail / head:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-segment seek cost benchmark")
+    parser.add_argument("--input", help="Existing media file (default: synthetic input)")
+    parser.add_argument("--duration", type=float, default=1800, help="Synthetic input duration in seconds")
+    parser.add_argument("--segment", type=float, default=60, help="Segment duration in seconds")
+    parser.add_argument("--format", default="mp4", help="Output format")
+    parser.add_argument("--modes", nargs="+", default=list(SEEK_MODES), choices=SEEK_MODES)
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    if args.ffmpeg:
+        config.ffmpeg_path = args.ffmpeg
+    if args.ffprobe:
+        config.ffprobe_path = args.ffprobe
+    processor = MediaProcessor(config)
+
+    work_dir = tempfile.mkdtemp(prefix="mediacut_seek_")
+    try:
+        input_file = args.input or generate_input(config, work_dir, args.duration)
+        media_info = processor.get_media_info(input_file)
+        if not media_info:
+            print(f"❌ Could not probe {input_file}")
+            sys.exit(1)
+
+        segments = processor.calculate_segments(media_info['duration'], args.segment / 60)
+        print(f"📁 {input_file}: {media_info['duration']:.1f}s, {len(segments)} segments")
+
+        results = {}
+        for mode in args.modes:
+            results[mode] = run_mode(processor, input_file, work_dir, segments, mode, args.format)
+        print_report(results)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Smart Cut Benchmark
+===================================
+
+Compares the three codec modes of MediaProcessor on the same input:
+
+- copy:      stream copy, cut points snap back to the previous keyframe
+- smart:     re-encode only the boundary GOPs, stream-copy the interior
+- transcode: re-encode every segment with the quality presets
+
+For each mode it reports wall time, throughput (x realtime), the worst
+difference between a part's duration and the requested one, and how many
+video frames were duplicated or lost across all parts.
+
+Usage:
+    python benchmarks/smart_cut_benchmark.py --duration 600 --segment 45 --gop 10
+    python benchmarks/smart_cut_benchmark.py --input recording.mp4 --segment 300
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+
+CODEC_MODES = ("copy", "smart", "transcode")
+
+
+def generate_input(config, work_dir, duration, gop_seconds):
+    """Generate a synthetic H.264/AAC input with long GOPs"""
+    path = os.path.join(work_dir, f"synthetic_{int(duration)}s.mp4")
+    cmd = [
+        config.ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=640x360:rate=25:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={duration}",
+        "-c:v", "libx264", "-preset", "veryfast", "-g", str(int(gop_seconds * 25)),
+        "-c:a", "aac", "-shortest", path
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def probe_part(config, path):
+    """Return (duration, video frame count) of an output part"""
+    cmd = [
+        config.ffprobe_path, "-v", "error", "-select_streams", "v:0", "-count_packets",
+        "-show_entries", "stream=nb_read_packets:format=duration", "-of", "csv=p=0", path
+    ]
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.split()
+    frames = int(output[0].strip(","))
+    duration = float(output[1].strip(","))
+    return duration, frames
+
+
+def run_mode(config, input_file, work_dir, segment_minutes, mode, output_format):
+    """Split the whole input in one codec mode and return its measurements"""
+    config.processing_settings["codec_mode"] = mode
+    processor = MediaProcessor(config)
+    output_dir = os.path.join(work_dir, mode)
+    os.makedirs(output_dir, exist_ok=True)
+
+    media_info = processor.get_media_info(input_file)
+    segments = processor.calculate_segments(media_info["duration"], segment_minutes, input_file)
+
+    started = time.perf_counter()
+    ok = processor.process_media_file(
+        input_file, segment_minutes, output_format, output_dir, split_mode="per_segment"
+    )
+    elapsed = time.perf_counter() - started
+    if not ok:
+        return None
+
+    parts_dir = processor.create_output_directory(input_file, output_format, output_dir)
+    duration_error = 0.0
+    total_frames = 0
+    for i, (start, end) in enumerate(segments):
+        part = processor.generate_output_filename(input_file, parts_dir, i + 1, output_format)
+        duration, frames = probe_part(config, part)
+        duration_error = max(duration_error, abs(duration - (end - start)))
+        total_frames += frames
+
+    return {
+        "elapsed": elapsed,
+        "realtime": media_info["duration"] / elapsed,
+        "duration_error": duration_error,
+        "frames": total_frames
+    }
+
+
+def print_report(results, source_frames):
+    """Print one row per codec mode"""
+    print(f"{'mode':>10} {'wall':>9} {'x realtime':>11} {'max part error':>15} {'frame delta':>12}")
+    for mode, result in results.items():
+        if result is None:
+            print(f"{mode:>10} {'failed':>9}")
+            continue
+        print(f"{mode:>10} {result['elapsed']:>8.2f}s {result['realtime']:>10.1f}x "
+              f"{result['duration_error']:>14.3f}s {result['frames'] - source_frames:>+12d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy vs smart vs transcode benchmark")
+    parser.add_argument("--input", help="Existing H.264/HEVC media file (default: synthetic input)")
+    parser.add_argument("--duration", type=float, default=300, help="Synthetic input duration in seconds")
+    parser.add_argument("--gop", type=float, default=10, help="Synthetic keyframe interval in seconds")
+    parser.add_argument("--segment", type=float, default=45, help="Segment duration in seconds")
+    parser.add_argument("--format", default="mp4", help="Output format")
+    parser.add_argument("--modes", nargs="+", default=list(CODEC_MODES), choices=CODEC_MODES)
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    if args.ffmpeg:
+        config.ffmpeg_path = args.ffmpeg
+    if args.ffprobe:
+        config.ffprobe_path = args.ffprobe
+
+    work_dir = tempfile.mkdtemp(prefix="mediacut_smart_")
+    try:
+        input_file = args.input or generate_input(config, work_dir, args.duration, args.gop)
+        _, source_frames = probe_part(config, input_file)
+        print(f"📁 {input_file}: {source_frames} video frames, {args.segment:.0f}s segments")
+
+        results = {}
+        for mode in args.modes:
+            results[mode] = run_mode(config, input_file, work_dir, args.segment / 60, mode, args.format)
+        print_report(results, source_frames)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
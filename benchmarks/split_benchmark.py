@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Split Benchmark Suite
+=====================================
+
+Runs MediaProcessor.process_media_file and the segment planners against
+synthetic inputs (see synthetic_media.py) and records, per case:
+
+- wall:        wall-clock time of the operation
+- spawns:      FFmpeg/FFprobe processes started (ProcessRegistry.spawn_count)
+- bytes_read:  bytes read by this process and its FFmpeg children (Linux /proc/self/io)
+- peak_rss:    peak resident set size of the largest FFmpeg child, in KiB
+- realtime:    media duration / wall time
+
+Each case runs in a fresh Python process so peak RSS and I/O counters are
+not shared between cases. Results are written as JSON together with the git
+commit, so two runs can be compared with --compare. A failed case is reported
+with its error and makes the run exit with status 1.
+
+Usage:
+    python benchmarks/split_benchmark.py --durations 60 600 --output results.json
+    python benchmarks/split_benchmark.py --profiles h264_multi_mkv --operations split:per_segment plan:scene
+    python benchmarks/split_benchmark.py --output after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+from benchmarks.synthetic_media import PROFILES, generate_media
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+OPERATIONS = (
+    "split:single_pass", "split:per_segment",
+    "plan:keyframe", "plan:silence", "plan:scene",
+)
+
+
+def read_process_io():
+    """Read this process's I/O counters, which include reaped children (Linux only)"""
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f if ": " in line)}
+    except OSError:
+        return None
+
+
+def children_peak_rss():
+    """Peak RSS of the largest waited-for child process in KiB, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def applies(operation, profile):
+    """Whether an operation makes sense for a profile"""
+    spec = PROFILES[profile]
+    if operation in ("plan:keyframe", "plan:scene"):
+        return spec["video"] is not None
+    return True
+
+
+def run_case(case):
+    """Run one case in the current process and return its measurements"""
+    config = AppConfig()
+    config.ffmpeg_path = case["ffmpeg"]
+    config.ffprobe_path = case["ffprobe"]
+    settings = config.processing_settings
+    settings["codec_mode"] = case["codec_mode"]
+    settings["index_cache_max_mb"] = 0    # measure real planning work, not cache hits
+    if case["jobs"]:
+        settings["max_concurrent_processes"] = case["jobs"]
+
+    kind, mode = case["operation"].split(":")
+    media_info = MediaProcessor(config).get_media_info(case["input"])
+    if not media_info:
+        return {"error": "probe failed"}
+    duration = media_info["duration"]
+
+    processor = MediaProcessor(config)
+    output_dir = tempfile.mkdtemp(prefix="mediacut_bench_")
+    result = {}
+
+    io_before = read_process_io()
+    started = time.perf_counter()
+    try:
+        if kind == "split":
+            ok = processor.process_media_file(
+                case["input"], case["segment"] / 60, case["format"], output_dir, split_mode=mode
+            )
+            if not ok:
+                result["error"] = "split failed"
+        else:
+            settings["segment_planner"] = mode
+            segments = processor.calculate_segments(duration, case["segment"] / 60, case["input"])
+            result["segments"] = len(segments)
+        elapsed = time.perf_counter() - started
+        io_after = read_process_io()
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    result.update({
+        "wall": elapsed,
+        "spawns": processor.process_registry.spawn_count,
+        "bytes_read": io_after["rchar"] - io_before["rchar"] if io_before and io_after else None,
+        "bytes_written": io_after["wchar"] - io_before["wchar"] if io_before and io_after else None,
+        "peak_rss": children_peak_rss(),
+        "realtime": duration / elapsed if elapsed > 0 else None,
+    })
+    return result
+
+
+def run_isolated(case):
+    """Run a case in a fresh interpreter and return its measurements"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": completed.stderr.strip().splitlines()[-1:] or "case failed"}
+    return json.loads(lines[-1])
+
+
+def ffmpeg_version(ffmpeg_path):
+    """First line of `ffmpeg -version`"""
+    try:
+        output = subprocess.run([ffmpeg_path, "-version"], capture_output=True, text=True).stdout
+    except OSError:
+        return None
+    return output.splitlines()[0] if output else None
+
+
+def git_commit():
+    """Current commit of the project, if it is a git checkout"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return output.stdout.strip() or None
+
+
+def case_key(result):
+    """Identity of a case across runs"""
+    return f"{result['profile']}/{int(result['duration'])}s/{result['operation']}"
+
+
+def print_report(results, baseline=None):
+    """Print one row per case, with the wall-time ratio to a baseline run"""
+    previous = {case_key(result): result for result in (baseline or {}).get("results", [])}
+    header = (f"{'case':<42} {'wall':>8} {'x realtime':>11} {'spawns':>7} "
+              f"{'read MiB':>9} {'peak RSS MiB':>13}")
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+
+    for result in results:
+        key = case_key(result)
+        if result.get("error"):
+            print(f"{key:<42} {'failed':>8}  {result['error']}")
+            continue
+        read = f"{result['bytes_read'] / 2 ** 20:.1f}" if result["bytes_read"] is not None else "-"
+        rss = f"{result['peak_rss'] / 1024:.1f}" if result["peak_rss"] is not None else "-"
+        row = (f"{key:<42} {result['wall']:>7.2f}s {result['realtime']:>10.1f}x "
+               f"{result['spawns']:>7d} {read:>9} {rss:>13}")
+        old = previous.get(key)
+        if old and not old.get("error"):
+            row += f" {result['wall'] / old['wall']:>7.2f}x"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split throughput benchmark suite")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--durations", nargs="+", type=float, default=[60, 600],
+                        help="Synthetic input durations in seconds")
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS), choices=OPERATIONS)
+    parser.add_argument("--segment", type=float, default=60, help="Segment duration in seconds")
+    parser.add_argument("--gop", type=float, default=2.0, help="Synthetic keyframe interval in seconds")
+    parser.add_argument("--codec-mode", default="copy", choices=("copy", "transcode", "smart"))
+    parser.add_argument("-j", "--jobs", type=int, help="max_concurrent_processes")
+    parser.add_argument("--work-dir", help="Directory for generated media (kept and reused between runs)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file from an earlier run")
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    config = AppConfig()
+    ffmpeg_path = args.ffmpeg or config.ffmpeg_path
+    ffprobe_path = args.ffprobe or config.ffprobe_path
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="mediacut_suite_")
+
+    results = []
+    try:
+        for profile in args.profiles:
+            for duration in args.durations:
+                input_file = generate_media(ffmpeg_path, work_dir, profile, duration, args.gop)
+                for operation in args.operations:
+                    if not applies(operation, profile):
+                        continue
+                    case = {
+                        "profile": profile, "duration": duration, "operation": operation,
+                        "input": input_file, "format": PROFILES[profile]["container"],
+                        "segment": args.segment, "codec_mode": args.codec_mode, "jobs": args.jobs,
+                        "ffmpeg": ffmpeg_path, "ffprobe": ffprobe_path
+                    }
+                    result = {key: case[key] for key in ("profile", "duration", "operation")}
+                    result["input_size"] = os.path.getsize(input_file)
+                    result.update(run_isolated(case))
+                    results.append(result)
+                    status = "failed" if result.get("error") else f"{result['wall']:.2f}s"
+                    print(f"⏱ {case_key(result)}: {status}")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    try:
+        import numpy  # noqa: F401 - the silence and scene planners fall back without it
+        has_numpy = True
+    except ImportError:
+        has_numpy = False
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": ffmpeg_version(ffmpeg_path),
+            "numpy": has_numpy,
+            "segment": args.segment,
+            "codec_mode": args.codec_mode,
+            "jobs": args.jobs
+        },
+        "results": results
+    }
+
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 {args.output}")
+
+    failed = [case_key(result) for result in results if result.get("error")]
+    if failed:
+        print(f"❌ {len(failed)} case(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
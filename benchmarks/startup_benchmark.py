@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Startup Benchmark
+=================================
+
+Measures the cold start of the GUI, each run in a fresh interpreter:
+
+- import:      time to import app.py (its module-level imports only)
+- first_paint: from the start of that import to the main window being viewable
+- ready:       until the media processor is loaded (MediaCutProApp.finish_startup)
+
+It also reports the slowest modules from `python -X importtime -c "import app"`,
+so a new eager import shows up by name. first_paint and ready need a display;
+without one only the import numbers are reported.
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 10 --output startup.json
+    python benchmarks/startup_benchmark.py --compare startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+METRICS = ("import", "first_paint", "ready")
+
+
+def run_startup():
+    """Start the application in this process and return its timings in ms"""
+    started = time.perf_counter()
+    import app
+    imported = time.perf_counter()
+    result = {"import": (imported - started) * 1000}
+
+    application = app.MediaCutProApp()
+    try:
+        if not application.initialize():
+            return {**result, "error": "initialize failed"}
+    except Exception as e:
+        return {**result, "error": f"{type(e).__name__}: {e}"}
+
+    root = application.root
+    deadline = time.perf_counter() + 30
+    try:
+        while not root.winfo_viewable() and time.perf_counter() < deadline:
+            root.update()
+        result["first_paint"] = (time.perf_counter() - started) * 1000
+
+        while application.media_processor is None and time.perf_counter() < deadline:
+            root.update()
+        result["ready"] = (time.perf_counter() - started) * 1000
+    finally:
+        root.destroy()
+    return result
+
+
+def run_isolated():
+    """Run one cold start in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=PROJECT_ROOT
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": (completed.stderr.strip().splitlines() or ["startup failed"])[-1]}
+    return json.loads(lines[-1])
+
+
+def slowest_imports(count):
+    """(cumulative ms, module) for the slowest modules imported directly by app.py"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=PROJECT_ROOT
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative) / 1000, name.strip()))
+
+    # -X importtime prints a module after its own imports, so app's direct
+    # imports are the depth-1 entries just before the "app" line
+    modules = []
+    end = next((i for i, entry in enumerate(entries) if entry[0] == 0 and entry[2] == "app"), 0)
+    for depth, cumulative, name in reversed(entries[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            modules.append((cumulative, name))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file from an earlier run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_startup()))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    runs = [run_isolated() for _ in range(args.runs)]
+    errors = {run["error"] for run in runs if run.get("error")}
+    for error in errors:
+        print(f"⚠️ {error}")
+
+    medians = {}
+    for metric in METRICS:
+        values = [run[metric] for run in runs if metric in run]
+        if values:
+            medians[metric] = statistics.median(values)
+
+    print(f"{'metric':<12} {'median ms':>10}" + (f" {'vs base':>8}" if baseline else ""))
+    for metric, value in medians.items():
+        row = f"{metric:<12} {value:>10.1f}"
+        old = (baseline or {}).get("medians", {}).get(metric)
+        if old:
+            row += f" {value / old:>7.2f}x"
+        print(row)
+
+    imports = slowest_imports(args.top)
+    print("\nslowest imports of app.py:")
+    for cumulative, name in imports:
+        print(f"{cumulative:>10.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"medians": medians, "runs": runs, "imports": imports}, f, indent=2)
+        print(f"📄 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
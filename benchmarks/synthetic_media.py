@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Synthetic Test Media
+====================================
+
+Generates reproducible test inputs with FFmpeg's lavfi sources, so that
+benchmarks never depend on files that only exist on one machine.
+
+Each profile fixes the container, the codecs and the number of audio and
+subtitle tracks. Subtitle tracks are generated as SRT files with one cue
+every few seconds. Generated files are named after their profile, duration
+and GOP length (video only), and are reused when they already exist in the
+work directory.
+
+Usage:
+    python benchmarks/synthetic_media.py --profile h264_multi_mkv --duration 600 --work-dir media/
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+
+PROFILES = {
+    "h264_aac_mp4": {
+        "container": "mp4", "video": "libx264", "audio": "aac",
+        "audio_tracks": 1, "subtitle_tracks": 0, "subtitle_codec": "mov_text"
+    },
+    "h264_multi_mkv": {
+        "container": "mkv", "video": "libx264", "audio": "aac",
+        "audio_tracks": 2, "subtitle_tracks": 2, "subtitle_codec": "srt"
+    },
+    "hevc_aac_mkv": {
+        "container": "mkv", "video": "libx265", "audio": "aac",
+        "audio_tracks": 1, "subtitle_tracks": 1, "subtitle_codec": "srt"
+    },
+    "mpeg4_mp3_avi": {
+        "container": "avi", "video": "mpeg4", "audio": "libmp3lame",
+        "audio_tracks": 1, "subtitle_tracks": 0, "subtitle_codec": None
+    },
+    "mp3_audio": {
+        "container": "mp3", "video": None, "audio": "libmp3lame",
+        "audio_tracks": 1, "subtitle_tracks": 0, "subtitle_codec": None
+    },
+}
+
+VIDEO_ENCODER_ARGS = {
+    "libx264": ["-preset", "ultrafast"],
+    "libx265": ["-preset", "ultrafast", "-x265-params", "log-level=error"],
+    "mpeg4": ["-q:v", "5"],
+}
+
+
+def format_srt_time(seconds):
+    """Format seconds as an SRT timestamp"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def write_srt(path, duration, track, interval=4.0):
+    """Write an SRT file with one short cue every `interval` seconds"""
+    with open(path, "w", encoding="utf-8") as f:
+        start = 0.0
+        number = 1
+        while start < duration:
+            end = min(start + interval * 0.75, duration)
+            f.write(f"{number}\n{format_srt_time(start)} --> {format_srt_time(end)}\n"
+                    f"Track {track + 1} cue {number}\n\n")
+            start += interval
+            number += 1
+
+
+def media_path(work_dir, profile, duration, gop_seconds):
+    """Path of the generated file for a profile"""
+    spec = PROFILES[profile]
+    gop = f"_gop{gop_seconds:g}" if spec["video"] else ""
+    return os.path.join(work_dir, f"{profile}_{int(duration)}s{gop}.{spec['container']}")
+
+
+def generate_media(ffmpeg_path, work_dir, profile, duration, gop_seconds=2.0,
+                   size="320x240", rate=25):
+    """Generate (or reuse) the synthetic input for a profile and return its path"""
+    spec = PROFILES[profile]
+    path = media_path(work_dir, profile, duration, gop_seconds)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(work_dir, exist_ok=True)
+    cmd = [ffmpeg_path, "-v", "error", "-y"]
+    maps = []
+    codecs = []
+    inputs = 0
+
+    if spec["video"]:
+        cmd += ["-f", "lavfi", "-i", f"testsrc2=size={size}:rate={rate}:duration={duration}"]
+        maps += ["-map", f"{inputs}:v"]
+        codecs += ["-c:v", spec["video"], "-g", str(max(1, int(gop_seconds * rate))), "-pix_fmt", "yuv420p"]
+        codecs += VIDEO_ENCODER_ARGS.get(spec["video"], [])
+        inputs += 1
+
+    for track in range(spec["audio_tracks"]):
+        # Tone bursts with short gaps give the silence planner something to find
+        cmd += ["-f", "lavfi", "-i",
+                f"sine=frequency={440 * (track + 1)}:sample_rate=44100:duration={duration},"
+                f"volume='if(lt(mod(t,7),6.5),1,0)':eval=frame"]
+        maps += ["-map", f"{inputs}:a"]
+        inputs += 1
+    codecs += ["-c:a", spec["audio"]]
+
+    subtitle_files = []
+    for track in range(spec["subtitle_tracks"]):
+        srt_path = f"{path}.{track + 1}.srt"
+        write_srt(srt_path, duration, track)
+        subtitle_files.append(srt_path)
+        cmd += ["-i", srt_path]
+        maps += ["-map", f"{inputs}:s"]
+        inputs += 1
+    if subtitle_files:
+        codecs += ["-c:s", spec["subtitle_codec"]]
+
+    temp_path = f"{path}.tmp.{spec['container']}"
+    try:
+        subprocess.run(cmd + maps + codecs + ["-t", str(duration), temp_path], check=True)
+        os.replace(temp_path, path)
+    finally:
+        for srt_path in subtitle_files:
+            os.remove(srt_path)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark media")
+    parser.add_argument("--profile", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--duration", type=float, default=300, help="Duration in seconds")
+    parser.add_argument("--gop", type=float, default=2.0, help="Keyframe interval in seconds")
+    parser.add_argument("--work-dir", default=".", help="Output directory")
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    ffmpeg_path = args.ffmpeg or config.ffmpeg_path
+    for profile in args.profile:
+        print(generate_media(ffmpeg_path, args.work_dir, profile, args.duration, args.gop))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Media Cut Pro - Short Tail Segment Check
+========================================
+
+Splits synthetic inputs whose duration is k * segment + epsilon, the case where
+fixed planning used to emit a sub-frame tail part that the segment muxer never
+writes, and checks that every split mode succeeds and the parts cover the whole
+input. In the video inputs the audio outlasts the video by epsilon, as in real
+recordings, so the tail holds no video frame at all. Cases with a long GOP also
+cover cut points with no keyframe between the cut and the end of the file.
+Exits with status 1 on any failure, so it can be used as a regression check.
+
+Usage:
+    python benchmarks/tail_segment_check.py
+    python benchmarks/tail_segment_check.py --segment 30 --epsilons 0.023 0.5 1.5
+"""
+
+import os
+import sys
+import glob
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# Make the project importable when run as a script
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+
+SPLIT_MODES = ("single_pass", "per_segment")
+
+
+def generate_input(ffmpeg_path, path, video_duration, audio_duration, gop_seconds, rate=25):
+    """Video of video_duration (or none) with an audio track of audio_duration"""
+    cmd = [ffmpeg_path, "-v", "error", "-y"]
+    if video_duration:
+        cmd += ["-f", "lavfi", "-i", f"testsrc2=size=160x120:rate={rate}:duration={video_duration}"]
+    cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={audio_duration}"]
+    if video_duration:
+        cmd += ["-c:v", "libx264", "-preset", "ultrafast", "-g", str(int(gop_seconds * rate)), "-c:a", "aac"]
+    else:
+        cmd += ["-c:a", "libmp3lame"]
+    subprocess.run(cmd + [path], check=True)
+    return path
+
+
+def run_case(config, input_file, segment, split_mode, output_root):
+    """Split one input and return an error message, or None on success"""
+    output_dir = tempfile.mkdtemp(dir=output_root)
+    processor = MediaProcessor(config)
+    completion = {}
+    processor.set_completion_callback(
+        lambda success, message, path: completion.update(success=success, message=message)
+    )
+
+    container = os.path.splitext(input_file)[1][1:]
+    ok = processor.process_media_file(input_file, segment / 60, container, output_dir, split_mode=split_mode)
+    if not ok:
+        return completion.get("message", "split failed")
+
+    parts = sorted(glob.glob(os.path.join(output_dir, "*", f"*.{container}")))
+    if not parts:
+        return "no parts written"
+
+    expected = processor.get_media_info(input_file)["duration"]
+    covered = sum(processor.get_media_info(part)["duration"] for part in parts)
+    if covered < expected - 0.1:
+        return f"parts cover {covered:.3f}s of {expected:.3f}s"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check splits of k * segment + epsilon inputs")
+    parser.add_argument("--segment", type=float, default=60, help="Segment duration in seconds")
+    parser.add_argument("--epsilons", type=float, nargs="+", default=[0.023, 0.5, 1.5],
+                        help="Seconds past the last whole segment")
+    parser.add_argument("--gops", type=float, nargs="+", default=[2.0, 7.0],
+                        help="Keyframe intervals of the video inputs")
+    parser.add_argument("--ffmpeg", help="Path to ffmpeg")
+    parser.add_argument("--ffprobe", help="Path to ffprobe")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    config.ffmpeg_path = args.ffmpeg or config.ffmpeg_path
+    config.ffprobe_path = args.ffprobe or config.ffprobe_path
+    config.processing_settings["index_cache_max_mb"] = 0
+
+    work_dir = tempfile.mkdtemp(prefix="mediacut_tail_")
+    failures = 0
+    try:
+        # (name, container, video duration or None, GOP)
+        inputs = [(f"h264+aac gop={gop:g}s", "mkv", args.segment, gop) for gop in args.gops]
+        inputs.append(("mp3", "mp3", None, 0))
+        for name, container, video_duration, gop in inputs:
+            for epsilon in args.epsilons:
+                duration = args.segment + epsilon
+                input_file = generate_input(
+                    config.ffmpeg_path, os.path.join(work_dir, f"input_{len(os.listdir(work_dir))}.{container}"),
+                    video_duration, duration, gop
+                )
+                for split_mode in SPLIT_MODES:
+                    error = run_case(config, input_file, args.segment, split_mode, work_dir)
+                    case = f"{name} {duration:g}s {split_mode}"
+                    print(f"{'✅' if error is None else '❌'} {case}" + (f": {error}" if error else ""))
+                    failures += error is not None
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,34 @@
 """
 
 import os
+import sys
+import shutil
 from typing import Dict, Any, List, Tuple
 
+def find_binary(name: str, env_var: str, bundled_dir: str) -> Tuple[str, bool]:
+    """البحث عن ملف تنفيذي: متغير البيئة ثم المجلد المرفق ثم PATH
+    
+    يعيد (المسار، هل وُجد)؛ عند عدم العثور يعيد مسار المجلد المرفق ليظهر في رسالة الخطأ.
+    """
+    executable = name + ('.exe' if sys.platform == 'win32' else '')
+    
+    # متغير البيئة: مسار الملف نفسه أو المجلد الذي يحتويه
+    override = os.environ.get(env_var)
+    if override:
+        candidate = os.path.join(override, executable) if os.path.isdir(override) else override
+        if os.path.isfile(candidate):
+            return candidate, True
+    
+    bundled = os.path.join(bundled_dir, executable)
+    if os.path.isfile(bundled):
+        return bundled, True
+    
+    found = shutil.which(name)
+    if found:
+        return found, True
+    
+    return bundled, False
+
 class AppConfig:
     """فئة إعدادات التطبيق"""
     
@@ -20,10 +46,26 @@ class AppConfig:
     def setup_paths(self):
         """إعداد المسارات"""
         self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.ffmpeg_path = os.path.join(self.project_root, "ffmpeg", "ffmpeg.exe")
-        self.ffprobe_path = os.path.join(self.project_root, "ffmpeg", "ffprobe.exe")
+        
+        # FFmpeg: MEDIACUT_FFMPEG/MEDIACUT_FFPROBE ثم المجلد المرفق (داخل حزمة PyInstaller
+        # عند التجميع) ثم PATH
+        bundle_root = getattr(sys, '_MEIPASS', self.project_root)
+        self.ffmpeg_dir = os.path.join(bundle_root, "ffmpeg")
+        self.ffmpeg_path, _ = find_binary("ffmpeg", "MEDIACUT_FFMPEG", self.ffmpeg_dir)
+        self.ffprobe_path, _ = find_binary("ffprobe", "MEDIACUT_FFPROBE", self.ffmpeg_dir)
         self.assets_path = os.path.join(self.project_root, "assets")
         self.temp_path = os.path.join(self.project_root, "temp")
+        
+        # مجلد البيانات الدائمة (يبقى بعد إعادة التشغيل حتى في النسخة المجمّعة)
+        data_root = (
+            os.environ.get('APPDATA')
+            or os.environ.get('XDG_DATA_HOME')
+            or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        )
+        self.data_path = os.path.join(data_root, "MediaCutPro")
+        self.queue_state_path = os.path.join(self.data_path, "batch_queue.json")
+        self.index_cache_path = os.path.join(self.data_path, "index_cache")
+        self.capabilities_cache_path = os.path.join(self.data_path, "ffmpeg_capabilities.json")
     
     def setup_media_formats(self):
         """إعداد صيغ الوسائط المدعومة"""
@@ -52,10 +94,10 @@ class AppConfig:
         
         # صيغ الإخراج للفيديو
         self.video_output_formats = {
-            'mp4': {'extension': 'mp4', 'codec': 'libx264', 'description': 'MP4 (H.264)'},
-            'mkv': {'extension': 'mkv', 'codec': 'libx264', 'description': 'MKV (H.264)'},
-            'mov': {'extension': 'mov', 'codec': 'libx264', 'description': 'MOV (H.264)'},
-            'avi': {'extension': 'avi', 'codec': 'libx264', 'description': 'AVI (H.264)'}
+            'mp4': {'extension': 'mp4', 'codec': 'libx264', 'audio_codec': 'aac', 'description': 'MP4 (H.264)'},
+            'mkv': {'extension': 'mkv', 'codec': 'libx264', 'audio_codec': 'aac', 'description': 'MKV (H.264)'},
+            'mov': {'extension': 'mov', 'codec': 'libx264', 'audio_codec': 'aac', 'description': 'MOV (H.264)'},
+            'avi': {'extension': 'avi', 'codec': 'libx264', 'audio_codec': 'libmp3lame', 'description': 'AVI (H.264)'}
         }
         
         # صيغ الإخراج للصوت
@@ -123,11 +165,36 @@ class AppConfig:
         
         # إعدادات المعالجة
         self.processing_settings = {
-            'max_concurrent_processes': 1,  # عدد العمليات المتزامنة
+            'max_concurrent_processes': None,  # عدد العمليات المتزامنة (None = تلقائي حسب المعالج ونوع المهمة)
             'temp_cleanup': True,           # تنظيف الملفات المؤقتة
             'overwrite_existing': False,    # استبدال الملفات الموجودة
             'create_named_folders': True,   # إنشاء مجلدات بأسماء الملفات
-            'include_format_in_name': True  # تضمين صيغة الإخراج في اسم المجلد
+            'include_format_in_name': True, # تضمين صيغة الإخراج في اسم المجلد
+            'split_mode': 'single_pass',    # محرك التقطيع: single_pass (تشغيل واحد) أو per_segment (تشغيل لكل جزء)
+            'seek_mode': 'fast',            # وضع البحث: fast (عند الإدخال) أو accurate (قص دقيق بالإطار، مع transcode فقط) أو output
+            'accurate_seek_margin': 5.0,    # هامش القص الدقيق بالثواني في وضع accurate
+            'probe_cache_size': 64,         # أقصى عدد لنتائج ffprobe المحفوظة في الذاكرة
+            'progress_interval': 0.1,       # أقل فترة بين تحديثات التقدم المرسلة للواجهة (ثانية)
+            'queue_checkpoint_interval': 5.0,  # أقل فترة (ثانية) بين حفظ الأجزاء المكتملة في الطابور الدائم
+            'segment_planner': 'fixed',     # تخطيط نقاط القطع: fixed أو keyframe (إطار مفتاحي) أو silence (صمت) أو scene (تغيّر مشهد)
+            'keyframe_tolerance': 5.0,      # أقصى إزاحة (ثانية) لنقطة القطع نحو أقرب إطار مفتاحي
+            'silence_window': 30.0,         # أقصى إزاحة (ثانية) لنقطة القطع نحو أقرب فترة صمت
+            'silence_threshold_db': -40.0,  # مستوى الصوت الذي يعتبر صمتاً (ديسيبل نسبة لأقصى مستوى)
+            'silence_min_duration': 0.3,    # أقل مدة (ثانية) لفترة الصمت المرشحة للقطع
+            'scene_window': 30.0,           # أقصى إزاحة (ثانية) لنقطة القطع نحو أقرب تغيّر مشهد
+            'scene_threshold': 0.1,         # أقل متوسط فرق بين إطارين متتاليين (0-1) يعتبر تغيّر مشهد
+            'scene_sample_fps': 5.0,        # معدل الإطارات المحللة في الثانية لكشف المشاهد
+            'index_cache_max_mb': 256,      # الحجم الأقصى لفهارس الإطارات المفتاحية المحفوظة على القرص (0 = تعطيل)
+            'codec_mode': 'copy',           # الترميز: copy (نسخ) أو transcode (إعادة ترميز بإعدادات الجودة) أو smart (ترميز بداية الجزء فقط)
+            'video_quality': 'medium',      # إعداد جودة الفيديو عند إعادة الترميز (high/medium/low)
+            'audio_quality': 'medium',      # إعداد جودة الصوت عند إعادة الترميز (high/medium/low)
+            'encoder_threads': None,        # خيوط كل مرمّز (None = تلقائي: المعالجات ÷ عدد العمليات المتزامنة)
+            'server_workers': 2,            # عدد المهام المنفذة في نفس الوقت في خادم المهام المحلي
+            'server_queue_size': 16,        # أقصى عدد للمهام المنتظرة قبل رفض الطلبات برمز 503
+            'server_job_history': 100,      # عدد المهام المحفوظة في ذاكرة الخادم (تُحذف أقدم المنتهية أولاً)
+            'tracing': False,               # قياس زمن مراحل المعالجة (أو MEDIACUT_TRACE=1)
+            'stderr_tail_lines': 50,        # عدد أسطر stderr المحفوظة لكل عملية FFmpeg لرسائل الخطأ
+            'min_tail_duration': 1.0        # الجزء الأخير الأقصر من هذه المدة (ثانية) يُدمج مع الجزء السابق
         }
     
     def get_file_filter_string(self) -> str:
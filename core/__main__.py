@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+تشغيل التقطيع بدون واجهة رسومية: python -m core
+"""
+
+import sys
+
+from core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+واجهة asyncio لتقطيع الوسائط
+تشغّل FFmpeg عبر asyncio.create_subprocess_exec فتدير حلقة أحداث واحدة عدداً كبيراً
+من المهام المتزامنة دون خيط لكل مهمة، وتعيد نتيجة قابلة للانتظار مع تفاصيل كل جزء
+
+الاستخدام:
+    result = await split('lecture.mp4', 10, 'mp4')
+    for segment in result.segments:
+        print(segment.path, segment.size, segment.elapsed)
+
+إلغاء المهمة (task.cancel) ينهي عمليات FFmpeg الحية ويحذف الأجزاء غير المكتملة.
+"""
+
+import os
+import json
+import time
+import asyncio
+import subprocess
+from typing import Optional, Callable, Dict, List, Tuple
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+from core.probe_cache import MediaProbe, ProbeCache
+from core.process_registry import OutputTail, ProcessRegistry, decode_output
+from core.progress import FFmpegProgressParser, JobProgress, format_progress_message
+
+class SegmentResult:
+    """نتيجة جزء واحد: المسار والحجم ومدة المعالجة"""
+    
+    def __init__(self, part_number: int, path: str, start_time: float, end_time: float):
+        """تهيئة نتيجة الجزء قبل معالجته"""
+        self.part_number = part_number
+        self.path = path
+        self.start_time = start_time
+        self.end_time = end_time
+        self.size = 0               # حجم الملف الناتج بالبايت
+        self.elapsed = None         # مدة المعالجة بالثواني (None إذا لم يبدأ)
+        self.returncode = None      # رمز خروج FFmpeg
+    
+    @property
+    def duration(self) -> float:
+        """مدة الجزء في الملف الأصلي بالثواني"""
+        return self.end_time - self.start_time
+    
+    @property
+    def success(self) -> bool:
+        """هل اكتمل الجزء بنجاح"""
+        return self.returncode == 0
+    
+    def to_dict(self) -> Dict:
+        """تمثيل قابل للتحويل إلى JSON"""
+        return {
+            'part_number': self.part_number,
+            'path': self.path,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'size': self.size,
+            'elapsed': self.elapsed,
+            'success': self.success
+        }
+
+class SplitResult:
+    """نتيجة تقطيع ملف كامل"""
+    
+    def __init__(self, input_file: str, output_dir: str = ''):
+        """تهيئة النتيجة"""
+        self.input_file = input_file
+        self.output_dir = output_dir
+        self.segments: List[SegmentResult] = []
+        self.success = False
+        self.message = ''
+        self.elapsed = 0.0
+    
+    @property
+    def total_size(self) -> int:
+        """مجموع أحجام الأجزاء الناتجة بالبايت"""
+        return sum(segment.size for segment in self.segments)
+    
+    def to_dict(self) -> Dict:
+        """تمثيل قابل للتحويل إلى JSON"""
+        return {
+            'input_file': self.input_file,
+            'output_dir': self.output_dir,
+            'success': self.success,
+            'message': self.message,
+            'elapsed': self.elapsed,
+            'total_size': self.total_size,
+            'segments': [segment.to_dict() for segment in self.segments]
+        }
+
+async def _terminate(process: asyncio.subprocess.Process, kill_timeout: float = 0.5):
+    """إنهاء عملية حية: طلب إنهاء ثم قتل قسري بعد المهلة"""
+    if process.returncode is not None:
+        return
+    
+    try:
+        process.terminate()
+    except ProcessLookupError:
+        return
+    
+    try:
+        await asyncio.wait_for(process.wait(), kill_timeout)
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+async def run_ffmpeg(cmd: List[str],
+                     on_progress: Callable[[FFmpegProgressParser], None] = None,
+                     stderr_tail: OutputTail = None) -> Tuple[int, bytes]:
+    """تشغيل FFmpeg مع قراءة تقدمه من -progress، ويعيد رمز الخروج وآخر أسطر stderr"""
+    # خيارات عامة: تقدم قابل للقراءة آلياً على stdout بدلاً من إحصاءات stderr
+    cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:]
+    
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    
+    async def read_progress():
+        parser = FFmpegProgressParser()
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            if parser.feed(line) and on_progress:
+                on_progress(parser)
+    
+    tail = stderr_tail or OutputTail()
+    
+    async def read_stderr():
+        while True:
+            chunk = await process.stderr.read(65536)
+            if not chunk:
+                break
+            tail.feed(chunk)
+    
+    try:
+        # قراءة الأنبوبين معاً حتى لا يمتلئ أحدهما ويتوقف FFmpeg
+        await asyncio.gather(read_progress(), read_stderr())
+        return await process.wait(), tail.getvalue()
+    except asyncio.CancelledError:
+        await _terminate(process)
+        raise
+
+async def probe(processor: MediaProcessor, file_path: str) -> Optional[MediaProbe]:
+    """فحص الملف بدون حجب حلقة الأحداث، مع مشاركة ذاكرة الفحص المؤقتة للمعالج"""
+    cached = processor.probe_cache.peek(file_path)
+    if cached is not None:
+        return cached
+    
+    if not os.path.exists(file_path):
+        return None
+    
+    cmd = ProbeCache.probe_command(processor.config.ffprobe_path, file_path)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    except OSError as e:
+        print(f"خطأ في فحص الملف: {e}")
+        return None
+    
+    try:
+        stdout, _ = await process.communicate()
+    except asyncio.CancelledError:
+        await _terminate(process)
+        raise
+    
+    if process.returncode != 0:
+        return None
+    
+    try:
+        media = MediaProbe(file_path, json.loads(stdout.decode('utf-8')))
+    except ValueError as e:
+        print(f"خطأ في فحص الملف: {e}")
+        return None
+    
+    processor.probe_cache.store(file_path, media)
+    return media
+
+def _remove_file(path: str):
+    """حذف جزء غير مكتمل"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError as e:
+        print(f"خطأ في حذف الملف غير المكتمل: {e}")
+
+async def split(input_file: str, segment_duration: float, output_format: str,
+                output_directory: str = None, config: AppConfig = None,
+                processor: MediaProcessor = None, limiter: asyncio.Semaphore = None,
+                on_progress: Callable[[float, str], None] = None) -> SplitResult:
+    """تقطيع ملف وإرجاع نتيجة تحتوي مسار وحجم ومدة معالجة كل جزء
+    
+    segment_duration: مدة الجزء بالدقائق (مثل MediaProcessor.process_media_file)
+    limiter (اختياري): Semaphore مشترك بين عدة مهام لتحديد عدد عمليات FFmpeg الكلي؛
+    افتراضياً يُنشأ لكل مهمة حسب resolve_worker_count.
+    
+    كل جزء يُشغَّل كعملية FFmpeg مستقلة حتى يكون لكل جزء توقيته الخاص. التخطيط بغير
+    المدة الثابتة والوضع الذكي يعملان على مجموعة الخيوط الافتراضية لحلقة الأحداث.
+    """
+    processor = processor or MediaProcessor(config or AppConfig())
+    settings = processor.config.processing_settings
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    result = SplitResult(input_file)
+    
+    media = await probe(processor, input_file)
+    if media is None or media.duration <= 0:
+        result.message = "فشل في قراءة معلومات الملف"
+        return result
+    
+    if settings.get('segment_planner', 'fixed') == 'fixed':
+        segments = processor.calculate_segments(media.duration, segment_duration, input_file, 'fixed')
+    else:
+        # المخططات الأخرى تحلل الملف بعمليات متزامنة فتُنفذ خارج حلقة الأحداث
+        segments = await loop.run_in_executor(
+            None, processor.calculate_segments, media.duration, segment_duration, input_file
+        )
+    
+    # المجلد المحدد يُنشأ أولاً، وإلا تجاهله get_output_directory وكتب بجوار الملف الأصلي
+    if output_directory:
+        try:
+            os.makedirs(output_directory, exist_ok=True)
+        except OSError as e:
+            result.message = f"تعذر إنشاء مجلد الإخراج: {e}"
+            return result
+    result.output_dir = processor.create_output_directory(input_file, output_format, output_directory)
+    for i, (start_time, end_time) in enumerate(segments):
+        path = processor.generate_output_filename(input_file, result.output_dir, i + 1, output_format)
+        result.segments.append(SegmentResult(i + 1, path, start_time, end_time))
+    
+    smart = settings.get('codec_mode', 'copy') == 'smart'
+    # فحص قدرات FFmpeg (عند أول استخدام) يشغّل عمليات متزامنة فيُنفذ خارج حلقة الأحداث
+    await loop.run_in_executor(None, processor.get_capabilities)
+    if limiter is None:
+        limiter = asyncio.Semaphore(processor.resolve_worker_count(stream_copy=processor.is_stream_copy()))
+    
+    job_progress = JobProgress([segment.duration for segment in result.segments])
+    total_segments = len(result.segments)
+    errors = []
+    tasks = []
+    
+    def report(message: str):
+        if on_progress:
+            stats = job_progress.snapshot()
+            on_progress(stats['fraction'] * 100, format_progress_message(message, stats))
+    
+    async def run_segment(index: int, segment: SegmentResult):
+        async with limiter:
+            # عدم بدء أجزاء جديدة بعد فشل جزء آخر
+            if errors:
+                return
+            
+            message = f"معالجة الجزء {segment.part_number} من {total_segments}"
+            segment_started = time.monotonic()
+            
+            def on_segment_progress(parser: FFmpegProgressParser):
+                job_progress.update(index, parser.out_time)
+                report(message)
+            
+            def on_thread_progress(parser: FFmpegProgressParser):
+                # الوضع الذكي يعمل في خيط منفصل: نقل التقدم إلى حلقة الأحداث
+                out_time = parser.out_time
+                loop.call_soon_threadsafe(job_progress.update, index, out_time)
+                loop.call_soon_threadsafe(report, message)
+            
+            # سجل خاص بهذا الجزء: إلغاؤه لا يمس عمليات المهام الأخرى على المعالج نفسه
+            registry = ProcessRegistry()
+            try:
+                if smart:
+                    returncode, stderr = await loop.run_in_executor(
+                        None, processor.run_segment, input_file, segment.path,
+                        segment.start_time, segment.end_time, output_format, on_thread_progress, registry
+                    )
+                else:
+                    cmd = processor.build_ffmpeg_command(
+                        input_file, segment.path, segment.start_time, segment.duration, output_format
+                    )
+                    returncode, stderr = await run_ffmpeg(
+                        cmd, on_segment_progress, processor.create_stderr_tail()
+                    )
+            except asyncio.CancelledError:
+                if smart:
+                    registry.cancel()
+                _remove_file(segment.path)
+                raise
+            
+            segment.elapsed = time.monotonic() - segment_started
+            segment.returncode = returncode
+            if returncode != 0:
+                _remove_file(segment.path)
+                errors.append(f"فشل في معالجة الجزء {segment.part_number}: {decode_output(stderr)}")
+                # الفشل السريع: إلغاء الأجزاء الجارية والمنتظرة
+                for task in tasks:
+                    if task is not asyncio.current_task():
+                        task.cancel()
+                return
+            
+            segment.size = os.path.getsize(segment.path)
+            job_progress.complete(index)
+            report(f"تم إنجاز الجزء {segment.part_number} من {total_segments}")
+    
+    tasks.extend(asyncio.ensure_future(run_segment(i, segment))
+                 for i, segment in enumerate(result.segments))
+    try:
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    except asyncio.CancelledError:
+        # إلغاء المهمة من الخارج: انتظار إنهاء العمليات وحذف الأجزاء غير المكتملة
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            errors.append(f"خطأ أثناء معالجة الملف: {outcome}")
+    
+    result.elapsed = time.monotonic() - started
+    result.success = not errors
+    result.message = errors[0] if errors else f"تم تقطيع الملف إلى {total_segments} أجزاء بنجاح"
+    return result
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+طابور الملفات المتعددة
+طابور دائم (محفوظ على القرص) يقبل عدداً كبيراً من الملفات ويجدول أجزاءها
+على ميزانية عمال مشتركة، مع إبلاغ نتيجة كل ملف فور اكتماله
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
+
+from core.media_processor import MediaProcessor
+from core.process_registry import ProcessCancelledError, decode_output
+from core.progress import ProgressPublisher, FFmpegProgressParser, JobProgress, format_progress_message
+
+# حالات المهمة
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# إعدادات تحدد محتوى الأجزاء؛ تُحفظ مع خطة المهمة ولا تُخلط أجزاء كُتبت بقيم مختلفة
+PART_SETTINGS = ('codec_mode', 'seek_mode', 'video_quality', 'audio_quality', 'encoder_threads')
+
+class BatchQueue:
+    """طابور دائم لتقطيع ملفات متعددة بجدولة مشتركة للأجزاء"""
+    
+    def __init__(self, config, processor: MediaProcessor = None, state_path: str = None):
+        """تهيئة الطابور وتحميل الحالة المحفوظة إن وجدت"""
+        self.config = config
+        self.processor = processor or MediaProcessor(config)
+        self.state_path = state_path or config.queue_state_path
+        
+        self.jobs: Dict[str, Dict] = {}
+        self.is_running = False
+        self.file_completed_callback = None
+        self.progress_publisher = ProgressPublisher(
+            min_interval=config.processing_settings.get('progress_interval', 0.1)
+        )
+        
+        self._lock = threading.RLock()
+        self._last_save = 0.0
+        self.load()
+    
+    def set_progress_callback(self, callback: Callable[[float, str], None]):
+        """تعيين دالة استدعاء للتقدم الكلي للطابور"""
+        self.progress_publisher.set_callback(callback)
+    
+    def set_file_completed_callback(self, callback: Callable[[Dict], None]):
+        """تعيين دالة استدعاء تُنادى عند اكتمال (أو فشل) كل ملف"""
+        self.file_completed_callback = callback
+    
+    def load(self):
+        """تحميل الطابور من القرص؛ المهام التي انقطعت أثناء التشغيل تعود للانتظار"""
+        if not os.path.exists(self.state_path):
+            return
+        
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                jobs = json.load(f).get('jobs', [])
+        except (OSError, ValueError) as e:
+            print(f"خطأ في تحميل طابور المهام: {e}")
+            return
+        
+        with self._lock:
+            for job in jobs:
+                if job.get('status') == STATUS_RUNNING:
+                    job['status'] = STATUS_PENDING
+                self.jobs[job['id']] = job
+    
+    def save(self):
+        """حفظ الطابور على القرص بكتابة ذرية"""
+        with self._lock:
+            data = {'jobs': list(self.jobs.values())}
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            temp_file = self.state_path + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_file, self.state_path)
+            self._last_save = time.monotonic()
+    
+    def _checkpoint(self):
+        """حفظ الأجزاء المكتملة على فترات queue_checkpoint_interval بدلاً من كل جزء
+        
+        الحفظ يعيد كتابة الطابور كاملاً، فالحفظ بعد كل جزء يكلف بمربع حجم الطابور؛
+        وما يضيع بعد انقطاع مفاجئ أجزاء تُعاد عند الاستئناف فقط.
+        """
+        interval = self.config.processing_settings.get('queue_checkpoint_interval', 5.0)
+        if time.monotonic() - self._last_save >= interval:
+            self.save()
+    
+    def add(self, input_file: str, segment_duration: float, output_format: str,
+            output_directory: str = None) -> str:
+        """إضافة ملف إلى الطابور وإرجاع معرّف المهمة"""
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'input_file': os.path.abspath(input_file),
+            'segment_duration': segment_duration,
+            'output_format': output_format,
+            'output_directory': output_directory,
+            'status': STATUS_PENDING,
+            'completed_parts': [],
+            'segments': None,               # خطة القطع [(البداية، النهاية)] تُحفظ عند أول تخطيط
+            'part_settings': None,
+            'total_parts': 0,
+            'output_dir': '',
+            'message': '',
+            'created': time.time()
+        }
+        
+        with self._lock:
+            self.jobs[job['id']] = job
+            self.save()
+        return job['id']
+    
+    def pending_jobs(self) -> List[Dict]:
+        """المهام المنتظرة بترتيب الإضافة"""
+        with self._lock:
+            jobs = [job for job in self.jobs.values() if job['status'] == STATUS_PENDING]
+        return sorted(jobs, key=lambda job: job['created'])
+    
+    def clear_finished(self) -> int:
+        """حذف المهام المكتملة والفاشلة من الطابور وإرجاع عددها"""
+        with self._lock:
+            count = len(self.jobs)
+            self.jobs = {
+                job_id: job for job_id, job in self.jobs.items()
+                if job['status'] not in (STATUS_DONE, STATUS_FAILED)
+            }
+            self.save()
+            return count - len(self.jobs)
+    
+    def stop(self):
+        """إيقاف تشغيل الطابور؛ المهام غير المكتملة تبقى للاستئناف لاحقاً"""
+        self.processor.stop_processing()
+    
+    def _part_settings(self) -> Dict:
+        """قيم الإعدادات الحالية التي تحدد محتوى الأجزاء"""
+        settings = self.config.processing_settings
+        return {name: settings.get(name) for name in PART_SETTINGS}
+    
+    def _plan_job(self, job: Dict) -> List[Tuple[str, int, float, float, str]]:
+        """حساب أجزاء ملف واحد وإرجاع الأجزاء المتبقية كمهام
+        
+        عند الاستئناف تُستخدم خطة القطع المحفوظة مع المهمة، لأن المخطط أو إعداداته قد
+        تعطي حدوداً مختلفة الآن. وإذا تغيّرت إعدادات الترميز تُعاد الأجزاء كلها بدلاً من
+        خلط أجزاء من إعدادات مختلفة.
+        """
+        part_settings = self._part_settings()
+        segments = job.get('segments')
+        if segments and job.get('part_settings') not in (None, part_settings):
+            with self._lock:
+                job['completed_parts'] = []
+        
+        if not segments:
+            media_info = self.processor.get_media_info(job['input_file'])
+            if not media_info or media_info['duration'] <= 0:
+                self._finish_job(job, False, "فشل في قراءة معلومات الملف")
+                return []
+            
+            segments = self.processor.calculate_segments(
+                media_info['duration'], job['segment_duration'], job['input_file']
+            )
+            with self._lock:
+                # أجزاء مهمة من طابور قديم بلا خطة محفوظة لا يُعرف أنها من هذه الخطة
+                job['completed_parts'] = []
+        
+        output_dir = self.processor.create_output_directory(
+            job['input_file'], job['output_format'], job['output_directory']
+        )
+        
+        with self._lock:
+            job['segments'] = [[start_time, end_time] for start_time, end_time in segments]
+            job['part_settings'] = part_settings
+            job['total_parts'] = len(segments)
+            job['output_dir'] = output_dir
+            job['status'] = STATUS_RUNNING
+            done_parts = set(job['completed_parts'])
+        
+        tasks = []
+        for i, (start_time, end_time) in enumerate(segments):
+            part_number = i + 1
+            output_file = self.processor.generate_output_filename(
+                job['input_file'], output_dir, part_number, job['output_format']
+            )
+            # تخطي الأجزاء المكتملة في تشغيل سابق
+            if part_number in done_parts and os.path.exists(output_file):
+                continue
+            tasks.append((job['id'], part_number, start_time, end_time, output_file))
+        
+        if not tasks:
+            self._finish_job(job, True, f"تم تقطيع الملف إلى {len(segments)} أجزاء بنجاح")
+        return tasks
+    
+    def interleave_tasks(self, task_lists: List[List[Tuple]]) -> List[Tuple]:
+        """ترتيب أجزاء جميع الملفات بالتناوب بين الأطول والأقصر
+        
+        أجزاء الملفات الطويلة تُبقي العمال مشغولين، بينما تتخللها أجزاء الملفات
+        القصيرة فتكتمل مبكراً ويُبلّغ عن نتائجها دون انتظار الملفات الطويلة.
+        """
+        lanes = deque(sorted(
+            (deque(tasks) for tasks in task_lists if tasks),
+            key=lambda tasks: sum(task[3] - task[2] for task in tasks),
+            reverse=True
+        ))
+        
+        ordered = []
+        take_longest = True
+        while lanes:
+            lane = lanes[0] if take_longest else lanes[-1]
+            ordered.append(lane.popleft())
+            if not lane:
+                lanes.remove(lane)
+            take_longest = not take_longest
+        
+        return ordered
+    
+    def run(self) -> Dict[str, int]:
+        """تشغيل جميع المهام المنتظرة وإرجاع ملخص النتائج"""
+        with self._lock:
+            if self.is_running:
+                return {'done': 0, 'failed': 0}
+            self.is_running = True
+        
+        try:
+            self.processor.should_stop = False
+            self.processor.process_registry.reset()
+            self.progress_publisher.reset()
+            
+            jobs = self.pending_jobs()
+            
+            # فحص الملفات معاً بعمليات متزامنة قبل التخطيط، على دفعات بحجم الذاكرة المؤقتة
+            task_lists = []
+            chunk = self.processor.probe_cache.max_entries
+            for start in range(0, len(jobs), chunk):
+                batch = jobs[start:start + chunk]
+                self.processor.probe_many([job['input_file'] for job in batch])
+                task_lists.extend(self._plan_job(job) for job in batch)
+            self.save()
+            
+            tasks = self.interleave_tasks(task_lists)
+            if tasks:
+                self._run_tasks(tasks)
+            
+            with self._lock:
+                summary = {
+                    'done': sum(1 for job in jobs if job['status'] == STATUS_DONE),
+                    'failed': sum(1 for job in jobs if job['status'] == STATUS_FAILED)
+                }
+            self.progress_publisher.flush()
+            return summary
+        
+        finally:
+            with self._lock:
+                self.is_running = False
+                # المهام المتوقفة تبقى قابلة للاستئناف
+                for job in self.jobs.values():
+                    if job['status'] == STATUS_RUNNING:
+                        job['status'] = STATUS_PENDING
+                self.save()
+    
+    def run_async(self) -> bool:
+        """تشغيل الطابور في خيط منفصل"""
+        if self.is_running:
+            return False
+        
+        threading.Thread(target=self.run, daemon=True).start()
+        return True
+    
+    def _run_tasks(self, tasks: List[Tuple]):
+        """تنفيذ الأجزاء على ميزانية العمال المشتركة"""
+        processor = self.processor
+        workers = min(processor.resolve_worker_count(stream_copy=processor.is_stream_copy()), len(tasks))
+        job_progress = JobProgress([end_time - start_time for _, _, start_time, end_time, _ in tasks])
+        remaining = {}
+        for job_id, *_ in tasks:
+            remaining[job_id] = remaining.get(job_id, 0) + 1
+        
+        def run_task(index: int, task: Tuple):
+            """تنفيذ جزء واحد من أحد الملفات"""
+            job_id, part_number, start_time, end_time, output_file = task
+            job = self.jobs[job_id]
+            if processor.should_stop or job['status'] != STATUS_RUNNING:
+                return index, None, b''
+            
+            def on_progress(parser: FFmpegProgressParser):
+                job_progress.update(index, parser.out_time)
+                self._report_progress(job_progress, job, part_number)
+            
+            try:
+                returncode, stderr = processor.run_segment(
+                    job['input_file'], output_file, start_time, end_time,
+                    job['output_format'], on_progress
+                )
+            except ProcessCancelledError:
+                return index, None, b''
+            
+            if returncode != 0 and os.path.exists(output_file):
+                # حذف الجزء غير المكتمل
+                os.remove(output_file)
+            return index, returncode, stderr
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_task, index, task) for index, task in enumerate(tasks)]
+            
+            for future in as_completed(futures):
+                index, returncode, stderr = future.result()
+                if returncode is None:
+                    continue
+                
+                job_id, part_number = tasks[index][0], tasks[index][1]
+                job = self.jobs[job_id]
+                
+                if returncode != 0:
+                    # فشل جزء يُفشل ملفه فقط؛ بقية الملفات تستمر
+                    if not processor.should_stop and job['status'] == STATUS_RUNNING:
+                        error = decode_output(stderr)
+                        self._finish_job(job, False, f"فشل في معالجة الجزء {part_number}: {error}")
+                    continue
+                
+                job_progress.complete(index)
+                with self._lock:
+                    job['completed_parts'].append(part_number)
+                    remaining[job_id] -= 1
+                    finished = remaining[job_id] == 0 and job['status'] == STATUS_RUNNING
+                
+                # نهاية الملف تُحفظ في _finish_job، وبقية الأجزاء على فترات
+                if not finished:
+                    self._checkpoint()
+                
+                self._report_progress(job_progress, job, part_number)
+                if finished:
+                    self._finish_job(job, True, f"تم تقطيع الملف إلى {job['total_parts']} أجزاء بنجاح")
+    
+    def _report_progress(self, job_progress: JobProgress, job: Dict, part_number: int):
+        """نشر التقدم الكلي للطابور"""
+        stats = job_progress.snapshot()
+        message = (f"{os.path.basename(job['input_file'])} - "
+                   f"الجزء {part_number} من {job['total_parts']}")
+        message = format_progress_message(message, stats)
+        self.progress_publisher.publish(stats['fraction'] * 100, message)
+    
+    def _finish_job(self, job: Dict, success: bool, message: str):
+        """تسجيل نتيجة ملف وإبلاغها فوراً"""
+        with self._lock:
+            job['status'] = STATUS_DONE if success else STATUS_FAILED
+            job['message'] = message
+            self.save()
+        
+        if self.file_completed_callback:
+            self.file_completed_callback(dict(job))
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+واجهة سطر الأوامر بدون واجهة رسومية
+تشغّل MediaProcessor مباشرة وتكتب التقدم كأسطر JSON على stdout
+لا تستورد Tkinter ولا أي وحدة من ui حتى يبدأ التشغيل خلال أجزاء من الثانية
+
+الاستخدام:
+    python -m core input.mp4 "recordings/*.mkv" -d 10 -f mp4 -o out/
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from typing import List, Dict
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+from core.batch_queue import BatchQueue
+
+def emit(record: Dict):
+    """كتابة حدث واحد كسطر JSON"""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """توسيع أنماط glob إلى قائمة ملفات مرتبة بدون تكرار"""
+    files = []
+    seen = set()
+    
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for path in matches:
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                files.append(path)
+            elif not os.path.exists(path):
+                emit({'event': 'error', 'file': path, 'message': 'الملف غير موجود'})
+    
+    return files
+
+def build_parser(config: AppConfig) -> argparse.ArgumentParser:
+    """بناء محلل المعاملات"""
+    parser = argparse.ArgumentParser(
+        prog='python -m core',
+        description='Media Cut Pro - تقطيع ملفات الوسائط بدون واجهة رسومية'
+    )
+    parser.add_argument('inputs', nargs='*', help='ملفات أو أنماط glob للتقطيع')
+    parser.add_argument('-d', '--duration', type=float, default=config.default_split_duration,
+                        help='مدة الجزء بالدقائق')
+    parser.add_argument('-f', '--format', dest='output_format',
+                        help='صيغة الإخراج (الافتراضي: صيغة الملف إن كانت مدعومة)')
+    parser.add_argument('-o', '--output-dir', help='مجلد الإخراج (الافتراضي: مجلد الملف الأصلي)')
+    parser.add_argument('--split-mode', choices=('single_pass', 'per_segment'),
+                        help='محرك التقطيع')
+    parser.add_argument('--seek-mode', choices=('fast', 'accurate', 'output'),
+                        help='وضع البحث في محرك per_segment')
+    parser.add_argument('--planner', choices=('fixed', 'keyframe', 'silence', 'scene'),
+                        help='طريقة اختيار نقاط القطع')
+    parser.add_argument('--codec-mode', choices=('copy', 'transcode', 'smart'),
+                        help='نسخ المسارات، أو إعادة ترميزها، أو قطع دقيق بإعادة ترميز بداية كل جزء فقط')
+    parser.add_argument('--quality', choices=('high', 'medium', 'low'),
+                        help='جودة الفيديو والصوت عند إعادة الترميز')
+    parser.add_argument('-j', '--jobs', type=int, help='عدد عمليات FFmpeg المتزامنة')
+    parser.add_argument('--threads', type=int, help='عدد خيوط كل مرمّز عند إعادة الترميز')
+    parser.add_argument('--batch', action='store_true',
+                        help='إضافة الملفات إلى الطابور الدائم وجدولة أجزائها معاً')
+    parser.add_argument('--resume', action='store_true',
+                        help='استئناف المهام المنتظرة في الطابور الدائم')
+    parser.add_argument('--clear-finished', action='store_true',
+                        help='حذف المهام المكتملة والفاشلة من الطابور الدائم')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='قياس زمن مراحل المعالجة وحفظها بصيغة Chrome trace JSON')
+    parser.add_argument('--ffmpeg', help='مسار ffmpeg')
+    parser.add_argument('--ffprobe', help='مسار ffprobe')
+    return parser
+
+def resolve_output_format(config: AppConfig, input_file: str, requested: str = None) -> str:
+    """تحديد صيغة الإخراج المناسبة للملف"""
+    formats = config.get_output_formats_for_file(input_file)
+    if requested:
+        return requested.lower() if requested.lower() in formats else None
+    
+    extension = os.path.splitext(input_file)[1].lstrip('.').lower()
+    if extension in formats:
+        return extension
+    return next(iter(formats), None)
+
+def process_file(processor: MediaProcessor, config: AppConfig, input_file: str,
+                 args: argparse.Namespace) -> bool:
+    """تقطيع ملف واحد مع كتابة أحداث التقدم"""
+    output_format = resolve_output_format(config, input_file, args.output_format)
+    if not output_format:
+        emit({'event': 'done', 'file': input_file, 'success': False,
+              'message': 'صيغة الإخراج غير مدعومة لهذا الملف', 'output_dir': ''})
+        return False
+    
+    def on_progress(percentage: float, message: str):
+        stats = processor.last_stats
+        emit({
+            'event': 'progress',
+            'file': input_file,
+            'percent': round(percentage, 2),
+            'message': message,
+            'speed': round(stats['speed'], 2) if stats.get('speed') else None,
+            'eta': round(stats['eta'], 1) if stats.get('eta') is not None else None
+        })
+    
+    def on_completion(success: bool, message: str, output_path: str):
+        emit({'event': 'done', 'file': input_file, 'success': success,
+              'message': message, 'output_dir': output_path})
+    
+    processor.set_progress_callback(on_progress)
+    processor.set_completion_callback(on_completion)
+    
+    emit({'event': 'start', 'file': input_file, 'format': output_format,
+          'duration_minutes': args.duration})
+    return processor.process_media_file(
+        input_file, args.duration, output_format, args.output_dir, args.split_mode
+    )
+
+def run_batch(processor: MediaProcessor, config: AppConfig, files: List[str],
+              args: argparse.Namespace) -> int:
+    """تشغيل الملفات عبر الطابور الدائم بجدولة مشتركة للأجزاء"""
+    queue = BatchQueue(config, processor)
+    
+    if args.clear_finished:
+        emit({'event': 'cleared', 'jobs': queue.clear_finished()})
+        if not files and not args.resume:
+            return 0
+    
+    for input_file in files:
+        output_format = resolve_output_format(config, input_file, args.output_format)
+        if not output_format:
+            emit({'event': 'done', 'file': input_file, 'success': False,
+                  'message': 'صيغة الإخراج غير مدعومة لهذا الملف', 'output_dir': ''})
+            continue
+        job_id = queue.add(input_file, args.duration, output_format, args.output_dir)
+        emit({'event': 'queued', 'job': job_id, 'file': input_file, 'format': output_format})
+    
+    def on_progress(percentage: float, message: str):
+        emit({'event': 'progress', 'percent': round(percentage, 2), 'message': message})
+    
+    def on_file_completed(job: Dict):
+        emit({'event': 'done', 'job': job['id'], 'file': job['input_file'],
+              'success': job['status'] == 'done', 'message': job['message'],
+              'output_dir': job['output_dir']})
+    
+    queue.set_progress_callback(on_progress)
+    queue.set_file_completed_callback(on_file_completed)
+    
+    try:
+        summary = queue.run()
+    except KeyboardInterrupt:
+        queue.stop()
+        emit({'event': 'cancelled'})
+        return 130
+    
+    emit({'event': 'summary', 'files': summary['done'] + summary['failed'],
+          'succeeded': summary['done'], 'failed': summary['failed']})
+    return 0 if summary['failed'] == 0 else 1
+
+def main(argv: List[str] = None) -> int:
+    """نقطة الدخول لسطر الأوامر"""
+    config = AppConfig()
+    args = build_parser(config).parse_args(argv)
+    
+    # تطبيق خيارات سطر الأوامر على الإعدادات
+    if args.ffmpeg:
+        config.ffmpeg_path = args.ffmpeg
+    if args.ffprobe:
+        config.ffprobe_path = args.ffprobe
+    if args.seek_mode:
+        config.processing_settings['seek_mode'] = args.seek_mode
+    if args.planner:
+        config.processing_settings['segment_planner'] = args.planner
+    if args.codec_mode:
+        config.processing_settings['codec_mode'] = args.codec_mode
+    if args.quality:
+        config.processing_settings['video_quality'] = args.quality
+        config.processing_settings['audio_quality'] = args.quality
+    if args.jobs:
+        config.processing_settings['max_concurrent_processes'] = args.jobs
+    if args.threads:
+        config.processing_settings['encoder_threads'] = args.threads
+    
+    if args.duration <= 0:
+        emit({'event': 'error', 'message': 'مدة الجزء يجب أن تكون أكبر من صفر'})
+        return 2
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    
+    if not args.inputs and not args.resume and not args.clear_finished:
+        emit({'event': 'error', 'message': 'يجب تحديد ملف واحد على الأقل'})
+        return 2
+    
+    files = expand_inputs(args.inputs)
+    processor = MediaProcessor(config)
+    
+    if args.trace:
+        processor.tracer.enable()
+        try:
+            return run(processor, config, files, args)
+        finally:
+            processor.tracer.export_chrome_trace(args.trace)
+            emit({'event': 'trace', 'path': args.trace, 'stages': processor.tracer.summary()})
+    return run(processor, config, files, args)
+
+def run(processor: MediaProcessor, config: AppConfig, files: List[str],
+        args: argparse.Namespace) -> int:
+    """تقطيع الملفات واحداً تلو الآخر أو عبر الطابور الدائم"""
+    if args.batch or args.resume or args.clear_finished:
+        return run_batch(processor, config, files, args)
+    
+    succeeded = 0
+    try:
+        for input_file in files:
+            if process_file(processor, config, input_file, args):
+                succeeded += 1
+    except KeyboardInterrupt:
+        processor.stop_processing()
+        emit({'event': 'cancelled'})
+        return 130
+    
+    failed = len(files) - succeeded
+    emit({'event': 'summary', 'files': len(files), 'succeeded': succeeded, 'failed': failed})
+    return 0 if files and failed == 0 else 1
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+قدرات FFmpeg
+فحص نسخة FFmpeg ومرمّزاتها ومقسّماتها (muxers) ومرشحاتها ومرشحات التدفق (bsf)
+مرة واحدة لكل ملف تنفيذي، وحفظ النتيجة على القرص مفتاحها مسار الملف وحجمه ووقت
+تعديله، فلا يُعاد تشغيل ffmpeg -encoders عند كل إقلاع إلا إذا تغيّر الملف التنفيذي
+"""
+
+import os
+import re
+import json
+import threading
+import subprocess
+from typing import Optional, Dict, List, Tuple
+
+from core.process_registry import popen
+
+# رقم صيغة الملف المحفوظ: يُرفع عند تغيير محتوى السجل لإعادة الفحص
+_CACHE_VERSION = 1
+
+class FFmpegCapabilities:
+    """سجل قدرات ملف ffmpeg تنفيذي واحد"""
+    
+    def __init__(self, version: str = '', encoders=(), muxers=(), filters=(), bsfs=()):
+        self.version = version          # مثال: 6.0 أو N-112000-g...
+        self.encoders = frozenset(encoders)
+        self.muxers = frozenset(muxers)
+        self.filters = frozenset(filters)
+        self.bsfs = frozenset(bsfs)
+    
+    @property
+    def version_tuple(self) -> Tuple[int, ...]:
+        """النسخة كأرقام (6, 0)، أو () لنسخ التطوير غير المرقمة"""
+        match = re.match(r'n?(\d+)\.(\d+)', self.version)
+        return tuple(int(part) for part in match.groups()) if match else ()
+    
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+    
+    def has_muxer(self, name: str) -> bool:
+        return name in self.muxers
+    
+    def has_filter(self, name: str) -> bool:
+        return name in self.filters
+    
+    def has_bsf(self, name: str) -> bool:
+        return name in self.bsfs
+    
+    def first_encoder(self, candidates: List[str]) -> Optional[str]:
+        """أول مرمّز متوفر من قائمة مرتبة حسب الأفضلية"""
+        return next((name for name in candidates if name in self.encoders), None)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'version': self.version,
+            'encoders': sorted(self.encoders),
+            'muxers': sorted(self.muxers),
+            'filters': sorted(self.filters),
+            'bsfs': sorted(self.bsfs)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FFmpegCapabilities':
+        return cls(data.get('version', ''), data.get('encoders', ()), data.get('muxers', ()),
+                   data.get('filters', ()), data.get('bsfs', ()))
+
+def _run_listing(ffmpeg_path: str, option: str) -> Optional[List[str]]:
+    """تشغيل ffmpeg -hide_banner <option> وإرجاع أسطر المخرجات"""
+    try:
+        process = popen([ffmpeg_path, '-hide_banner', option], stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        stdout, _ = process.communicate(timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"خطأ في فحص قدرات FFmpeg ({option}): {e}")
+        return None
+    if process.returncode != 0:
+        return None
+    return stdout.decode('utf-8', errors='replace').splitlines()
+
+def _parse_table(lines: List[str], separator: str) -> List[str]:
+    """أسماء المرمّزات بعد سطر الفاصل في جدول -encoders (الأعلام ثم الاسم)"""
+    names = []
+    started = False
+    for line in lines:
+        if not started:
+            started = line.strip() == separator
+            continue
+        parts = line.split()
+        if len(parts) > 1:
+            names.append(parts[1])
+    return names
+
+def probe_capabilities(ffmpeg_path: str) -> Optional[FFmpegCapabilities]:
+    """فحص قدرات ffmpeg بتشغيله (أربع عمليات قصيرة)"""
+    version_lines = _run_listing(ffmpeg_path, '-version')
+    if not version_lines:
+        return None
+    match = re.match(r'ffmpeg version (\S+)', version_lines[0])
+    
+    encoders = _run_listing(ffmpeg_path, '-encoders') or []
+    muxers = _run_listing(ffmpeg_path, '-muxers') or []
+    filters = _run_listing(ffmpeg_path, '-filters') or []
+    bsfs = _run_listing(ffmpeg_path, '-bsfs') or []
+    
+    return FFmpegCapabilities(
+        version=match.group(1) if match else '',
+        encoders=_parse_table(encoders, '------'),
+        # أعمدة -muxers: الأعلام (E أو DE) ثم الاسم
+        muxers=[line.split()[1] for line in muxers
+                if len(line.split()) > 1 and line.split()[0] in ('E', 'DE')],
+        # أعمدة -filters: الأعلام ثم الاسم ثم المداخل->المخارج
+        filters=[line.split()[1] for line in filters if '->' in line and len(line.split()) > 2],
+        bsfs=[line.strip() for line in bsfs[1:] if line.strip()]
+    )
+
+class CapabilityCache:
+    """ذاكرة قدرات FFmpeg في الذاكرة وعلى القرص، مفتاحها توقيع الملف التنفيذي"""
+    
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._memory: Dict[Tuple[str, int, int], FFmpegCapabilities] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _signature(ffmpeg_path: str) -> Optional[Tuple[str, int, int]]:
+        """(المسار المطلق، الحجم، وقت التعديل بالنانوثانية)"""
+        try:
+            stat = os.stat(ffmpeg_path)
+        except OSError:
+            return None
+        return os.path.abspath(ffmpeg_path), stat.st_size, stat.st_mtime_ns
+    
+    def get(self, ffmpeg_path: str) -> Optional[FFmpegCapabilities]:
+        """قدرات الملف التنفيذي: من الذاكرة أو القرص، أو بفحصه وحفظ النتيجة"""
+        signature = self._signature(ffmpeg_path)
+        if signature is None:
+            return None
+        
+        with self._lock:
+            capabilities = self._memory.get(signature)
+            if capabilities is not None:
+                return capabilities
+            
+            entries = self._load()
+            entry = entries.get(signature[0])
+            if entry and [entry.get('size'), entry.get('mtime_ns')] == list(signature[1:]):
+                capabilities = FFmpegCapabilities.from_dict(entry)
+            else:
+                capabilities = probe_capabilities(ffmpeg_path)
+                if capabilities is None:
+                    return None
+                entries[signature[0]] = {
+                    'size': signature[1], 'mtime_ns': signature[2], **capabilities.to_dict()
+                }
+                self._save(entries)
+            
+            self._memory[signature] = capabilities
+            return capabilities
+    
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != _CACHE_VERSION:
+            return {}
+        return data.get('binaries', {})
+    
+    def _save(self, entries: Dict[str, Dict]):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            temp_file = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': _CACHE_VERSION, 'binaries': entries}, f)
+            os.replace(temp_file, self.cache_path)
+        except OSError as e:
+            print(f"خطأ في حفظ قدرات FFmpeg: {e}")
+
+_caches: Dict[str, CapabilityCache] = {}
+_caches_lock = threading.Lock()
+
+def get_capabilities(ffmpeg_path: str, cache_path: str) -> Optional[FFmpegCapabilities]:
+    """قدرات ffmpeg عبر ذاكرة مشتركة لكل ملف حفظ (None إذا تعذر الفحص)"""
+    with _caches_lock:
+        cache = _caches.get(cache_path)
+        if cache is None:
+            cache = _caches[cache_path] = CapabilityCache(cache_path)
+    return cache.get(ffmpeg_path)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+ذاكرة دائمة لفهارس الإطارات المفتاحية
+يُحفظ فهرس كل ملف على القرص بصيغة ثنائية مضغوطة قابلة للربط بالذاكرة (mmap)
+حتى يتم تخطيط التقطيع المتكرر لنفس الملف فوراً دون إعادة قراءة جميع الحزم
+
+بنية الملف:
+    ترويسة ثابتة (48 بايت) ثم count قيمة double للأوقات ثم count قيمة int64 للمواقع
+"""
+
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+from core.keyframe_index import KeyframeIndex
+
+# ترويسة: توقيع، إصدار، ترتيب البايتات، رقم المسار، الحجم، وقت التعديل، العدد، تأخر فك الترميز
+_MAGIC = b'MCPKFIDX'
+_VERSION = 2
+_HEADER = struct.Struct('<8sHBxiqqqd')
+_BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+_EXTENSION = '.kfi'
+
+class KeyframeIndexCache:
+    """ذاكرة على القرص لفهارس الإطارات المفتاحية مع حد أقصى للحجم وإزالة الأقدم استخداماً"""
+    
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """تهيئة الذاكرة في المجلد المحدد"""
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+    
+    def _file_signature(self, file_path: str) -> Optional[Tuple[str, int, int]]:
+        """توقيع الملف: (المسار المطلق، الحجم، وقت التعديل بالنانوثانية)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+    
+    def _entry_path(self, path: str, stream_index: int) -> str:
+        """مسار ملف الفهرس لمسار مصدر ورقم مسار معينين"""
+        key = hashlib.sha1(f"{os.path.normcase(path)}|{stream_index}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + _EXTENSION)
+    
+    def get(self, file_path: str, stream_index: int) -> Optional[KeyframeIndex]:
+        """تحميل الفهرس المحفوظ إن كان مطابقاً للنسخة الحالية من الملف
+        
+        تُربط المصفوفات بالذاكرة مباشرة (mmap) دون نسخها، وتُحدَّث أوقات
+        تعديل ملف الفهرس ليبقى الأحدث استخداماً عند الإزالة.
+        """
+        if self.max_bytes == 0:
+            return None
+        
+        signature = self._file_signature(file_path)
+        if signature is None:
+            return None
+        
+        path, size, mtime = signature
+        entry_path = self._entry_path(path, stream_index)
+        
+        try:
+            with open(entry_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        
+        index = self._map_index(mapped, stream_index, size, mtime)
+        if index is None:
+            mapped.close()
+            self._remove(entry_path)
+            return None
+        
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return index
+    
+    def _map_index(self, mapped: mmap.mmap, stream_index: int,
+                   size: int, mtime: int) -> Optional[KeyframeIndex]:
+        """قراءة الترويسة والتحقق منها ثم عرض المصفوفات من الذاكرة المربوطة"""
+        if len(mapped) < _HEADER.size:
+            return None
+        
+        magic, version, byte_order, entry_stream, entry_size, entry_mtime, count, decode_delay = \
+            _HEADER.unpack_from(mapped)
+        if (magic != _MAGIC or version != _VERSION or byte_order != _BYTE_ORDER
+                or entry_stream != stream_index or entry_size != size or entry_mtime != mtime):
+            return None
+        
+        end = _HEADER.size + count * 16
+        if count <= 0 or len(mapped) != end:
+            return None
+        
+        view = memoryview(mapped)
+        times = view[_HEADER.size:_HEADER.size + count * 8].cast('d')
+        positions = view[_HEADER.size + count * 8:end].cast('q')
+        return KeyframeIndex(times, positions, decode_delay)
+    
+    def put(self, file_path: str, stream_index: int, index: KeyframeIndex):
+        """حفظ الفهرس على القرص بكتابة ذرية ثم تطبيق حد الحجم"""
+        if self.max_bytes == 0 or not index:
+            return
+        
+        signature = self._file_signature(file_path)
+        if signature is None:
+            return
+        
+        path, size, mtime = signature
+        entry_path = self._entry_path(path, stream_index)
+        count = len(index.times)
+        header = _HEADER.pack(_MAGIC, _VERSION, _BYTE_ORDER, stream_index, size, mtime, count,
+                              index.decode_delay)
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_file = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(header)
+                f.write(memoryview(index.times).cast('B'))
+                if len(index.positions) == count:
+                    f.write(memoryview(index.positions).cast('B'))
+                else:
+                    f.write(struct.pack(f'={count}q', *([-1] * count)))
+            os.replace(temp_file, entry_path)
+        except OSError as e:
+            print(f"خطأ في حفظ فهرس الإطارات المفتاحية: {e}")
+            return
+        
+        self.evict()
+    
+    def evict(self):
+        """حذف الفهارس الأقدم استخداماً حتى يصبح الحجم الكلي ضمن الحد"""
+        with self._lock:
+            try:
+                entries = []
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.endswith(_EXTENSION):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            except OSError:
+                return
+            
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if self._remove(entry_path):
+                    total -= size
+    
+    def clear(self):
+        """حذف جميع الفهارس المحفوظة"""
+        with self._lock:
+            try:
+                with os.scandir(self.directory) as it:
+                    paths = [entry.path for entry in it if entry.name.endswith(_EXTENSION)]
+            except OSError:
+                return
+            for entry_path in paths:
+                self._remove(entry_path)
+    
+    def _remove(self, entry_path: str) -> bool:
+        """حذف ملف فهرس؛ قد يفشل على Windows إذا كان مربوطاً بالذاكرة حالياً"""
+        try:
+            os.remove(entry_path)
+            return True
+        except OSError:
+            return False
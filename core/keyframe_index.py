@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+فهرس الإطارات المفتاحية
+قراءة أوقات الإطارات المفتاحية مرة واحدة من مستوى الحزم (packets) بقراءة تدفقية
+وتخزينها في مصفوفة مرتبة مضغوطة للبحث الثنائي عن أقرب نقطة قطع
+"""
+
+import subprocess
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from core.process_registry import ProcessRegistry, ProcessCancelledError, popen
+
+class KeyframeIndex:
+    """أوقات الإطارات المفتاحية (بالثواني من بداية الملف) ومواقعها في الملف"""
+    
+    def __init__(self, times: array, positions: array = None, decode_delay: float = 0.0):
+        """تهيئة الفهرس من مصفوفتين مرتبتين زمنياً"""
+        self.times = times                              # array('d')
+        self.positions = positions or array('q')        # array('q') - موقع الحزمة بالبايت أو -1
+        self.decode_delay = decode_delay                # تقدم توقيت فك الترميز على العرض (إطارات B)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def nearest(self, target: float, tolerance: float) -> Optional[float]:
+        """أقرب إطار مفتاحي إلى target ضمن هامش tolerance (بحث ثنائي)"""
+        return nearest_in_sorted(self.times, target, tolerance)
+
+def nearest_in_sorted(values, target: float, tolerance: float) -> Optional[float]:
+    """أقرب قيمة إلى target في تسلسل مرتب ضمن هامش tolerance، أو None"""
+    i = bisect_left(values, target)
+    best = None
+    best_distance = tolerance
+    
+    # المرشحان الوحيدان هما جارا موضع الإدراج
+    for j in (i - 1, i):
+        if 0 <= j < len(values):
+            distance = abs(values[j] - target)
+            if distance <= best_distance:
+                best = values[j]
+                best_distance = distance
+    
+    return best
+
+def read_keyframe_index(ffprobe_path: str, file_path: str, stream_index: int,
+                        start_time: float = 0.0,
+                        registry: ProcessRegistry = None) -> Optional[KeyframeIndex]:
+    """قراءة أوقات الإطارات المفتاحية لمسار فيديو واحد
+    
+    تُقرأ مخرجات ffprobe سطراً بسطر دون تخزينها كاملة، ويُحفظ فقط وقت وموقع
+    الحزم المفتاحية في مصفوفات مضغوطة (8 بايت لكل قيمة).
+    """
+    cmd = [
+        ffprobe_path,
+        '-v', 'error',
+        '-select_streams', str(stream_index),
+        '-show_entries', 'packet=pts_time,dts_time,pos,flags',
+        '-of', 'csv=p=0',
+        file_path
+    ]
+    
+    times = array('d')
+    positions = array('q')
+    decode_delay = 0.0
+    spawn = registry.spawn if registry else popen
+    
+    try:
+        process = spawn(cmd, stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except ProcessCancelledError:
+        return None
+    
+    try:
+        # كل سطر: pts_time,dts_time,pos,flags (مثال: 4.000000,3.920000,396830,K__)
+        for line in process.stdout:
+            pts_time, dts_time, pos, flags = (line.split(b',') + [b'', b'', b''])[:4]
+            if not flags.startswith(b'K') or not pts_time[:1].isdigit():
+                continue
+            
+            times.append(float(pts_time) - start_time)
+            positions.append(int(pos) if pos[:1].isdigit() else -1)
+            if dts_time[:1].isdigit() or dts_time[:1] == b'-':
+                decode_delay = max(decode_delay, float(pts_time) - float(dts_time))
+        
+        returncode = process.wait()
+    finally:
+        process.stdout.close()
+        if registry:
+            registry.unregister(process)
+    
+    if returncode != 0 or not times:
+        return None
+    
+    # الحزم بترتيب فك الترميز؛ الإطارات المفتاحية مرتبة غالباً لكن نتأكد
+    if any(times[i] > times[i + 1] for i in range(len(times) - 1)):
+        order = sorted(range(len(times)), key=times.__getitem__)
+        times = array('d', (times[i] for i in order))
+        positions = array('q', (positions[i] for i in order))
+    
+    return KeyframeIndex(times, positions, decode_delay)
@@ -5,33 +5,105 @@
 """
 
 import os
+import math
+import shutil
+import tempfile
 import subprocess
 import threading
-import time
 import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Callable, Dict, List, Tuple
-from datetime import timedelta
+
+from core.probe_cache import MediaProbe, ProbeCache
+from core.progress import ProgressPublisher, FFmpegProgressParser, JobProgress, format_progress_message
+from core.process_registry import ProcessRegistry, ProcessCancelledError, OutputTail, decode_output
+from core.keyframe_index import KeyframeIndex, read_keyframe_index
+from core.index_cache import KeyframeIndexCache
+from core.segment_planner import snap_boundaries, boundaries_to_segments
+from core.silence_detector import find_silences
+from core.scene_detector import find_scene_changes
+from core.tracing import Tracer, get_tracer
+from core.ffmpeg_capabilities import FFmpegCapabilities, get_capabilities
 
 class MediaProcessor:
     """فئة معالج الوسائط"""
     
-    def __init__(self, config):
+    # مرمّزات تنتج نفس ترميز المصدر لبداية الجزء في وضع القطع الذكي
+    SMART_CUT_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265'}
+    
+    # بدائل المرمّزات بترتيب الأفضلية عندما لا تتضمن نسخة FFmpeg المرمّز المطلوب
+    ENCODER_FALLBACKS = {
+        'libx264': ['libx264', 'libopenh264'],
+        'libmp3lame': ['libmp3lame', 'libshine']
+    }
+    
+    # مرمّزات تقبل -crf و -preset
+    CRF_ENCODERS = ('libx264', 'libx265')
+    
+    def __init__(self, config, probe_cache: ProbeCache = None,
+                 index_cache: KeyframeIndexCache = None, tracer: Tracer = None):
         """تهيئة معالج الوسائط"""
         self.config = config
-        self.current_process = None
+        self.probe_cache = probe_cache or ProbeCache(
+            config.processing_settings.get('probe_cache_size', 64)
+        )
+        self.index_cache = index_cache or KeyframeIndexCache(
+            config.index_cache_path,
+            config.processing_settings.get('index_cache_max_mb', 256) * 1024 * 1024
+        )
         self.is_processing = False
         self.should_stop = False
         self.progress_callback = None
         self.completion_callback = None
+        self.last_stats = {}
+        
+        # سجل عمليات FFmpeg/FFprobe الحية ليصلها الإيقاف فوراً
+        self.process_registry = ProcessRegistry()
+        
+        # ناشر التقدم: دمج التحديثات المتقاربة بدلاً من التأخير داخل حلقة المعالجة
+        self.progress_publisher = ProgressPublisher(
+            min_interval=config.processing_settings.get('progress_interval', 0.1)
+        )
+        
+        # قياس زمن المراحل (بدون تكلفة عند التعطيل)
+        self.tracer = tracer or get_tracer()
+        if config.processing_settings.get('tracing', False):
+            self.tracer.enable()
+        self.trace_job = None
+        
+        # قدرات FFmpeg: تُفحص عند أول حاجة (مرة لكل ملف تنفيذي بفضل الذاكرة الدائمة)
+        self._capabilities = None
+        self._capabilities_loaded = False
         
     def set_progress_callback(self, callback: Callable[[float, str], None]):
         """تعيين دالة استدعاء لتحديث التقدم"""
         self.progress_callback = callback
+        self.progress_publisher.set_callback(self._deliver_progress if callback else None)
+    
+    def _deliver_progress(self, percentage: float, message: str):
+        """تسليم التقدم لدالة الاستدعاء مع قياس زمنها"""
+        callback = self.progress_callback
+        if callback:
+            with self.tracer.span('callback', self.trace_job, kind='progress'):
+                callback(percentage, message)
     
     def set_completion_callback(self, callback: Callable[[bool, str, str], None]):
         """تعيين دالة استدعاء لإشعار الإنجاز"""
         self.completion_callback = callback
     
+    def probe(self, file_path: str) -> Optional[MediaProbe]:
+        """فحص الملف مرة واحدة وإعادة استخدام النتيجة من الذاكرة المؤقتة"""
+        with self.tracer.span('probe', self.trace_job, file=file_path):
+            return self.probe_cache.get(self.config.ffprobe_path, file_path, self.process_registry)
+    
+    def probe_many(self, file_paths: List[str], workers: int = None) -> Dict[str, Optional[MediaProbe]]:
+        """فحص ملفات كثيرة بعمليات ffprobe متزامنة وحفظ النتائج في الذاكرة المؤقتة"""
+        with self.tracer.span('probe', self.trace_job, files=len(file_paths)):
+            return self.probe_cache.get_many(
+                self.config.ffprobe_path, file_paths, self.process_registry, workers
+            )
+    
     def get_media_info(self, file_path: str) -> Optional[Dict]:
         """الحصول على معلومات الملف الوسائطي"""
         try:
@@ -39,47 +111,9 @@ class MediaProcessor:
             if not os.path.exists(file_path):
                 return None
             
-            # تشغيل ffprobe للحصول على المعلومات
-            cmd = [
-                self.config.ffprobe_path,
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
-            
-            if result.returncode == 0:
-                import json
-                info = json.loads(result.stdout)
-                
-                # استخراج المعلومات المهمة
-                format_info = info.get('format', {})
-                duration = float(format_info.get('duration', 0))
-                
-                # البحث عن تدفق الفيديو والصوت
-                video_stream = None
-                audio_stream = None
-                
-                for stream in info.get('streams', []):
-                    if stream.get('codec_type') == 'video' and not video_stream:
-                        video_stream = stream
-                    elif stream.get('codec_type') == 'audio' and not audio_stream:
-                        audio_stream = stream
-                
-                return {
-                    'duration': duration,
-                    'duration_str': str(timedelta(seconds=int(duration))),
-                    'format_name': format_info.get('format_name', ''),
-                    'size': int(format_info.get('size', 0)),
-                    'bitrate': int(format_info.get('bit_rate', 0)),
-                    'video_stream': video_stream,
-                    'audio_stream': audio_stream,
-                    'is_video': video_stream is not None,
-                    'is_audio': audio_stream is not None
-                }
+            probe = self.probe(file_path)
+            if probe:
+                return dict(probe.media_info)
             
             return None
             
@@ -87,8 +121,28 @@ class MediaProcessor:
             print(f"خطأ في الحصول على معلومات الملف: {e}")
             return None
     
-    def calculate_segments(self, total_duration: float, segment_duration: float) -> List[Tuple[float, float]]:
-        """حساب قطع التقسيم"""
+    def calculate_segments(self, total_duration: float, segment_duration: float,
+                           input_file: str = None, planner: str = None) -> List[Tuple[float, float]]:
+        """حساب قطع التقسيم
+        
+        planner: طريقة اختيار نقاط القطع (الافتراضي من segment_planner في الإعدادات)
+        - fixed: مضاعفات ثابتة لمدة الجزء
+        - keyframe: أقرب إطار مفتاحي لكل مدة مستهدفة حتى تتطابق الأجزاء مع النسخ بدون ترميز
+        - silence: أقرب فترة صمت ضمن نافذة حول كل مدة مستهدفة (محاضرات، بودكاست)
+        - scene: أقرب تغيّر مشهد ضمن نافذة حول كل مدة مستهدفة (ملفات الفيديو)
+        يعود إلى التقسيم الثابت إذا تعذر التخطيط (ملف صوتي، فشل الفحص، ...).
+        """
+        if planner is None:
+            planner = self.config.processing_settings.get('segment_planner', 'fixed')
+        
+        if planner != 'fixed' and input_file:
+            try:
+                boundaries = self._plan_boundaries(planner, input_file, total_duration, segment_duration * 60)
+                if boundaries is not None:
+                    return boundaries_to_segments(boundaries, total_duration)
+            except Exception as e:
+                print(f"خطأ في تخطيط نقاط القطع: {e}")
+        
         segments = []
         current_start = 0.0
         
@@ -100,8 +154,89 @@ class MediaProcessor:
             if segment_end >= total_duration:
                 break
         
+        # دمج ذيل قصير جداً (أقصر من إطار أو مجموعة إطارات) مع الجزء السابق: مقسّم segment
+        # لا يكتب له ملفاً، والجزء شبه الفارغ لا فائدة منه في أي وضع
+        min_tail = float(self.config.processing_settings.get('min_tail_duration', 1.0))
+        if len(segments) > 1 and segments[-1][1] - segments[-1][0] < min_tail:
+            segments[-2:] = [(segments[-2][0], total_duration)]
+        
         return segments
     
+    def _plan_boundaries(self, planner: str, input_file: str, total_duration: float,
+                         segment_seconds: float) -> Optional[List[float]]:
+        """حساب حدود القطع حسب طريقة التخطيط، أو None للعودة إلى التقسيم الثابت"""
+        if planner == 'keyframe':
+            index = self.get_keyframe_index(input_file)
+            if not index:
+                return None
+            tolerance = float(self.config.processing_settings.get('keyframe_tolerance', 5.0))
+            return snap_boundaries(index.times, total_duration, segment_seconds, tolerance)
+        
+        if planner == 'silence':
+            silences = self.get_silence_points(input_file)
+            if silences is None:
+                return None
+            window = float(self.config.processing_settings.get('silence_window', 30.0))
+            return snap_boundaries(silences, total_duration, segment_seconds, window)
+        
+        if planner == 'scene':
+            scenes = self.get_scene_changes(input_file)
+            if scenes is None:
+                return None
+            window = float(self.config.processing_settings.get('scene_window', 30.0))
+            return snap_boundaries(scenes, total_duration, segment_seconds, window)
+        
+        return None
+    
+    def get_silence_points(self, input_file: str):
+        """أوقات منتصف فترات الصمت في أول مسار صوت بالملف"""
+        probe = self.probe(input_file)
+        if not probe or not probe.streams_info['audio_streams']:
+            return None
+        
+        settings = self.config.processing_settings
+        return find_silences(
+            self.config.ffmpeg_path, input_file,
+            probe.streams_info['audio_streams'][0]['index'],
+            threshold_db=float(settings.get('silence_threshold_db', -40.0)),
+            min_silence=float(settings.get('silence_min_duration', 0.3)),
+            registry=self.process_registry
+        )
+    
+    def get_scene_changes(self, input_file: str):
+        """أوقات تغيّر المشهد في أول مسار فيديو بالملف"""
+        probe = self.probe(input_file)
+        if not probe or not probe.streams_info['video_streams']:
+            return None
+        
+        settings = self.config.processing_settings
+        return find_scene_changes(
+            self.config.ffmpeg_path, input_file,
+            probe.streams_info['video_streams'][0]['index'],
+            threshold=float(settings.get('scene_threshold', 0.1)),
+            sample_fps=float(settings.get('scene_sample_fps', 5.0)),
+            registry=self.process_registry
+        )
+    
+    def get_keyframe_index(self, input_file: str) -> Optional[KeyframeIndex]:
+        """فهرس الإطارات المفتاحية لأول مسار فيديو في الملف (من القرص إن كان محفوظاً)"""
+        probe = self.probe(input_file)
+        if not probe or not probe.streams_info['video_streams']:
+            return None
+        
+        stream_index = probe.streams_info['video_streams'][0]['index']
+        index = self.index_cache.get(input_file, stream_index)
+        if index is not None:
+            return index
+        
+        start_time = float(probe.format.get('start_time', 0) or 0)
+        index = read_keyframe_index(
+            self.config.ffprobe_path, input_file, stream_index, start_time, self.process_registry
+        )
+        if index is not None:
+            self.index_cache.put(input_file, stream_index, index)
+        return index
+    
     def format_time(self, seconds: float) -> str:
         """تنسيق الوقت بصيغة HH:MM:SS.mmm"""
         hours = int(seconds // 3600)
@@ -109,6 +244,16 @@ class MediaProcessor:
         secs = seconds % 60
         return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
     
+    def format_cut_time(self, seconds: float) -> str:
+        """نقطة قطع لمقسّم segment بدقة الميكروثانية، قبل الوقت المخطط بنصف ملي ثانية
+        
+        المقسّم يقطع عند أول إطار مفتاحي عند نقطة القطع أو بعدها، وأوقات الإطارات
+        المفتاحية من ffprobe مقرّبة إلى أقرب ميكروثانية فقد تقع بعد الإطار بقليل؛
+        أي تجاوز له يجعل القطع عند الإطار المفتاحي التالي. الهامش أقل من نصف إطار
+        فلا يصل إلى الإطار السابق.
+        """
+        return f"{math.floor(max(0.0, seconds - 0.0005) * 1000000) / 1000000:.6f}"
+    
     def generate_output_filename(self, input_file: str, output_dir: str, 
                                 part_number: int, output_format: str) -> str:
         """توليد اسم ملف الإخراج"""
@@ -120,6 +265,20 @@ class MediaProcessor:
         filename = f"{base_name}_part_{part_number:02d}.{extension}"
         return os.path.join(output_dir, filename)
     
+    def generate_output_pattern(self, input_file: str, output_dir: str, output_format: str) -> str:
+        """توليد نمط أسماء الأجزاء لمقسّم segment (نفس أسماء generate_output_filename)"""
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        extension = self.config.get_output_formats_for_file(input_file).get(
+            output_format, {}
+        ).get('extension', output_format)
+        
+        # مضاعفة علامة % في الاسم حتى لا يفسرها ffmpeg كرقم الجزء
+        base_name = base_name.replace('%', '%%')
+        extension = extension.replace('%', '%%')
+        
+        filename = f"{base_name}_part_%02d.{extension}"
+        return os.path.join(output_dir, filename)
+    
     def create_output_directory(self, input_file: str, output_format: str, custom_dir: str = None) -> str:
         """إنشاء مجلد الإخراج باستخدام النظام الجديد"""
         # استخدام النظام الجديد من config
@@ -132,97 +291,147 @@ class MediaProcessor:
     def analyze_media_streams(self, file_path: str) -> Dict:
         """تحليل مسارات الملف الوسائطي"""
         try:
-            cmd = [
-                self.config.ffprobe_path,
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_streams',
-                file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
-            
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
-                
-                streams_info = {
-                    'video_streams': [],
-                    'audio_streams': [],
-                    'subtitle_streams': [],
-                    'total_streams': 0
-                }
-                
-                for i, stream in enumerate(data.get('streams', [])):
-                    codec_type = stream.get('codec_type', '').lower()
-                    
-                    if codec_type == 'video':
-                        streams_info['video_streams'].append({
-                            'index': i,
-                            'codec_name': stream.get('codec_name', 'unknown'),
-                            'width': stream.get('width', 0),
-                            'height': stream.get('height', 0),
-                            'fps': stream.get('r_frame_rate', '0/1')
-                        })
-                    elif codec_type == 'audio':
-                        streams_info['audio_streams'].append({
-                            'index': i,
-                            'codec_name': stream.get('codec_name', 'unknown'),
-                            'channels': stream.get('channels', 0),
-                            'sample_rate': stream.get('sample_rate', 0),
-                            'language': stream.get('tags', {}).get('language', 'unknown')
-                        })
-                    elif codec_type == 'subtitle':
-                        streams_info['subtitle_streams'].append({
-                            'index': i,
-                            'codec_name': stream.get('codec_name', 'unknown'),
-                            'language': stream.get('tags', {}).get('language', 'unknown')
-                        })
-                
-                streams_info['total_streams'] = len(data.get('streams', []))
-                return streams_info
+            probe = self.probe(file_path)
+            if probe:
+                return probe.streams_info
                 
         except Exception as e:
             print(f"خطأ في تحليل المسارات: {e}")
         
         return {'video_streams': [], 'audio_streams': [], 'subtitle_streams': [], 'total_streams': 0}
     
+    def _build_stream_maps(self, streams_info: Dict) -> List[str]:
+        """بناء معاملات الخريطة لجميع المسارات (فيديو، صوت، ترجمة)"""
+        maps = []
+        
+        # تضمين جميع مسارات الفيديو ثم الصوت ثم الترجمة
+        for key in ('video_streams', 'audio_streams', 'subtitle_streams'):
+            for stream in streams_info[key]:
+                maps.extend(['-map', f"0:{stream['index']}"])
+        
+        return maps
+    
+    def _transcode_streams(self, streams_info: Dict, output_format: str) -> Dict:
+        """المسارات التي يمكن إعادة ترميزها إلى صيغة الإخراج
+        
+        الصيغ الصوتية تأخذ مسارات الصوت فقط، و AVI لا يدعم الترجمة، و MP4/MOV
+        لا تقبل إلا الترجمة النصية (تُحوّل إلى mov_text) فتُستبعد الترجمة المصورة.
+        """
+        output_format = output_format.lower()
+        selected = dict(streams_info)
+        
+        if output_format in self.config.audio_output_formats:
+            selected['video_streams'] = []
+            selected['subtitle_streams'] = []
+        elif output_format == 'avi':
+            selected['subtitle_streams'] = []
+        elif output_format in ('mp4', 'mov'):
+            bitmap_codecs = ('hdmv_pgs_subtitle', 'dvd_subtitle', 'dvb_subtitle', 'xsub')
+            selected['subtitle_streams'] = [
+                stream for stream in streams_info['subtitle_streams']
+                if stream['codec_name'] not in bitmap_codecs
+            ]
+        
+        return selected
+    
+    def _build_codec_args(self, output_format: str, codec_mode: str) -> List[str]:
+        """بناء معاملات الترميز: نسخ بدون ترميز أو إعادة ترميز بإعدادات الجودة"""
+        if codec_mode != 'transcode':
+            # نسخ جميع أنواع المسارات بدون إعادة ترميز
+            return ['-c', 'copy']
+        
+        output_format = output_format.lower()
+        settings = self.config.processing_settings
+        audio_preset = self.config.audio_quality_presets.get(
+            settings.get('audio_quality', 'medium'), self.config.audio_quality_presets['medium']
+        )
+        
+        if output_format in self.config.video_output_formats:
+            format_info = self.config.video_output_formats[output_format]
+            video_preset = self.config.video_quality_presets.get(
+                settings.get('video_quality', 'medium'), self.config.video_quality_presets['medium']
+            )
+            video_encoder = self.select_encoder(format_info['codec'])
+            args = ['-c:v', video_encoder]
+            if video_encoder in self.CRF_ENCODERS:
+                args.extend(['-crf', video_preset['crf'], '-preset', video_preset['preset']])
+            args.extend([
+                '-c:a', self.select_encoder(format_info['audio_codec']),
+                '-b:a', audio_preset['bitrate'],
+                # MP4/MOV تقبل الترجمة النصية بصيغة mov_text فقط
+                '-c:s', 'mov_text' if output_format in ('mp4', 'mov') else 'copy'
+            ])
+        else:
+            format_info = self.config.audio_output_formats[output_format]
+            args = ['-c:a', self.select_encoder(format_info['codec'])]
+            # الصيغ بدون فقد لا تأخذ معدل بت
+            if format_info['codec'] not in ('pcm_s16le', 'flac'):
+                args.extend(['-b:a', audio_preset['bitrate']])
+        
+        # خيوط كل مرمّز: مع عدد العمليات المتزامنة يحددان استغلال المعالج
+        args.extend(['-threads', str(self.resolve_encoder_threads())])
+        return args
+    
+    def _build_seek_args(self, input_file: str, start_time: float, seek_mode: str) -> List[str]:
+        """بناء معاملات الإدخال والبحث حسب وضع البحث"""
+        if seek_mode == 'output':
+            # البحث عند الإخراج: فك ترميز كل ما قبل بداية الجزء
+            return ['-i', input_file, '-ss', self.format_time(start_time)]
+        
+        if seek_mode == 'accurate':
+            # بحث سريع إلى ما قبل البداية ثم قص دقيق للهامش المتبقي فقط
+            margin = float(self.config.processing_settings.get('accurate_seek_margin', 5.0))
+            coarse_start = max(0.0, start_time - margin)
+            args = ['-ss', self.format_time(coarse_start), '-i', input_file]
+            if start_time > coarse_start:
+                args.extend(['-ss', self.format_time(start_time - coarse_start)])
+            return args
+        
+        # البحث السريع عند الإدخال
+        return ['-ss', self.format_time(start_time), '-i', input_file]
+    
     def build_ffmpeg_command(self, input_file: str, output_file: str, 
                            start_time: float, duration: float, 
-                           output_format: str) -> List[str]:
-        """بناء أمر FFmpeg محسن للحفاظ على جميع المسارات"""
+                           output_format: str, seek_mode: str = None,
+                           codec_mode: str = None) -> List[str]:
+        """بناء أمر FFmpeg محسن للحفاظ على جميع المسارات
+        
+        أوضاع البحث (seek_mode):
+        - fast: البحث عند الإدخال (-ss قبل -i) فيقفز FFmpeg مباشرة إلى بداية الجزء
+          وتبقى كلفة كل جزء ثابتة مهما كان موقعه في الملف
+        - accurate: بحث سريع عند الإدخال إلى ما قبل البداية بهامش صغير ثم قص دقيق
+          عند الإخراج لهذا الهامش فقط، للحصول على حدود دقيقة بالإطار. الدقة بالإطار
+          تتطلب إعادة الترميز: مع النسخ يحذف القص عند الإخراج حزم الفيديو حتى الإطار
+          المفتاحي التالي بينما يبدأ الصوت فوراً، لذا يُستخدم البحث السريع مع copy
+        - output: السلوك القديم (-ss بعد -i) الذي يقرأ الملف من بدايته حتى الجزء
+        
+        codec_mode: copy (الافتراضي) أو transcode لإعادة الترميز بإعدادات الجودة
+        """
         
         # تحليل مسارات الملف أولاً
         streams_info = self.analyze_media_streams(input_file)
         
-        cmd = [
-            self.config.ffmpeg_path,
-            '-i', input_file,
-            '-ss', self.format_time(start_time),
-            '-t', self.format_time(duration)
-        ]
-        
-        # إضافة معاملات الخريطة بناءً على المسارات الموجودة
-        if streams_info['video_streams']:
-            # تضمين جميع مسارات الفيديو
-            for video_stream in streams_info['video_streams']:
-                cmd.extend(['-map', f"0:{video_stream['index']}"])
+        if seek_mode is None:
+            seek_mode = self.config.processing_settings.get('seek_mode', 'fast')
+        if codec_mode is None:
+            codec_mode = self.config.processing_settings.get('codec_mode', 'copy')
+        if codec_mode == 'transcode':
+            streams_info = self._transcode_streams(streams_info, output_format)
+        elif seek_mode == 'accurate':
+            # القص الدقيق بدون ترميز يفقد بداية الفيديو ويفصله عن الصوت
+            seek_mode = 'fast'
         
-        if streams_info['audio_streams']:
-            # تضمين جميع مسارات الصوت
-            for audio_stream in streams_info['audio_streams']:
-                cmd.extend(['-map', f"0:{audio_stream['index']}"])
+        cmd = [self.config.ffmpeg_path]
+        cmd.extend(self._build_seek_args(input_file, start_time, seek_mode))
+        cmd.extend(['-t', self.format_time(duration)])
         
-        if streams_info['subtitle_streams']:
-            # تضمين جميع مسارات الترجمة
-            for subtitle_stream in streams_info['subtitle_streams']:
-                cmd.extend(['-map', f"0:{subtitle_stream['index']}"])
+        # إضافة معاملات الخريطة بناءً على المسارات الموجودة
+        cmd.extend(self._build_stream_maps(streams_info))
         
         # إعدادات الترميز
+        cmd.extend(self._build_codec_args(output_format, codec_mode))
+        
         cmd.extend([
-            # نسخ جميع أنواع المسارات بدون إعادة ترميز
-            '-c', 'copy',
-            
             # معالجة الطوابع الزمنية
             '-avoid_negative_ts', 'make_zero',
             
@@ -248,12 +457,78 @@ class MediaProcessor:
         
         return cmd
     
+    def build_segment_muxer_command(self, input_file: str, output_dir: str,
+                                    segments: List[Tuple[float, float]],
+                                    output_format: str) -> List[str]:
+        """بناء أمر FFmpeg واحد يقطّع الملف كاملاً عبر مقسّم segment"""
+        streams_info = self.analyze_media_streams(input_file)
+        
+        # نقاط القطع هي بدايات الأجزاء عدا الجزء الأول
+        segment_times = ','.join(self.format_cut_time(start) for start, _ in segments[1:])
+        
+        cmd = [
+            self.config.ffmpeg_path,
+            '-i', input_file
+        ]
+        
+        cmd.extend(self._build_stream_maps(streams_info))
+        
+        cmd.extend([
+            # نسخ جميع أنواع المسارات بدون إعادة ترميز
+            '-c', 'copy',
+            
+            # معالجة الطوابع الزمنية
+            '-avoid_negative_ts', 'make_zero',
+            
+            # نسخ البيانات الوصفية
+            '-map_metadata', '0',
+            
+            # تعيين الترتيب الافتراضي
+            '-disposition:v', 'default',
+            '-disposition:a', 'default',
+            
+            # مقسّم segment: قراءة واحدة خطية للملف بدلاً من فتحه لكل جزء
+            '-f', 'segment',
+            '-reset_timestamps', '1',
+            '-segment_start_number', '1'
+        ])
+        
+        if segment_times:
+            cmd.extend(['-segment_times', segment_times])
+        else:
+            # جزء واحد فقط: منع المقسّم من القطع التلقائي
+            cmd.extend(['-segment_time', self.format_time(segments[0][1] + 1)])
+        
+        # إضافة معاملات خاصة بالصيغة
+        if output_format.lower() in ('mp4', 'mov'):
+            cmd.extend(['-segment_format_options', 'movflags=+faststart'])
+        elif output_format.lower() == 'mkv':
+            cmd.extend(['-strict', '-2'])
+        
+        cmd.extend(['-y', self.generate_output_pattern(input_file, output_dir, output_format)])
+        
+        return cmd
+    
     def process_media_file(self, input_file: str, segment_duration: float,
-                          output_format: str, output_directory: str = None) -> bool:
+                          output_format: str, output_directory: str = None,
+                          split_mode: str = None) -> bool:
         """تقطيع الملف الوسائطي"""
+        self.trace_job = self.tracer.begin_job(input_file)
+        with self.tracer.span('job', self.trace_job, file=input_file):
+            return self._process_media_file(
+                input_file, segment_duration, output_format, output_directory, split_mode
+            )
+    
+    def _process_media_file(self, input_file: str, segment_duration: float,
+                            output_format: str, output_directory: str = None,
+                            split_mode: str = None) -> bool:
+        """مراحل تقطيع الملف: الفحص، التخطيط، التقطيع، الإنهاء"""
         try:
             self.is_processing = True
             self.should_stop = False
+            self.process_registry.reset()
+            self.progress_publisher.reset()
+            self.last_stats = {}
             
             # الحصول على معلومات الملف
             media_info = self.get_media_info(input_file)
@@ -267,13 +542,16 @@ class MediaProcessor:
                 return False
             
             # حساب القطع
-            segments = self.calculate_segments(total_duration, segment_duration)
+            planner = self.config.processing_settings.get('segment_planner', 'fixed')
+            with self.tracer.span('plan', self.trace_job, planner=planner):
+                segments = self.calculate_segments(total_duration, segment_duration, input_file)
             if not segments:
                 self._notify_completion(False, "فشل في حساب قطع التقسيم", "")
                 return False
             
             # إنشاء مجلد الإخراج
-            output_dir = self.create_output_directory(input_file, output_format, output_directory)
+            with self.tracer.span('mkdir', self.trace_job):
+                output_dir = self.create_output_directory(input_file, output_format, output_directory)
             
             # تحليل مسارات الملف لعرض المعلومات
             streams_info = self.analyze_media_streams(input_file)
@@ -291,55 +569,23 @@ class MediaProcessor:
             total_segments = len(segments)
             self._update_progress(5, f"بدء تقطيع الملف إلى {total_segments} أجزاء...")
             
-            for i, (start_time, end_time) in enumerate(segments):
-                if self.should_stop:
-                    self._notify_completion(False, "تم إيقاف العملية بواسطة المستخدم", "")
+            # اختيار محرك التقطيع
+            split_mode = self.resolve_split_mode(split_mode)
+            
+            if split_mode == 'single_pass':
+                # تشغيل واحد لـ FFmpeg لكل الأجزاء
+                total_segments = self._split_single_pass(input_file, output_dir, segments, output_format)
+                if not total_segments:
                     return False
-                
-                # تحديث التقدم - بداية معالجة الجزء
-                base_progress = (i / total_segments) * 90  # 90% للمعالجة، 10% للتهيئة والنهاية
-                self._update_progress(base_progress + 5, f"إعداد الجزء {i + 1} من {total_segments}")
-                time.sleep(0.3)  # وقت أطول لإظهار التحديث
-                
-                # توليد اسم الملف
-                output_file = self.generate_output_filename(
-                    input_file, output_dir, i + 1, output_format
-                )
-                
-                # بناء أمر FFmpeg
-                segment_duration_actual = end_time - start_time
-                cmd = self.build_ffmpeg_command(
-                    input_file, output_file, start_time, segment_duration_actual, output_format
-                )
-                
-                # تحديث التقدم - بدء المعالجة
-                self._update_progress(base_progress + 10, f"معالجة الجزء {i + 1} من {total_segments}")
-                time.sleep(0.2)  # وقت لإظهار بداية المعالجة
-                
-                # تنفيذ الأمر
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    encoding='utf-8'
-                )
-                
-                if result.returncode != 0:
-                    error_msg = f"فشل في معالجة الجزء {i + 1}: {result.stderr}"
-                    self._notify_completion(False, error_msg, "")
+            else:
+                # تشغيل لكل جزء عبر مجموعة عمال محدودة
+                if not self._split_per_segment(input_file, output_dir, segments, output_format):
                     return False
-                
-                # تحديث التقدم - إنجاز الجزء
-                completed_progress = ((i + 1) / total_segments) * 90 + 5
-                self._update_progress(completed_progress, f"تم إنجاز الجزء {i + 1} من {total_segments}")
-                time.sleep(0.2)  # وقت لإظهار إنجاز الجزء
             
             # تحديث التقدم النهائي
-            self._update_progress(95, "جاري حفظ الملفات النهائية...")
-            time.sleep(0.5)  # وقت قصير للحفظ
-            
-            self._update_progress(100, f"تم إنجاز التقطيع بنجاح - {total_segments} أجزاء")
-            self._notify_completion(True, f"تم تقطيع الملف إلى {total_segments} أجزاء بنجاح", output_dir)
+            with self.tracer.span('finalize', self.trace_job):
+                self._update_progress(100, f"تم إنجاز التقطيع بنجاح - {total_segments} أجزاء", force=True)
+                self._notify_completion(True, f"تم تقطيع الملف إلى {total_segments} أجزاء بنجاح", output_dir)
             
             return True
             
@@ -350,10 +596,556 @@ class MediaProcessor:
         
         finally:
             self.is_processing = False
-            self.current_process = None
+    
+    def get_capabilities(self) -> Optional[FFmpegCapabilities]:
+        """قدرات FFmpeg المستخدم، أو None إذا تعذر فحصه (فيُفترض توفر كل شيء)"""
+        if not self._capabilities_loaded:
+            self._capabilities = get_capabilities(
+                self.config.ffmpeg_path, self.config.capabilities_cache_path
+            )
+            self._capabilities_loaded = True
+        return self._capabilities
+    
+    def select_encoder(self, preferred: str) -> str:
+        """المرمّز المطلوب أو أول بديل متوفر له في نسخة FFmpeg الحالية"""
+        capabilities = self.get_capabilities()
+        if capabilities is None or capabilities.has_encoder(preferred):
+            return preferred
+        return capabilities.first_encoder(self.ENCODER_FALLBACKS.get(preferred, [])) or preferred
+    
+    def resolve_split_mode(self, split_mode: str = None) -> str:
+        """محرك التقطيع الفعلي
+        
+        إعادة الترميز (الكاملة أو لبداية الأجزاء) تتم لكل جزء كقطعة مستقلة متوازية،
+        والتشغيل الواحد يتطلب مقسّم segment في نسخة FFmpeg.
+        """
+        if split_mode is None:
+            split_mode = self.config.processing_settings.get('split_mode', 'single_pass')
+        if self.config.processing_settings.get('codec_mode', 'copy') != 'copy':
+            return 'per_segment'
+        if split_mode == 'single_pass':
+            capabilities = self.get_capabilities()
+            if capabilities is not None and not capabilities.has_muxer('segment'):
+                return 'per_segment'
+        return split_mode
+    
+    def is_stream_copy(self) -> bool:
+        """هل وضع الترميز الحالي نسخ بدون إعادة ترميز"""
+        return self.config.processing_settings.get('codec_mode', 'copy') != 'transcode'
+    
+    def resolve_worker_count(self, stream_copy: bool = True) -> int:
+        """تحديد عدد عمليات FFmpeg المتزامنة
+        
+        تستخدم قيمة max_concurrent_processes إن حُددت، وإلا تُحسب تلقائياً:
+        النسخ بدون ترميز محدود بسرعة القرص فيكفيه عدد قليل من العمليات،
+        أما إعادة الترميز فمحدودة بالمعالج فتُقسم المعالجات على خيوط كل مرمّز.
+        """
+        configured = self.config.processing_settings.get('max_concurrent_processes')
+        if configured:
+            return max(1, int(configured))
+        
+        cpu_count = os.cpu_count() or 1
+        if stream_copy:
+            return max(1, min(4, cpu_count))
+        
+        encoder_threads = self.config.processing_settings.get('encoder_threads')
+        if encoder_threads:
+            return max(1, cpu_count // max(1, int(encoder_threads)))
+        return max(1, cpu_count // 2)
+    
+    def resolve_encoder_threads(self) -> int:
+        """عدد خيوط كل مرمّز: القيمة المحددة أو نصيب كل عملية من المعالجات"""
+        encoder_threads = self.config.processing_settings.get('encoder_threads')
+        if encoder_threads:
+            return max(1, int(encoder_threads))
+        
+        cpu_count = os.cpu_count() or 1
+        return max(1, cpu_count // self.resolve_worker_count(stream_copy=False))
+    
+    def _run_ffmpeg(self, cmd: List[str],
+                    on_progress: Callable[[FFmpegProgressParser], None] = None,
+                    registry: ProcessRegistry = None) -> Tuple[int, bytes]:
+        """تشغيل FFmpeg مع قراءة تقدمه لحظياً من -progress
+        
+        يعيد رمز الخروج وآخر أسطر stderr كبايتات (يتم فك ترميزها عند الفشل فقط)؛
+        يُحتفظ بآخر stderr_tail_lines سطراً فقط فلا تنمو الذاكرة مع طول المهمة.
+        registry (اختياري): سجل خاص بالمستدعي بدلاً من سجل المعالج المشترك.
+        """
+        registry = registry or self.process_registry
+        # خيارات عامة: تقدم قابل للقراءة آلياً على stdout بدلاً من إحصاءات stderr
+        cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:]
+        
+        # التشغيل عبر السجل حتى يصلها stop_processing فوراً
+        output = os.path.basename(cmd[-1])
+        with self.tracer.span('spawn', self.trace_job, output=output):
+            process = registry.spawn(cmd, stdin=subprocess.DEVNULL,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        run_span = self.tracer.span('run', self.trace_job, output=output)
+        run_span.__enter__()
+        try:
+            # تفريغ stderr في خيط منفصل حتى لا يمتلئ الأنبوب ويتوقف FFmpeg
+            stderr_tail = self.create_stderr_tail()
+            stderr_thread = threading.Thread(
+                target=stderr_tail.read_from, args=(process.stderr,), daemon=True
+            )
+            stderr_thread.start()
+            
+            parser = FFmpegProgressParser()
+            for line in process.stdout:
+                if parser.feed(line) and on_progress:
+                    on_progress(parser)
+            
+            returncode = process.wait()
+            stderr_thread.join()
+        finally:
+            registry.unregister(process)
+            process.stdout.close()
+            process.stderr.close()
+            run_span.__exit__(None, None, None)
+        
+        return returncode, stderr_tail.getvalue()
+    
+    def create_stderr_tail(self) -> OutputTail:
+        """حلقة آخر أسطر stderr لعملية واحدة"""
+        return OutputTail(self.config.processing_settings.get('stderr_tail_lines', 50))
+    
+    def _remove_partial_outputs(self, output_files):
+        """حذف ملفات الإخراج غير المكتملة بعد الإيقاف أو الفشل"""
+        for output_file in output_files:
+            try:
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+            except OSError as e:
+                print(f"خطأ في حذف الملف غير المكتمل: {e}")
+    
+    def _output_signatures(self, output_files: List[str]) -> List[Optional[Tuple[int, int]]]:
+        """(وقت التعديل بالنانوثانية، الحجم) لكل ملف، أو None إن لم يوجد"""
+        signatures = []
+        for output_file in output_files:
+            try:
+                stat = os.stat(output_file)
+                signatures.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signatures.append(None)
+        return signatures
+    
+    def run_segment(self, input_file: str, output_file: str, start_time: float, end_time: float,
+                    output_format: str,
+                    on_progress: Callable[[FFmpegProgressParser], None] = None,
+                    registry: ProcessRegistry = None) -> Tuple[int, bytes]:
+        """تقطيع جزء واحد إلى ملف إخراج
+        
+        وحدة العمل المشتركة بين محرك per_segment وطابور الملفات المتعددة؛
+        يعيد رمز خروج FFmpeg ومخرجات الخطأ، ويرفع ProcessCancelledError بعد الإيقاف.
+        registry (اختياري): سجل لعمليات هذا الجزء وحده حتى يمكن إيقافه دون غيره.
+        """
+        if self.config.processing_settings.get('codec_mode', 'copy') == 'smart':
+            return self._run_smart_segment(
+                input_file, output_file, start_time, end_time, output_format, on_progress, registry
+            )
+        
+        cmd = self.build_ffmpeg_command(
+            input_file, output_file, start_time, end_time - start_time, output_format
+        )
+        return self._run_ffmpeg(cmd, on_progress, registry)
+    
+    def plan_smart_cut(self, input_file: str, start_time: float,
+                       end_time: float) -> Optional[List[Tuple[str, float, float]]]:
+        """تقسيم جزء إلى قطع للوضع الذكي: (الطريقة، البداية، النهاية)
+        
+        - encode: من حد الجزء إلى أقرب إطار مفتاحي داخله (إعادة ترميز)
+        - copy: مجموعات الإطارات الكاملة بين أول وآخر إطار مفتاحي (نسخ بدون ترميز)
+        يعيد قطعة copy واحدة إذا كان النسخ وحده دقيقاً (ملف صوتي أو حدود على إطارات مفتاحية)،
+        أو None إذا لم يوجد نطاق كامل للنسخ أو كان ترميز المصدر غير مدعوم فيُعاد ترميز الجزء كاملاً.
+        """
+        probe = self.probe(input_file)
+        if not probe or not probe.streams_info['video_streams']:
+            # الصوت بلا إطارات مفتاحية فيكون النسخ دقيقاً
+            return [('copy', start_time, end_time)]
+        
+        video = probe.streams_info['video_streams'][0]
+        index = self.get_keyframe_index(input_file)
+        if not self.supports_smart_cut(video['codec_name']) or not index:
+            return None
+        
+        # هامش نصف ملي ثانية لفروق تقريب الطوابع الزمنية
+        epsilon = 0.0005
+        times = index.times
+        
+        i = bisect_left(times, start_time - epsilon)
+        if i >= len(times) or times[i] >= end_time - epsilon:
+            return None
+        first_keyframe = times[i]
+        
+        # نهاية الملف حد نظيف للنسخ مثل الإطار المفتاحي
+        if end_time >= probe.duration - epsilon:
+            last_keyframe = end_time
+        else:
+            last_keyframe = times[bisect_right(times, end_time + epsilon) - 1]
+        
+        if last_keyframe - first_keyframe < epsilon:
+            return None
+        
+        # مدة الإطار: قطعة ترميز أقصر منها قبل الإطار المفتاحي لا تحتوي أي إطار
+        # (مثل ملفات يبدأ فيها الفيديو بعد الصفر بقليل) فيرفضها مدمج concat
+        num, _, den = str(video.get('fps', '0/1')).partition('/')
+        try:
+            frame_duration = float(den or 1) / float(num)
+        except (ValueError, ZeroDivisionError):
+            frame_duration = epsilon
+        
+        pieces = []
+        if i > 0 and first_keyframe - start_time >= max(epsilon, frame_duration - epsilon):
+            pieces.append(('encode', start_time, first_keyframe))
+        pieces.append(('copy', first_keyframe, last_keyframe))
+        if end_time - last_keyframe >= epsilon:
+            pieces.append(('encode', last_keyframe, end_time))
+        return pieces
+    
+    def supports_smart_cut(self, codec_name: str) -> bool:
+        """هل يمكن إعادة ترميز بداية الجزء بنفس ترميز المصدر ودمجها مع المنسوخ"""
+        encoder = self.SMART_CUT_ENCODERS.get(codec_name)
+        if encoder is None:
+            return False
+        capabilities = self.get_capabilities()
+        return capabilities is None or (
+            capabilities.has_encoder(encoder) and capabilities.has_bsf(f"{codec_name}_mp4toannexb")
+        )
+    
+    def _build_smart_piece_command(self, input_file: str, piece_file: str, method: str,
+                                   start_time: float, end_time: float) -> List[str]:
+        """بناء أمر قطعة فيديو واحدة من الجزء
+        
+        تحمل كل قطعة معاملات الترميز (SPS/PPS) داخل التدفق حتى تبقى قابلة لفك الترميز
+        بعد الدمج، لأن مدمج concat يأخذ معاملات الملف الأول فقط.
+        """
+        probe = self.probe(input_file)
+        video = probe.streams_info['video_streams'][0]
+        codec_name = video['codec_name']
+        
+        if method == 'copy':
+            index = self.get_keyframe_index(input_file)
+            # النسخ يتوقف بتوقيت فك الترميز: يُطرح تأخره حتى لا يدخل الإطار المفتاحي التالي
+            duration = end_time - start_time - index.decode_delay - 0.002
+            cmd = [
+                self.config.ffmpeg_path,
+                # البحث بعد الإطار المفتاحي بقليل يضمن القفز إليه وليس إلى الذي قبله
+                '-ss', self.format_time(start_time + 0.001),
+                '-i', input_file,
+                '-t', self.format_time(max(0.001, duration)),
+                '-map', f"0:{video['index']}",
+                '-c', 'copy',
+                '-bsf:v', f"{codec_name}_mp4toannexb"
+            ]
+        else:
+            preset = self.config.video_quality_presets.get(
+                self.config.processing_settings.get('video_quality', 'medium'),
+                self.config.video_quality_presets['medium']
+            )
+            encoder = self.SMART_CUT_ENCODERS[codec_name]
+            cmd = [
+                self.config.ffmpeg_path,
+                '-ss', self.format_time(max(0.0, start_time - 0.0005)),
+                '-i', input_file,
+                # ملي ثانية أقل حتى لا يدخل الإطار الأول من القطعة التالية
+                '-t', self.format_time(max(0.001, end_time - start_time - 0.001)),
+                '-map', f"0:{video['index']}",
+                '-c:v', encoder,
+                '-crf', preset['crf'],
+                '-preset', preset['preset'],
+                f"-{encoder[3:]}-params", 'repeat-headers=1'
+            ]
+            pix_fmt = probe.streams[video['index']].get('pix_fmt')
+            if pix_fmt:
+                cmd.extend(['-pix_fmt', pix_fmt])
+        
+        cmd.extend(['-avoid_negative_ts', 'make_zero', '-f', 'matroska', '-y', piece_file])
+        return cmd
+    
+    def _build_smart_side_command(self, input_file: str, side_file: str,
+                                  start_time: float, duration: float) -> Optional[List[str]]:
+        """نسخ الصوت والترجمة للجزء بقص دقيق عند الإخراج (لا تحتاج إعادة ترميز)"""
+        streams_info = self.analyze_media_streams(input_file)
+        maps = []
+        for key in ('audio_streams', 'subtitle_streams'):
+            for stream in streams_info[key]:
+                maps.extend(['-map', f"0:{stream['index']}"])
+        if not maps:
+            return None
+        
+        cmd = [self.config.ffmpeg_path]
+        cmd.extend(self._build_seek_args(input_file, start_time, 'accurate'))
+        cmd.extend(['-t', self.format_time(duration)])
+        cmd.extend(maps)
+        cmd.extend(['-c', 'copy', '-map_metadata', '0', '-y', side_file])
+        return cmd
+    
+    def _build_smart_concat_command(self, list_file: str, side_file: Optional[str],
+                                    output_file: str, output_format: str) -> List[str]:
+        """دمج قطع الفيديو بمدمج concat مع الصوت والترجمة بدون ترميز"""
+        cmd = [
+            self.config.ffmpeg_path,
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_file
+        ]
+        if side_file:
+            cmd.extend(['-i', side_file, '-map', '0:v', '-map', '1:a?', '-map', '1:s?',
+                        '-map_metadata', '1'])
+        else:
+            cmd.extend(['-map', '0:v'])
+        
+        cmd.extend([
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-disposition:v', 'default',
+            '-disposition:a', 'default'
+        ])
+        
+        if output_format.lower() in ('mp4', 'mov'):
+            cmd.extend(['-movflags', '+faststart'])
+        elif output_format.lower() == 'mkv':
+            cmd.extend(['-strict', '-2'])
+        
+        cmd.extend(['-y', output_file])
+        return cmd
+    
+    def _run_smart_segment(self, input_file: str, output_file: str, start_time: float,
+                           end_time: float, output_format: str,
+                           on_progress: Callable[[FFmpegProgressParser], None] = None,
+                           registry: ProcessRegistry = None) -> Tuple[int, bytes]:
+        """قطع جزء بدقة الإطار مع إعادة ترميز مجموعات الإطارات عند حدوده فقط
+        
+        ما بين أول وآخر إطار مفتاحي يُنسخ كما هو، والصوت والترجمة تُنسخ بقص دقيق،
+        ثم تُدمج القطع بمدمج concat في مجلد مؤقت داخل temp_path.
+        """
+        pieces = self.plan_smart_cut(input_file, start_time, end_time)
+        # قطعة نسخ وحيدة تبدأ بعد حد الجزء (لا إطارات قبل إطارها المفتاحي) تمر بالدمج
+        # حتى لا يقفز البحث إلى الإطار المفتاحي السابق ويُقص الصوت بدقة
+        if pieces is None or (len(pieces) == 1 and pieces[0][1] - start_time < 0.0005):
+            codec_mode = 'transcode' if pieces is None else 'copy'
+            cmd = self.build_ffmpeg_command(
+                input_file, output_file, start_time, end_time - start_time, output_format,
+                codec_mode=codec_mode
+            )
+            return self._run_ffmpeg(cmd, on_progress, registry)
+        
+        os.makedirs(self.config.temp_path, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix='smart_', dir=self.config.temp_path)
+        list_file = os.path.join(work_dir, 'pieces.txt')
+        side_file = os.path.join(work_dir, f"side.{output_format.lower()}")
+        
+        def offset_progress(offset: float):
+            """تقدم كل قطعة يُحسب بعد مدة القطع التي قبلها"""
+            if not on_progress:
+                return None
+            
+            def report(parser: FFmpegProgressParser):
+                parser.out_time += offset
+                on_progress(parser)
+            return report
+        
+        try:
+            piece_files = []
+            for i, (method, piece_start, piece_end) in enumerate(pieces):
+                piece_file = os.path.join(work_dir, f"piece_{i}.mkv")
+                cmd = self._build_smart_piece_command(
+                    input_file, piece_file, method, piece_start, piece_end
+                )
+                returncode, stderr = self._run_ffmpeg(
+                    cmd, offset_progress(piece_start - start_time), registry
+                )
+                if returncode != 0:
+                    return returncode, stderr
+                piece_files.append((piece_file, piece_end - piece_start))
+            
+            cmd = self._build_smart_side_command(input_file, side_file, start_time, end_time - start_time)
+            if cmd:
+                returncode, stderr = self._run_ffmpeg(cmd, registry=registry)
+                if returncode != 0:
+                    return returncode, stderr
+            else:
+                side_file = None
+            
+            # مدة كل قطعة صريحة حتى تتصل الطوابع الزمنية دون فجوات
+            with open(list_file, 'w', encoding='utf-8') as f:
+                for piece_file, duration in piece_files:
+                    escaped = piece_file.replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\nduration {duration:.6f}\n")
+            
+            cmd = self._build_smart_concat_command(list_file, side_file, output_file, output_format)
+            return self._run_ffmpeg(cmd, registry=registry)
+        
+        finally:
+            if self.config.processing_settings.get('temp_cleanup', True):
+                shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def _split_per_segment(self, input_file: str, output_dir: str,
+                           segments: List[Tuple[float, float]], output_format: str) -> bool:
+        """تقطيع الأجزاء بتشغيل مستقل لكل جزء مع تنفيذ متوازٍ محدود"""
+        total_segments = len(segments)
+        workers = min(self.resolve_worker_count(stream_copy=self.is_stream_copy()), total_segments)
+        
+        job_progress = JobProgress([end - start for start, end in segments])
+        failed = threading.Event()
+        error_msg = None
+        completed = [0]
+        partial_outputs = set()  # أجزاء بدأت ولم تكتمل بعد
+        
+        def report_progress(message: str, parser: FFmpegProgressParser = None):
+            """نشر التقدم الكلي المجمّع من جميع العمال"""
+            stats = job_progress.snapshot()
+            if parser:
+                stats['bitrate'] = parser.bitrate
+            self._update_progress(5 + stats['fraction'] * 90, message, stats=stats)
+        
+        def run_segment(i: int, start_time: float, end_time: float):
+            """تنفيذ جزء واحد داخل أحد العمال"""
+            # عدم بدء أجزاء جديدة بعد الإيقاف أو فشل جزء آخر
+            if self.should_stop or failed.is_set():
+                return i, None, b''
+            
+            message = f"معالجة الجزء {i + 1} من {total_segments}"
+            report_progress(message)
+            
+            # توليد اسم الملف
+            output_file = self.generate_output_filename(
+                input_file, output_dir, i + 1, output_format
+            )
+            
+            def on_progress(parser: FFmpegProgressParser):
+                job_progress.update(i, parser.out_time)
+                report_progress(message, parser)
+            
+            # تنفيذ الأمر مع قراءة التقدم لحظياً
+            partial_outputs.add(output_file)
+            try:
+                returncode, stderr = self.run_segment(
+                    input_file, output_file, start_time, end_time, output_format, on_progress
+                )
+            except ProcessCancelledError:
+                return i, None, b''
+            
+            if returncode == 0:
+                partial_outputs.discard(output_file)
+            else:
+                # إعلام بقية العمال فوراً بعدم بدء أجزاء جديدة
+                failed.set()
+            return i, returncode, stderr
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_segment, i, start_time, end_time)
+                for i, (start_time, end_time) in enumerate(segments)
+            ]
+            
+            for future in as_completed(futures):
+                i, returncode, stderr = future.result()
+                if returncode is None:
+                    continue
+                
+                if returncode != 0:
+                    # الفشل السريع: إلغاء الأجزاء التي لم تبدأ بعد وإنهاء الأجزاء الجارية
+                    # (فشل عملية أوقفها المستخدم ليس خطأ يُبلّغ عنه)
+                    if error_msg is None and not self.should_stop:
+                        error_msg = f"فشل في معالجة الجزء {i + 1}: {decode_output(stderr)}"
+                        for pending in futures:
+                            pending.cancel()
+                        self.process_registry.cancel()
+                    continue
+                
+                # تحديث التقدم - إنجاز الجزء
+                completed[0] += 1
+                job_progress.complete(i)
+                report_progress(f"تم إنجاز الجزء {i + 1} ({completed[0]} من {total_segments})")
+        
+        if failed.is_set() or self.should_stop:
+            self._remove_partial_outputs(partial_outputs)
+        
+        if self.should_stop:
+            self._notify_completion(False, "تم إيقاف العملية بواسطة المستخدم", "")
+            return False
+        
+        if failed.is_set():
+            # الإشعار بعد انتهاء جميع العمال حتى تُقبل مهمة جديدة فور ظهور الخطأ
+            if error_msg is not None:
+                self._notify_completion(False, error_msg, "")
+            return False
+        
+        return True
+    
+    def _split_single_pass(self, input_file: str, output_dir: str,
+                           segments: List[Tuple[float, float]], output_format: str) -> int:
+        """تقطيع الملف كاملاً في تشغيل واحد لـ FFmpeg عبر مقسّم segment
+        
+        يعيد عدد الأجزاء المنشأة (0 عند الفشل): في النسخ بدون ترميز لا يقطع المقسّم إلا
+        عند إطار مفتاحي، فإذا لم يوجد إطار مفتاحي بعد آخر نقطة قطع تبقى بقية الملف في
+        الجزء السابق ويكون عدد الأجزاء أقل من المخطط دون فقد أي جزء من الوسائط.
+        """
+        total_segments = len(segments)
+        
+        if self.should_stop:
+            self._notify_completion(False, "تم إيقاف العملية بواسطة المستخدم", "")
+            return 0
+        
+        # مجلد الإخراج قد يحتوي أجزاء تشغيل سابق بالأسماء نفسها: لا يُعتبر جزءاً من هذا
+        # التشغيل إلا ما أُنشئ أو تغيّر توقيعه، فلا يُحذف ولا يُحسب ما لم يكتبه
+        output_files = [
+            self.generate_output_filename(input_file, output_dir, i + 1, output_format)
+            for i in range(total_segments)
+        ]
+        before = self._output_signatures(output_files)
+        
+        cmd = self.build_segment_muxer_command(input_file, output_dir, segments, output_format)
+        message = f"معالجة {total_segments} أجزاء في تمريرة واحدة"
+        self._update_progress(5, message)
+        
+        job_progress = JobProgress([segments[-1][1]])
+        
+        def on_progress(parser: FFmpegProgressParser):
+            job_progress.update(0, parser.out_time)
+            stats = job_progress.snapshot()
+            stats['bitrate'] = parser.bitrate
+            self._update_progress(5 + stats['fraction'] * 90, message, stats=stats)
+        
+        try:
+            returncode, stderr = self._run_ffmpeg(cmd, on_progress)
+        except ProcessCancelledError:
+            returncode, stderr = None, b''
+        
+        written = [
+            signature is not None and signature != old
+            for old, signature in zip(before, self._output_signatures(output_files))
+        ]
+        
+        if returncode != 0:
+            # المقسّم يكتب الأجزاء بالترتيب: آخر جزء كتبه هذا التشغيل فقط قد يكون غير مكتمل
+            self._remove_partial_outputs([
+                output_file for output_file, is_written in zip(output_files, written) if is_written
+            ][-1:])
+            
+            if self.should_stop:
+                self._notify_completion(False, "تم إيقاف العملية بواسطة المستخدم", "")
+            else:
+                error_msg = f"فشل في تقطيع الملف: {decode_output(stderr)}"
+                self._notify_completion(False, error_msg, "")
+            return 0
+        
+        # مطابقة الأجزاء المخططة مع الملفات المكتوبة فعلاً: الأجزاء الناقصة مقبولة في
+        # النهاية فقط (دُمجت في الجزء السابق)، أما الفجوة في الوسط فتعني فشلاً
+        with self.tracer.span('finalize', self.trace_job, step='verify'):
+            produced = written.index(False) if False in written else total_segments
+            if produced == 0 or any(written[produced:]):
+                self._notify_completion(False, f"لم يتم إنشاء الجزء {produced + 1}", "")
+                return 0
+        
+        self._update_progress(95, f"تم إنجاز {produced} أجزاء")
+        return produced
     
     def process_media_file_async(self, input_file: str, segment_duration: float,
-                                output_format: str, output_directory: str = None):
+                                output_format: str, output_directory: str = None,
+                                split_mode: str = None):
         """تقطيع الملف بشكل غير متزامن"""
         if self.is_processing:
             return False
@@ -361,27 +1153,33 @@ class MediaProcessor:
         # تشغيل المعالجة في خيط منفصل
         processing_thread = threading.Thread(
             target=self.process_media_file,
-            args=(input_file, segment_duration, output_format, output_directory),
+            args=(input_file, segment_duration, output_format, output_directory, split_mode),
             daemon=True
         )
         processing_thread.start()
         return True
     
     def stop_processing(self):
-        """إيقاف المعالجة الحالية"""
+        """إيقاف المعالجة الحالية وإنهاء جميع العمليات الحية فوراً"""
         self.should_stop = True
-        if self.current_process:
-            try:
-                self.current_process.terminate()
-            except:
-                pass
+        self.process_registry.cancel()
     
-    def _update_progress(self, percentage: float, message: str):
-        """تحديث التقدم الداخلي"""
-        if self.progress_callback:
-            self.progress_callback(percentage, message)
+    def _update_progress(self, percentage: float, message: str,
+                         force: bool = False, stats: Dict = None):
+        """تحديث التقدم الداخلي عبر الناشر المدمج
+        
+        stats (اختياري): السرعة (x الزمن الحقيقي) والوقت المتبقي ومعدل البت،
+        تُحفظ في last_stats وتُضاف إلى نص الرسالة.
+        """
+        if stats:
+            self.last_stats = stats
+            message = format_progress_message(message, stats)
+        self.progress_publisher.publish(percentage, message, force)
     
     def _notify_completion(self, success: bool, message: str, output_path: str):
         """إشعار الإنجاز الداخلي"""
+        # إرسال آخر تقدم معلق قبل إشعار الإنجاز
+        self.progress_publisher.flush()
         if self.completion_callback:
-            self.completion_callback(success, message, output_path)
\ No newline at end of file
+            with self.tracer.span('callback', self.trace_job, kind='completion'):
+                self.completion_callback(success, message, output_path)
\ No newline at end of file
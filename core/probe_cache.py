@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+ذاكرة مؤقتة لنتائج ffprobe
+يتم فحص كل ملف مرة واحدة فقط لكل (مسار، حجم، وقت تعديل) وتعاد النتيجة لجميع المستدعين
+"""
+
+import os
+import json
+import threading
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional, Dict, List, Tuple
+
+from core.process_registry import ProcessRegistry, ProcessCancelledError, popen
+
+class MediaProbe:
+    """نتيجة فحص ffprobe واحدة لملف وسائطي"""
+    
+    def __init__(self, file_path: str, data: Dict):
+        """تهيئة نتيجة الفحص من مخرجات ffprobe بصيغة JSON"""
+        self.file_path = file_path
+        self.format = data.get('format', {})
+        self.streams = data.get('streams', [])
+        self.duration = float(self.format.get('duration', 0) or 0)
+        
+        self.media_info = self._build_media_info()
+        self.streams_info = self._build_streams_info()
+    
+    def _build_media_info(self) -> Dict:
+        """استخراج المعلومات العامة للملف"""
+        video_stream = None
+        audio_stream = None
+        
+        # البحث عن أول تدفق فيديو وصوت
+        for stream in self.streams:
+            if stream.get('codec_type') == 'video' and not video_stream:
+                video_stream = stream
+            elif stream.get('codec_type') == 'audio' and not audio_stream:
+                audio_stream = stream
+        
+        return {
+            'duration': self.duration,
+            'duration_str': str(timedelta(seconds=int(self.duration))),
+            'format_name': self.format.get('format_name', ''),
+            'size': int(self.format.get('size', 0)),
+            'bitrate': int(self.format.get('bit_rate', 0)),
+            'video_stream': video_stream,
+            'audio_stream': audio_stream,
+            'is_video': video_stream is not None,
+            'is_audio': audio_stream is not None
+        }
+    
+    def _build_streams_info(self) -> Dict:
+        """تصنيف المسارات حسب النوع"""
+        streams_info = {
+            'video_streams': [],
+            'audio_streams': [],
+            'subtitle_streams': [],
+            'total_streams': len(self.streams)
+        }
+        
+        for i, stream in enumerate(self.streams):
+            codec_type = stream.get('codec_type', '').lower()
+            
+            if codec_type == 'video':
+                streams_info['video_streams'].append({
+                    'index': i,
+                    'codec_name': stream.get('codec_name', 'unknown'),
+                    'width': stream.get('width', 0),
+                    'height': stream.get('height', 0),
+                    'fps': stream.get('r_frame_rate', '0/1')
+                })
+            elif codec_type == 'audio':
+                streams_info['audio_streams'].append({
+                    'index': i,
+                    'codec_name': stream.get('codec_name', 'unknown'),
+                    'channels': stream.get('channels', 0),
+                    'sample_rate': stream.get('sample_rate', 0),
+                    'language': stream.get('tags', {}).get('language', 'unknown')
+                })
+            elif codec_type == 'subtitle':
+                streams_info['subtitle_streams'].append({
+                    'index': i,
+                    'codec_name': stream.get('codec_name', 'unknown'),
+                    'language': stream.get('tags', {}).get('language', 'unknown')
+                })
+        
+        return streams_info
+
+class ProbeCache:
+    """ذاكرة LRU محدودة الحجم لنتائج الفحص"""
+    
+    def __init__(self, max_entries: int = 64):
+        """تهيئة الذاكرة المؤقتة"""
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()  # المسار -> (الحجم، وقت التعديل، النتيجة)
+        self._lock = threading.Lock()
+    
+    def _file_signature(self, file_path: str) -> Optional[Tuple[str, int, int]]:
+        """توقيع الملف: (المسار المطلق، الحجم، وقت التعديل بالنانوثانية)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+    
+    def get(self, ffprobe_path: str, file_path: str,
+            registry: ProcessRegistry = None) -> Optional[MediaProbe]:
+        """إرجاع نتيجة الفحص من الذاكرة أو تشغيل ffprobe مرة واحدة
+        
+        registry (اختياري): سجل العمليات الذي تُشغّل عبره ffprobe ليصلها الإيقاف
+        """
+        signature = self._file_signature(file_path)
+        if signature is None:
+            return None
+        
+        probe = self._lookup(signature)
+        if probe is not None:
+            return probe
+        
+        probe = self._run_probe(ffprobe_path, file_path, registry)
+        if probe is None:
+            return None
+        
+        self._store(signature, probe)
+        return probe
+    
+    def get_many(self, ffprobe_path: str, file_paths: List[str],
+                 registry: ProcessRegistry = None, workers: int = None) -> Dict[str, Optional[MediaProbe]]:
+        """فحص ملفات كثيرة دفعة واحدة
+        
+        ffprobe يقبل ملف إدخال واحد فقط لكل تشغيل، لذلك تُشغّل الملفات غير المحفوظة
+        عبر مجموعة محدودة من عمليات ffprobe المتزامنة حتى يتداخل زمن إنشاء العمليات
+        وتحميل البرنامج مع فحص الملفات الأخرى بدلاً من دفعه لكل ملف على التوالي.
+        """
+        results = {}
+        pending = []
+        for file_path in file_paths:
+            signature = self._file_signature(file_path)
+            probe = self._lookup(signature) if signature else None
+            results[file_path] = probe
+            if signature and probe is None:
+                pending.append((file_path, signature))
+        
+        if not pending:
+            return results
+        
+        # عملية ffprobe لكل معالج افتراضياً: تحليل الحاويات يستهلك المعالج أيضاً
+        workers = min(workers or min(32, os.cpu_count() or 1), len(pending))
+        
+        def run(item: Tuple[str, Tuple[str, int, int]]) -> Optional[MediaProbe]:
+            return self._run_probe(ffprobe_path, item[0], registry)
+        
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                probes = list(executor.map(run, pending))
+        else:
+            probes = [run(item) for item in pending]
+        
+        for (file_path, signature), probe in zip(pending, probes):
+            results[file_path] = probe
+            if probe is not None:
+                self._store(signature, probe)
+        
+        return results
+    
+    def peek(self, file_path: str) -> Optional[MediaProbe]:
+        """النتيجة المحفوظة إن كانت مطابقة للنسخة الحالية من الملف، دون تشغيل ffprobe"""
+        signature = self._file_signature(file_path)
+        if signature is None:
+            return None
+        return self._lookup(signature)
+    
+    def store(self, file_path: str, probe: MediaProbe):
+        """حفظ نتيجة فحص تم تشغيله خارج الذاكرة المؤقتة (مثل الواجهة غير المتزامنة)"""
+        signature = self._file_signature(file_path)
+        if signature is not None:
+            self._store(signature, probe)
+    
+    def _lookup(self, signature: Tuple[str, int, int]) -> Optional[MediaProbe]:
+        """البحث عن نتيجة مطابقة للتوقيع"""
+        path, size, mtime = signature
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == size and entry[1] == mtime:
+                self._entries.move_to_end(path)
+                return entry[2]
+        return None
+    
+    def _store(self, signature: Tuple[str, int, int], probe: MediaProbe):
+        """حفظ نتيجة مع إزالة الأقدم استخداماً عند تجاوز الحد"""
+        path, size, mtime = signature
+        with self._lock:
+            # استبدال أي نتيجة قديمة لنفس المسار (تغير الملف) ثم إزالة الأقدم
+            self._entries[path] = (size, mtime, probe)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, file_path: str = None):
+        """حذف نتيجة ملف محدد أو تفريغ الذاكرة بالكامل"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+    
+    @staticmethod
+    def probe_command(ffprobe_path: str, file_path: str) -> List[str]:
+        """أمر ffprobe الواحد للحصول على الصيغة والمسارات معاً بصيغة JSON"""
+        return [
+            ffprobe_path,
+            '-v', 'quiet',
+            '-print_format', 'json',
+            '-show_format',
+            '-show_streams',
+            file_path
+        ]
+    
+    def _run_probe(self, ffprobe_path: str, file_path: str,
+                   registry: ProcessRegistry = None) -> Optional[MediaProbe]:
+        """تشغيل ffprobe مرة واحدة للحصول على الصيغة والمسارات معاً"""
+        cmd = self.probe_command(ffprobe_path, file_path)
+        
+        spawn = registry.spawn if registry else popen
+        
+        try:
+            process = spawn(cmd, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            try:
+                stdout, _ = process.communicate()
+            finally:
+                if registry:
+                    registry.unregister(process)
+            
+            if process.returncode != 0:
+                return None
+            return MediaProbe(file_path, json.loads(stdout.decode('utf-8')))
+        except ProcessCancelledError:
+            return None
+        except Exception as e:
+            print(f"خطأ في فحص الملف: {e}")
+            return None
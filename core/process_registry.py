@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+سجل العمليات الفرعية
+يتتبع كل عملية FFmpeg/FFprobe حية حتى يصلها الإيقاف فوراً
+"""
+
+import os
+import sys
+import time
+import shutil
+import threading
+import subprocess
+from collections import deque
+from functools import lru_cache
+from typing import List, Set
+
+# خيارات التشغيل الافتراضية لتقليل كلفة إنشاء العمليات:
+# - Windows: بدون إنشاء نافذة طرفية لكل عملية
+# - Linux مع بايثون 3.10+: الخيارات الافتراضية (vfork) أسرع من posix_spawn
+# - بقية أنظمة POSIX: بدون close_fds حتى يستخدم subprocess المسار السريع posix_spawn
+#   (الواصفات المفتوحة في بايثون غير قابلة للتوريث افتراضياً، PEP 446)
+if os.name == 'nt':
+    SPAWN_OPTIONS = {'creationflags': subprocess.CREATE_NO_WINDOW}
+elif sys.platform.startswith('linux') and sys.version_info >= (3, 10):
+    SPAWN_OPTIONS = {}
+else:
+    SPAWN_OPTIONS = {'close_fds': False}
+
+@lru_cache(maxsize=32)
+def _resolve_executable(name: str) -> str:
+    """المسار الكامل للبرنامج (posix_spawn يتطلب مساراً يحتوي على مجلد)"""
+    if os.path.dirname(name):
+        return name
+    return shutil.which(name) or name
+
+def popen(cmd: List[str], **kwargs) -> subprocess.Popen:
+    """تشغيل عملية بخيارات التشغيل السريعة (تتقدم عليها الخيارات الممررة)"""
+    options = dict(SPAWN_OPTIONS)
+    options.update(kwargs)
+    return subprocess.Popen([_resolve_executable(cmd[0])] + list(cmd[1:]), **options)
+
+def decode_output(data: bytes) -> str:
+    """فك ترميز مخرجات عملية (stderr عادة) لعرضها للمستخدم"""
+    return data.decode('utf-8', errors='replace').strip()
+
+class OutputTail:
+    """آخر أسطر مخرجات عملية كبايتات خام في حلقة محدودة
+    
+    تُقرأ المخرجات على دفعات فتبقى الذاكرة ثابتة مهما طالت المهمة، ولا يُفك
+    ترميز شيء حتى تُطلب الرسالة (عند الفشل فقط). السطر الأطول من max_line_bytes
+    يُحتفظ بنهايته لأن FFmpeg يكتب سبب الخطأ في آخر السطر.
+    """
+    
+    def __init__(self, max_lines: int = 50, max_line_bytes: int = 4096):
+        self.lines = deque(maxlen=max(1, max_lines))
+        self.max_line_bytes = max_line_bytes
+        self._partial = False
+    
+    def feed(self, chunk: bytes):
+        """إضافة دفعة من المخرجات (قد تنتهي في منتصف سطر)"""
+        for line in chunk.splitlines(keepends=True):
+            if self._partial:
+                line = self.lines.pop() + line
+            self.lines.append(line[-self.max_line_bytes:])
+            self._partial = not line.endswith((b'\n', b'\r'))
+    
+    def read_from(self, stream, chunk_size: int = 65536):
+        """قراءة مجرى حتى نهايته (يُستدعى في خيط قارئ)"""
+        read = getattr(stream, 'read1', stream.read)
+        for chunk in iter(lambda: read(chunk_size), b''):
+            self.feed(chunk)
+    
+    def getvalue(self) -> bytes:
+        """الأسطر المحفوظة كبايتات"""
+        return b''.join(self.lines)
+    
+    def text(self) -> str:
+        """الأسطر المحفوظة بعد فك ترميزها"""
+        return decode_output(self.getvalue())
+
+class ProcessCancelledError(Exception):
+    """محاولة تشغيل عملية جديدة بعد طلب الإيقاف"""
+    pass
+
+class ProcessRegistry:
+    """سجل العمليات الحية مع إيقاف جماعي"""
+    
+    def __init__(self, kill_timeout: float = 0.5):
+        """تهيئة السجل
+        
+        kill_timeout: المهلة بالثواني بين طلب الإنهاء والقتل القسري
+        """
+        self.kill_timeout = kill_timeout
+        self._processes: Set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self.spawn_count = 0        # عدد العمليات التي شُغّلت عبر السجل (للقياس)
+    
+    @property
+    def cancelled(self) -> bool:
+        """هل تم طلب الإيقاف"""
+        return self._cancelled
+    
+    def reset(self):
+        """السماح بتشغيل عمليات جديدة (بداية مهمة جديدة)"""
+        with self._lock:
+            self._cancelled = False
+    
+    def spawn(self, cmd: List[str], **kwargs) -> subprocess.Popen:
+        """تشغيل عملية وتسجيلها؛ يرفض التشغيل بعد طلب الإيقاف"""
+        with self._lock:
+            # التشغيل داخل القفل حتى لا تفلت عملية من cancel()
+            if self._cancelled:
+                raise ProcessCancelledError("تم إيقاف العملية بواسطة المستخدم")
+            process = popen(cmd, **kwargs)
+            self._processes.add(process)
+            self.spawn_count += 1
+        return process
+    
+    def unregister(self, process: subprocess.Popen):
+        """إزالة عملية منتهية من السجل"""
+        with self._lock:
+            self._processes.discard(process)
+    
+    def active_count(self) -> int:
+        """عدد العمليات الحية المسجلة"""
+        with self._lock:
+            return len(self._processes)
+    
+    def cancel(self):
+        """إيقاف جميع العمليات الحية ومنع تشغيل عمليات جديدة"""
+        with self._lock:
+            self._cancelled = True
+            processes = list(self._processes)
+        
+        for process in processes:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+        
+        if processes:
+            # القتل القسري لمن لم ينته خلال المهلة دون حجب المستدعي (خيط الواجهة)
+            threading.Thread(target=self._kill_survivors, args=(processes,), daemon=True).start()
+    
+    def _kill_survivors(self, processes: List[subprocess.Popen]):
+        """قتل العمليات التي تجاهلت طلب الإنهاء"""
+        deadline = time.monotonic() + self.kill_timeout
+        for process in processes:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                try:
+                    process.kill()
+                except OSError:
+                    pass
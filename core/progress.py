@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+نشر التقدم
+يدمج تحديثات التقدم المتقاربة ويحد من معدل إرسالها للواجهة أو لأي مستهلك آخر
+"""
+
+import time
+import threading
+from typing import Optional, Callable, Dict, List, Tuple
+from datetime import timedelta
+
+def format_progress_message(message: str, stats: Dict) -> str:
+    """إضافة السرعة (x الزمن الحقيقي) والوقت المتبقي إلى رسالة التقدم"""
+    if not stats or not stats.get('speed'):
+        return message
+    
+    message = f"{message} - {stats['speed']:.1f}x"
+    if stats.get('eta') is not None:
+        message += f" - متبقي {timedelta(seconds=int(stats['eta']))}"
+    return message
+
+class ProgressPublisher:
+    """ناشر تقدم مدمج ومحدود المعدل
+    
+    يحتفظ بآخر قيمة فقط: التحديثات التي تصل خلال فترة min_interval تُدمج في قيمة
+    واحدة تُرسل عند انتهاء الفترة، فلا يُفقد آخر تحديث ولا يتأخر العامل أبداً.
+    الإرسال المؤجل يتم من خيط واحد دائم يُنشأ عند أول حاجة إليه.
+    """
+    
+    def __init__(self, callback: Callable[[float, str], None] = None, min_interval: float = 0.1):
+        """تهيئة الناشر"""
+        self.callback = callback
+        self.min_interval = max(0.0, float(min_interval))
+        
+        self._lock = threading.Lock()        # يحمي القيمة المعلقة وموعد الإرسال
+        self._emit_lock = threading.Lock()   # يضمن ترتيب الإرسال للمستهلك
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: Optional[Tuple[float, str]] = None
+        self._last_emit = 0.0
+        self._deadline: Optional[float] = None
+        self._flusher: Optional[threading.Thread] = None
+    
+    def set_callback(self, callback: Callable[[float, str], None]):
+        """تعيين دالة الاستدعاء"""
+        self.callback = callback
+    
+    def publish(self, percentage: float, message: str, force: bool = False):
+        """نشر تحديث تقدم؛ force يرسله فوراً دون انتظار الفترة"""
+        with self._lock:
+            self._pending = (percentage, message)
+            now = time.monotonic()
+            remaining = self.min_interval - (now - self._last_emit)
+            
+            if not force and remaining > 0:
+                # تحديد موعد إرسال القيمة الأخيرة عند انتهاء الفترة (موعد واحد فقط)
+                if self._deadline is None:
+                    self._deadline = now + remaining
+                    if self._flusher is None:
+                        self._flusher = threading.Thread(
+                            target=self._flush_loop, name='progress-flush', daemon=True
+                        )
+                        self._flusher.start()
+                    self._wakeup.notify()
+                return
+            self._deadline = None
+        
+        self._drain()
+    
+    def flush(self):
+        """إرسال أي تحديث معلق فوراً"""
+        with self._lock:
+            self._deadline = None
+        
+        self._drain()
+    
+    def reset(self):
+        """إلغاء أي تحديث معلق وبدء فترة جديدة"""
+        with self._lock:
+            self._deadline = None
+            self._pending = None
+            self._last_emit = 0.0
+    
+    def _flush_loop(self):
+        """خيط الإرسال المؤجل: ينتظر موعد الإرسال ثم يرسل القيمة المعلقة"""
+        while True:
+            with self._wakeup:
+                while self._deadline is None or self._deadline > time.monotonic():
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._wakeup.wait(timeout)
+                self._deadline = None
+            
+            self._drain()
+    
+    def _drain(self):
+        """إرسال القيمة المعلقة إن وجدت"""
+        with self._emit_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = None
+                if pending is None:
+                    return
+                self._last_emit = time.monotonic()
+            
+            if self.callback:
+                self.callback(*pending)
+
+class FFmpegProgressParser:
+    """محلل تدفقي لمخرجات FFmpeg عبر -progress
+    
+    يستقبل الأسطر كبايتات كما تصل من الأنبوب ويحدّث حقوله في مكانها دون فك ترميز
+    النص أو إنشاء قواميس جديدة؛ كل كتلة تنتهي بسطر progress=continue أو progress=end.
+    """
+    
+    __slots__ = ('out_time', 'speed', 'bitrate', 'finished')
+    
+    def __init__(self):
+        """تهيئة المحلل"""
+        self.out_time = 0.0   # الموضع الحالي في الإخراج بالثواني
+        self.speed = 0.0      # السرعة بالنسبة للزمن الحقيقي (x)
+        self.bitrate = 0.0    # معدل البت الحالي (kbit/s)
+        self.finished = False
+    
+    def feed(self, line: bytes) -> bool:
+        """معالجة سطر واحد؛ يعيد True عند اكتمال كتلة تقدم"""
+        key, _, value = line.strip().partition(b'=')
+        
+        if key == b'out_time_us' or key == b'out_time_ms':
+            # كلا المفتاحين بالميكروثانية في FFmpeg
+            if value[:1].isdigit():
+                self.out_time = int(value) / 1_000_000
+        elif key == b'speed':
+            value = value.strip().rstrip(b'x')
+            if value[:1].isdigit():
+                self.speed = float(value)
+        elif key == b'bitrate':
+            value = value.strip()
+            if value[:1].isdigit():
+                self.bitrate = float(value.partition(b'k')[0])
+        elif key == b'progress':
+            self.finished = value == b'end'
+            return True
+        
+        return False
+
+class JobProgress:
+    """تجميع تقدم الأجزاء (المتوازية) وحساب السرعة الكلية والوقت المتبقي"""
+    
+    def __init__(self, durations: List[float]):
+        """تهيئة المتتبع بمدة كل جزء بالثواني"""
+        self.durations = list(durations)
+        self.processed = [0.0] * len(self.durations)
+        self.total_duration = sum(self.durations) or 1.0
+        self.processed_total = 0.0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def update(self, index: int, media_seconds: float):
+        """تحديث الموضع الحالي لجزء"""
+        media_seconds = min(max(media_seconds, 0.0), self.durations[index])
+        with self._lock:
+            self.processed_total += media_seconds - self.processed[index]
+            self.processed[index] = media_seconds
+    
+    def complete(self, index: int):
+        """تعليم الجزء كمكتمل"""
+        self.update(index, self.durations[index])
+    
+    def snapshot(self) -> Dict:
+        """نسبة الإنجاز والسرعة (x الزمن الحقيقي) والوقت المتبقي بالثواني"""
+        with self._lock:
+            processed = self.processed_total
+        
+        elapsed = time.monotonic() - self.started
+        speed = processed / elapsed if elapsed > 0 else 0.0
+        remaining = self.total_duration - processed
+        eta = remaining / speed if speed > 0 else None
+        
+        return {
+            'fraction': min(processed / self.total_duration, 1.0),
+            'processed': processed,
+            'speed': speed,
+            'eta': eta
+        }
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+كشف تغيّر المشاهد
+يفك FFmpeg الفيديو إلى إطارات رمادية مصغّرة جداً بمعدل إطارات منخفض، وتُحسب
+الفروق بين الإطارات المتتالية دفعة واحدة لكل مجموعة إطارات باستخدام NumPy داخل
+مخازن ثابتة الحجم، فتبقى الذاكرة محدودة مهما كانت دقة الفيديو أو طوله
+
+NumPy اختياري: يُستورد عند الحاجة فقط، وبدونه يعود التخطيط إلى التقسيم الثابت
+"""
+
+import subprocess
+from array import array
+from typing import Optional
+
+from core.process_registry import ProcessRegistry, ProcessCancelledError, popen
+
+def _import_numpy():
+    """استيراد NumPy عند الحاجة فقط"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("تخطيط القطع عند تغيّر المشهد يتطلب تثبيت NumPy (pip install numpy)")
+    return numpy
+
+def find_scene_changes(ffmpeg_path: str, file_path: str, stream_index: int,
+                       threshold: float = 0.1, sample_fps: float = 5.0,
+                       width: int = 64, height: int = 36, batch_frames: int = 256,
+                       registry: ProcessRegistry = None) -> Optional[array]:
+    """أوقات تغيّر المشهد (بالثواني) مرتبة تصاعدياً، أو None عند الفشل
+    
+    درجة التغيّر: متوسط الفرق المطلق بين إطارين متتاليين مقسوماً على 255،
+    ويُعتبر الإطار بداية مشهد جديد إذا بلغت درجته threshold.
+    """
+    numpy = _import_numpy()
+    
+    cmd = [
+        ffmpeg_path,
+        '-v', 'error',
+        '-i', file_path,
+        '-map', f"0:{stream_index}",
+        '-an', '-sn', '-dn',
+        '-vf', f"fps={sample_fps},scale={width}:{height}:flags=area,format=gray",
+        '-f', 'rawvideo',
+        '-pix_fmt', 'gray',
+        'pipe:1'
+    ]
+    
+    frame_size = width * height
+    
+    # الصف 0 يحمل آخر إطار من المجموعة السابقة حتى يُقارن به أول إطار في المجموعة التالية
+    frames = numpy.empty((batch_frames + 1, frame_size), dtype=numpy.uint8)
+    differences = numpy.empty((batch_frames, frame_size), dtype=numpy.int16)
+    scores = numpy.empty(batch_frames, dtype=numpy.float32)
+    raw = memoryview(frames).cast('B')
+    limit = threshold * 255
+    
+    changes = array('d')
+    first_row = 0           # أول صف يُملأ: 0 للمجموعة الأولى ثم 1 بعد حمل الإطار السابق
+    base_frame = 0          # رقم الإطار الموجود في الصف 0
+    spawn = registry.spawn if registry else popen
+    
+    try:
+        process = spawn(cmd, stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except ProcessCancelledError:
+        return None
+    
+    try:
+        while True:
+            filled = first_row * frame_size
+            while filled < len(raw):
+                count = process.stdout.readinto(raw[filled:])
+                if not count:
+                    break
+                filled += count
+            
+            rows = filled // frame_size
+            pairs = rows - 1
+            if pairs > 0:
+                # فروق جميع الإطارات المتتالية في المجموعة دفعة واحدة
+                diff = differences[:pairs]
+                numpy.subtract(frames[1:rows], frames[:pairs], out=diff, dtype=numpy.int16)
+                numpy.abs(diff, out=diff)
+                numpy.mean(diff, axis=1, out=scores[:pairs])
+                
+                for i in numpy.flatnonzero(scores[:pairs] >= limit):
+                    changes.append((base_frame + int(i) + 1) / sample_fps)
+            
+            if filled < len(raw) or rows == 0:
+                break
+            
+            frames[0] = frames[rows - 1]
+            base_frame += pairs
+            first_row = 1
+        
+        returncode = process.wait()
+    finally:
+        process.stdout.close()
+        if registry:
+            registry.unregister(process)
+    
+    if returncode != 0:
+        return None
+    return changes
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+تخطيط نقاط القطع
+تحويل نقاط مرشحة مرتبة (إطارات مفتاحية، ...) إلى حدود أجزاء قريبة من المدة المطلوبة
+"""
+
+from typing import List, Tuple, Sequence
+
+from core.keyframe_index import nearest_in_sorted
+
+def snap_boundaries(candidates: Sequence[float], total_duration: float,
+                    segment_seconds: float, tolerance: float) -> List[float]:
+    """اختيار حدود الأجزاء: عند كل مدة مستهدفة يُختار أقرب مرشح ضمن الهامش
+    
+    تُحسب المدة المستهدفة التالية من الحد الفعلي السابق حتى تبقى الأجزاء قريبة من
+    المدة المطلوبة، وإذا لم يوجد مرشح ضمن الهامش يُستخدم الوقت المستهدف نفسه.
+    """
+    # هامش أقل من نصف المدة يضمن تقدم الحدود وعدم تداخل الأجزاء
+    tolerance = min(tolerance, segment_seconds / 2)
+    
+    boundaries = []
+    target = segment_seconds
+    while target < total_duration:
+        snapped = nearest_in_sorted(candidates, target, tolerance)
+        boundary = snapped if snapped is not None else target
+        if boundary >= total_duration:
+            break
+        boundaries.append(boundary)
+        target = boundary + segment_seconds
+    
+    # دمج ذيل قصير جداً مع الجزء الأخير بدلاً من جزء شبه فارغ
+    if boundaries and total_duration - boundaries[-1] < tolerance:
+        boundaries.pop()
+    
+    return boundaries
+
+def boundaries_to_segments(boundaries: List[float], total_duration: float) -> List[Tuple[float, float]]:
+    """تحويل حدود القطع إلى أجزاء (بداية، نهاية)"""
+    points = [0.0] + list(boundaries) + [total_duration]
+    return [(points[i], points[i + 1]) for i in range(len(points) - 1)]
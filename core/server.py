@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""
+خادم مهام HTTP محلي
+يستقبل مهام التقطيع من أدوات وأجهزة أخرى وينفذها عبر مجموعة عمال محدودة،
+لكل عامل MediaProcessor خاص به، مع طابور محدود يرفض المهام الزائدة برمز 503
+
+الاستخدام:
+    python -m core.server --port 8765 --workers 2
+
+نقاط النهاية:
+    POST   /jobs                {"input_file", "duration", "format", "output_dir", "split_mode"}
+    GET    /jobs                قائمة المهام
+    GET    /jobs/<id>           حالة مهمة
+    GET    /jobs/<id>/events    تقدم المهمة كأحداث Server-Sent Events
+    GET    /jobs/<id>/outputs   ملفات الأجزاء الناتجة
+    DELETE /jobs/<id>           إلغاء مهمة منتظرة أو جارية
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+from collections import OrderedDict, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, List, Tuple
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+from core.probe_cache import ProbeCache
+from core.cli import emit, resolve_output_format
+
+# حالات المهمة
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+FINAL_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+class Job:
+    """مهمة تقطيع واحدة مع آخر حالة لها؛ القراء ينتظرون تغيّر رقم الإصدار"""
+    
+    def __init__(self, input_file: str, segment_duration: float, output_format: str,
+                 output_dir: str, custom_dir: str = None, split_mode: str = None):
+        """تهيئة المهمة في حالة الانتظار"""
+        self.id = uuid.uuid4().hex[:12]
+        self.input_file = input_file
+        self.segment_duration = segment_duration
+        self.output_format = output_format
+        self.output_dir = output_dir
+        self.custom_dir = custom_dir
+        self.split_mode = split_mode
+        self.status = STATUS_QUEUED
+        self.percent = 0.0
+        self.message = ''
+        self.speed = None
+        self.eta = None
+        self.created = time.time()
+        self.finished_at = None
+        self.cancel_requested = False
+        self.processor = None
+        self.version = 0
+        self._condition = threading.Condition()
+    
+    @property
+    def finished(self) -> bool:
+        """هل انتهت المهمة (بنجاح أو فشل أو إلغاء)"""
+        return self.status in FINAL_STATUSES
+    
+    def update(self, **fields):
+        """تحديث الحالة وإيقاظ المنتظرين"""
+        with self._condition:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            if self.finished and self.finished_at is None:
+                self.finished_at = time.time()
+            self.version += 1
+            self._condition.notify_all()
+    
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """انتظار تغيّر الحالة عن الإصدار المعطى وإرجاع الإصدار الحالي"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+    
+    def outputs(self) -> List[Dict]:
+        """ملفات الأجزاء الموجودة في مجلد الإخراج"""
+        try:
+            with os.scandir(self.output_dir) as it:
+                entries = [(entry.name, entry.path, entry.stat().st_size)
+                           for entry in it if entry.is_file()]
+        except OSError:
+            return []
+        return [{'name': name, 'path': path, 'size': size} for name, path, size in sorted(entries)]
+    
+    def to_dict(self) -> Dict:
+        """تمثيل قابل للتحويل إلى JSON"""
+        with self._condition:
+            return {
+                'id': self.id,
+                'input_file': self.input_file,
+                'duration': self.segment_duration,
+                'format': self.output_format,
+                'output_dir': self.output_dir,
+                'status': self.status,
+                'percent': round(self.percent, 2),
+                'message': self.message,
+                'speed': round(self.speed, 2) if self.speed else None,
+                'eta': round(self.eta, 1) if self.eta is not None else None,
+                'created': self.created,
+                'finished_at': self.finished_at
+            }
+
+class JobServer:
+    """مجموعة عمال محدودة حول MediaProcessor مع طابور مهام محدود"""
+    
+    def __init__(self, config, workers: int = None, queue_size: int = None,
+                 history_size: int = None):
+        """تهيئة الخادم دون تشغيل العمال"""
+        settings = config.processing_settings
+        self.config = config
+        self.workers = max(1, workers or settings.get('server_workers', 2))
+        self.history_size = history_size or settings.get('server_job_history', 100)
+        self.jobs: Dict[str, Job] = OrderedDict()
+        self.probe_cache = ProbeCache(settings.get('probe_cache_size', 64))
+        self.queue_size = max(1, queue_size or settings.get('server_queue_size', 16))
+        # المهام المنتظرة؛ المهمة الملغاة تُحذف منها فوراً فلا تشغل مكاناً في الطابور
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+    
+    def start(self):
+        """تشغيل خيوط العمال"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def shutdown(self, timeout: float = 5.0):
+        """إلغاء جميع المهام وإيقاف العمال"""
+        for job in list(self.jobs.values()):
+            self.cancel(job.id)
+        with self._available:
+            self._stopping = True
+            self._available.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def submit(self, input_file: str, segment_duration: float, output_format: str,
+               output_dir: str = None, split_mode: str = None) -> Job:
+        """إضافة مهمة إلى الطابور؛ يرفع queue.Full إذا كان الطابور ممتلئاً
+        
+        مجلد الإخراج المحدد يُنشأ عند بدء تنفيذ المهمة، فلا تترك المهام المرفوضة مجلدات فارغة.
+        """
+        if output_dir:
+            folder_name = self.config.create_output_folder_name(input_file, output_format)
+            planned_dir = os.path.join(output_dir, folder_name)
+        else:
+            planned_dir = self.config.get_output_directory(input_file, output_format)
+        job = Job(input_file, segment_duration, output_format, planned_dir, output_dir, split_mode)
+        
+        with self._available:
+            if len(self._pending) >= self.queue_size:
+                raise queue.Full
+            self._pending.append(job)
+            self.jobs[job.id] = job
+            self._trim_history()
+            self._available.notify()
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """البحث عن مهمة بمعرّفها"""
+        with self._lock:
+            return self.jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Job]:
+        """جميع المهام بترتيب الإضافة"""
+        with self._lock:
+            return list(self.jobs.values())
+    
+    def queued_count(self) -> int:
+        """عدد المهام المنتظرة في الطابور"""
+        with self._lock:
+            return len(self._pending)
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """إلغاء مهمة: المنتظرة تُلغى مباشرة والجارية تُوقف عملياتها فوراً"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            
+            job.cancel_requested = True
+            if job.status == STATUS_QUEUED:
+                # تحرير مكانها في الطابور فوراً
+                if job in self._pending:
+                    self._pending.remove(job)
+                job.update(status=STATUS_CANCELLED, message="تم إلغاء المهمة")
+            elif job.processor is not None:
+                job.processor.stop_processing()
+        return job
+    
+    def _trim_history(self):
+        """حذف أقدم المهام المنتهية من الذاكرة عند تجاوز الحد"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self.jobs) - self.history_size)]:
+            del self.jobs[job_id]
+    
+    def _worker(self):
+        """حلقة عامل واحد بمعالج وسائط خاص به"""
+        processor = MediaProcessor(self.config, probe_cache=self.probe_cache)
+        
+        while True:
+            with self._available:
+                self._available.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    break
+                job = self._pending.popleft()
+            try:
+                self._run_job(processor, job)
+            except Exception as e:
+                job.update(status=STATUS_FAILED, message=f"خطأ أثناء معالجة الملف: {e}")
+    
+    def _run_job(self, processor: MediaProcessor, job: Job):
+        """تنفيذ مهمة واحدة وتحديث حالتها"""
+        with self._lock:
+            if job.cancel_requested:
+                return
+            job.processor = processor
+            job.update(status=STATUS_RUNNING, message="بدء المعالجة")
+        
+        if job.custom_dir:
+            try:
+                os.makedirs(job.custom_dir, exist_ok=True)
+            except OSError as e:
+                with self._lock:
+                    job.processor = None
+                job.update(status=STATUS_FAILED, message=f"تعذر إنشاء مجلد الإخراج: {e}")
+                return
+        
+        result = {}
+        
+        def on_progress(percentage: float, message: str):
+            # قد يصل الإلغاء قبل أن يبدأ المعالج عملياته فيُعاد إرساله هنا
+            if job.cancel_requested:
+                processor.stop_processing()
+            stats = processor.last_stats
+            job.update(percent=percentage, message=message,
+                       speed=stats.get('speed'), eta=stats.get('eta'))
+        
+        def on_completion(success: bool, message: str, output_path: str):
+            result['message'] = message
+        
+        processor.set_progress_callback(on_progress)
+        processor.set_completion_callback(on_completion)
+        try:
+            success = processor.process_media_file(
+                job.input_file, job.segment_duration, job.output_format,
+                job.custom_dir, job.split_mode
+            )
+        finally:
+            processor.set_progress_callback(None)
+            processor.set_completion_callback(None)
+            with self._lock:
+                job.processor = None
+        
+        if job.cancel_requested:
+            job.update(status=STATUS_CANCELLED, message="تم إلغاء المهمة")
+        elif success:
+            job.update(status=STATUS_DONE, percent=100.0, message=result.get('message', ''), eta=0)
+        else:
+            job.update(status=STATUS_FAILED, message=result.get('message', "فشل في معالجة الملف"))
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """توجيه طلبات HTTP إلى JobServer"""
+    
+    server_version = 'MediaCutPro'
+    
+    # أقصى حجم لجسم الطلب بالبايت
+    max_body_size = 64 * 1024
+    
+    # الفترة بين رسائل إبقاء الاتصال في أحداث SSE (ثانية)
+    keepalive_interval = 15.0
+    
+    _JOB_PATH = re.compile(r'^/jobs/([0-9a-f]+)(/events|/outputs)?/?$')
+    
+    @property
+    def jobs(self) -> JobServer:
+        """مدير المهام المرتبط بالخادم"""
+        return self.server.job_server
+    
+    def log_message(self, format: str, *args):
+        """كتم سجل الطلبات الافتراضي على stderr"""
+        pass
+    
+    def _send_json(self, status: int, data, headers: Dict[str, str] = None):
+        """إرسال استجابة JSON"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_error(self, status: int, message: str, headers: Dict[str, str] = None):
+        """إرسال رسالة خطأ بصيغة JSON"""
+        self._send_json(status, {'error': message}, headers)
+    
+    def _route(self) -> Tuple[Optional[Job], Optional[str]]:
+        """تحليل المسار /jobs/<id>[/events|/outputs]"""
+        match = self._JOB_PATH.match(self.path.split('?', 1)[0])
+        if not match:
+            return None, None
+        return self.jobs.get(match.group(1)), match.group(2) or ''
+    
+    def do_GET(self):
+        """قراءة حالة المهام ومخرجاتها وأحداث تقدمها"""
+        if self.path.split('?', 1)[0].rstrip('/') == '/jobs':
+            self._send_json(200, {
+                'jobs': [job.to_dict() for job in self.jobs.list_jobs()],
+                'queued': self.jobs.queued_count()
+            })
+            return
+        
+        job, action = self._route()
+        if action is None:
+            self._send_error(404, "المسار غير موجود")
+        elif job is None:
+            self._send_error(404, "المهمة غير موجودة")
+        elif action == '/events':
+            self._stream_events(job)
+        elif action == '/outputs':
+            self._send_json(200, {'id': job.id, 'output_dir': job.output_dir, 'files': job.outputs()})
+        else:
+            self._send_json(200, job.to_dict())
+    
+    def do_POST(self):
+        """إضافة مهمة تقطيع"""
+        if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+            self._send_error(404, "المسار غير موجود")
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.max_body_size:
+            self._send_error(413, "حجم الطلب غير مقبول")
+            return
+        
+        try:
+            data = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+            if not isinstance(data, dict):
+                raise ValueError("يجب أن يكون جسم الطلب كائن JSON")
+            input_file = str(data.get('input_file', ''))
+            duration = float(data.get('duration', self.jobs.config.default_split_duration))
+        except (ValueError, TypeError) as e:
+            self._send_error(400, f"طلب غير صالح: {e}")
+            return
+        
+        if not os.path.isfile(input_file):
+            self._send_error(400, "الملف غير موجود")
+            return
+        if duration <= 0:
+            self._send_error(400, "مدة الجزء يجب أن تكون أكبر من صفر")
+            return
+        
+        output_format = resolve_output_format(self.jobs.config, input_file, data.get('format'))
+        if not output_format:
+            self._send_error(400, "صيغة الإخراج غير مدعومة لهذا الملف")
+            return
+        
+        split_mode = data.get('split_mode')
+        if split_mode not in (None, 'single_pass', 'per_segment'):
+            self._send_error(400, "محرك التقطيع غير معروف")
+            return
+        
+        output_dir = data.get('output_dir')
+        if output_dir and os.path.exists(output_dir) and not os.path.isdir(output_dir):
+            self._send_error(400, "مسار مجلد الإخراج ليس مجلداً")
+            return
+        
+        try:
+            job = self.jobs.submit(input_file, duration, output_format, output_dir, split_mode)
+        except queue.Full:
+            # ضغط عكسي: الطابور ممتلئ، على العميل إعادة المحاولة لاحقاً
+            self._send_error(503, "طابور المهام ممتلئ", {'Retry-After': '5'})
+            return
+        
+        self._send_json(202, job.to_dict(), {'Location': f"/jobs/{job.id}"})
+    
+    def do_DELETE(self):
+        """إلغاء مهمة"""
+        job, action = self._route()
+        if action != '':
+            self._send_error(404, "المسار غير موجود")
+        elif job is None:
+            self._send_error(404, "المهمة غير موجودة")
+        else:
+            self._send_json(200, self.jobs.cancel(job.id).to_dict())
+    
+    def _stream_events(self, job: Job):
+        """بث حالة المهمة كأحداث SSE حتى انتهائها
+        
+        يُرسل آخر حالة فقط عند كل تغيّر (لا تتراكم الأحداث للعملاء البطيئين)،
+        ويُختم البث بحدث done.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        version = None
+        try:
+            while True:
+                current = job.wait_for_change(version, self.keepalive_interval) \
+                    if version is not None else job.version
+                if current == version:
+                    self.wfile.write(b': keep-alive\n\n')
+                    self.wfile.flush()
+                    continue
+                
+                version = current
+                event = 'done' if job.finished else 'progress'
+                data = json.dumps(job.to_dict(), ensure_ascii=False)
+                self.wfile.write(f"event: {event}\nid: {version}\ndata: {data}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if job.finished:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            # أغلق العميل الاتصال
+            pass
+
+class JobHTTPServer(ThreadingHTTPServer):
+    """خادم HTTP بخيط لكل اتصال يحمل مرجع JobServer"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], job_server: JobServer):
+        """ربط الخادم بالعنوان (المنفذ 0 = منفذ متاح يختاره النظام)"""
+        self.job_server = job_server
+        super().__init__(address, JobRequestHandler)
+
+def create_server(config: AppConfig = None, host: str = '127.0.0.1', port: int = 0,
+                  workers: int = None, queue_size: int = None) -> JobHTTPServer:
+    """إنشاء الخادم وتشغيل عماله؛ التشغيل عبر serve_forever"""
+    job_server = JobServer(config or AppConfig(), workers, queue_size)
+    server = JobHTTPServer((host, port), job_server)
+    job_server.start()
+    return server
+
+def main(argv: List[str] = None) -> int:
+    """نقطة الدخول: python -m core.server"""
+    config = AppConfig()
+    parser = argparse.ArgumentParser(
+        prog='python -m core.server',
+        description='Media Cut Pro - خادم مهام التقطيع المحلي'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='عنوان الاستماع')
+    parser.add_argument('--port', type=int, default=8765, help='المنفذ (0 = منفذ متاح)')
+    parser.add_argument('--workers', type=int, help='عدد المهام المنفذة في نفس الوقت')
+    parser.add_argument('--queue-size', type=int, help='أقصى عدد للمهام المنتظرة')
+    parser.add_argument('--ffmpeg', help='مسار ffmpeg')
+    parser.add_argument('--ffprobe', help='مسار ffprobe')
+    args = parser.parse_args(argv)
+    
+    if args.ffmpeg:
+        config.ffmpeg_path = args.ffmpeg
+    if args.ffprobe:
+        config.ffprobe_path = args.ffprobe
+    
+    server = create_server(config, args.host, args.port, args.workers, args.queue_size)
+    host, port = server.server_address[:2]
+    emit({'event': 'listening', 'host': host, 'port': port})
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        emit({'event': 'stopping'})
+    finally:
+        server.server_close()
+        server.job_server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+كشف فترات الصمت
+تحليل مسار الصوت في تمريرة تدفقية واحدة: يفك FFmpeg الصوت إلى PCM أحادي بمعدل
+عينات منخفض، وتُحسب طاقة RMS لكل كتلة قصيرة باستخدام NumPy داخل مخزن ثابت الحجم
+حتى تبقى الذاكرة محدودة مهما كان طول الملف
+
+NumPy اختياري: يُستورد عند الحاجة فقط، وبدونه يعود التخطيط إلى التقسيم الثابت
+"""
+
+import subprocess
+from array import array
+from typing import Optional
+
+from core.process_registry import ProcessRegistry, ProcessCancelledError, popen
+
+def _import_numpy():
+    """استيراد NumPy عند الحاجة فقط"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("تخطيط القطع عند الصمت يتطلب تثبيت NumPy (pip install numpy)")
+    return numpy
+
+def find_silences(ffmpeg_path: str, file_path: str, stream_index: int,
+                  threshold_db: float = -40.0, min_silence: float = 0.3,
+                  sample_rate: int = 8000, block_seconds: float = 0.05,
+                  chunk_seconds: float = 10.0,
+                  registry: ProcessRegistry = None) -> Optional[array]:
+    """أوقات منتصف فترات الصمت (بالثواني) مرتبة تصاعدياً، أو None عند الفشل
+    
+    فترة الصمت: كتل متتالية طاقتها أقل من threshold_db (نسبة إلى أقصى مستوى)
+    ومدتها الكلية min_silence ثانية على الأقل.
+    """
+    numpy = _import_numpy()
+    
+    cmd = [
+        ffmpeg_path,
+        '-v', 'error',
+        '-i', file_path,
+        '-map', f"0:{stream_index}",
+        '-vn', '-sn', '-dn',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-f', 's16le',
+        '-acodec', 'pcm_s16le',
+        'pipe:1'
+    ]
+    
+    block_size = max(1, int(sample_rate * block_seconds))
+    blocks_per_chunk = max(1, int(chunk_seconds / block_seconds))
+    block_duration = block_size / sample_rate
+    min_blocks = max(1, int(round(min_silence / block_duration)))
+    
+    # مستوى العتبة كمربع سعة حتى تتم المقارنة بدون جذر تربيعي
+    threshold = (32768.0 * 10 ** (threshold_db / 20.0)) ** 2
+    
+    # مخازن تُحجز مرة واحدة ويعاد استخدامها لكل كتلة بيانات
+    samples = numpy.empty(block_size * blocks_per_chunk, dtype='<i2')
+    squares = numpy.empty(samples.shape, dtype=numpy.float32)
+    energy = numpy.empty(blocks_per_chunk, dtype=numpy.float32)
+    raw = memoryview(samples).cast('B')
+    
+    silences = array('d')
+    run_start = None        # رقم أول كتلة في فترة الصمت الحالية
+    block_number = 0
+    spawn = registry.spawn if registry else popen
+    
+    try:
+        process = spawn(cmd, stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except ProcessCancelledError:
+        return None
+    
+    try:
+        while True:
+            # ملء المخزن كاملاً (قد يعيد الأنبوب بيانات أقل من المطلوب)
+            filled = 0
+            while filled < len(raw):
+                count = process.stdout.readinto(raw[filled:])
+                if not count:
+                    break
+                filled += count
+            
+            blocks = filled // (block_size * 2)
+            if blocks == 0:
+                break
+            
+            used = blocks * block_size
+            numpy.multiply(samples[:used], samples[:used], out=squares[:used], dtype=numpy.float32)
+            numpy.mean(squares[:used].reshape(blocks, block_size), axis=1, out=energy[:blocks])
+            silent = energy[:blocks] < threshold
+            
+            # حدود فترات الصمت داخل الكتلة: تغيرات قيمة silent
+            changes = numpy.flatnonzero(numpy.diff(silent.view(numpy.int8)))
+            edges = [0] + [int(i) + 1 for i in changes] + [blocks]
+            
+            for start, end in zip(edges[:-1], edges[1:]):
+                if silent[start]:
+                    if run_start is None:
+                        run_start = block_number + start
+                elif run_start is not None:
+                    if block_number + start - run_start >= min_blocks:
+                        silences.append((run_start + block_number + start) / 2 * block_duration)
+                    run_start = None
+            
+            block_number += blocks
+            if filled < len(raw):
+                break
+        
+        returncode = process.wait()
+    finally:
+        process.stdout.close()
+        if registry:
+            registry.unregister(process)
+    
+    # صمت ممتد حتى نهاية الملف
+    if run_start is not None and block_number - run_start >= min_blocks:
+        silences.append((run_start + block_number) / 2 * block_duration)
+    
+    if returncode != 0:
+        return None
+    return silences
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+قياس زمن مراحل المعالجة
+فترات (spans) خفيفة لمراحل الفحص والتخطيط والتشغيل والإنهاء، تُجمع في مدرجات
+تكرارية لكل مهمة ويمكن تصديرها بصيغة Chrome trace-event JSON
+(تُفتح في chrome://tracing أو https://ui.perfetto.dev)
+
+عند التعطيل تعيد span() كائناً فارغاً مشتركاً فلا تكلف سوى فحص قيمة منطقية.
+التفعيل: الإعداد tracing أو متغير البيئة MEDIACUT_TRACE=1 أو enable() أثناء التشغيل
+
+الاستخدام:
+    tracer = get_tracer()
+    tracer.enable()
+    with tracer.span('probe', job, file='a.mp4'):
+        ...
+    tracer.export_chrome_trace('trace.json')
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from typing import Optional, Dict
+
+# حدود خانات المدرج التكراري بالملّي ثانية (الخانة الأخيرة لما فوق آخر حد)
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                       1000, 2500, 5000, 10000, 30000, 60000)
+
+class _NullSpan:
+    """فترة فارغة تُستخدم عند تعطيل القياس"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """فترة مقاسة تُسجل عند الخروج من كتلة with"""
+    
+    __slots__ = ('tracer', 'name', 'job', 'args', 'start')
+    
+    def __init__(self, tracer: 'Tracer', name: str, job: Optional[str], args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.job = job
+        self.args = args
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record(self.name, self.job, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+class _Histogram:
+    """مدرج تكراري لمدد مرحلة واحدة"""
+    
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    
+    def add(self, duration_ms: float):
+        self.count += 1
+        self.total += duration_ms
+        self.minimum = duration_ms if self.minimum is None else min(self.minimum, duration_ms)
+        self.maximum = max(self.maximum, duration_ms)
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, duration_ms)] += 1
+    
+    def percentile(self, fraction: float) -> float:
+        """تقدير المئين من حدود الخانات (الحد الأعلى للخانة التي يقع فيها)"""
+        target = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                return HISTOGRAM_BOUNDS_MS[i] if i < len(HISTOGRAM_BOUNDS_MS) else self.maximum
+        return self.maximum
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.minimum or 0.0, 3),
+            'max_ms': round(self.maximum, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets': list(self.buckets)
+        }
+
+class Tracer:
+    """مسجل فترات آمن للخيوط مع مدرجات لكل مهمة وتصدير Chrome trace"""
+    
+    def __init__(self, enabled: bool = False, max_events: int = 100000):
+        """تهيئة المسجل
+        
+        max_events: أقصى عدد للأحداث المحفوظة للتصدير (تُحذف الأقدم أولاً)؛
+        المدرجات التكرارية لا تتأثر بهذا الحد.
+        """
+        self.enabled = enabled
+        self._events = deque(maxlen=max_events)
+        self._histograms: Dict[str, Dict[str, _Histogram]] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+        self._job_counter = 0
+        self._lock = threading.Lock()
+    
+    def enable(self):
+        """تفعيل القياس أثناء التشغيل"""
+        self.enabled = True
+    
+    def disable(self):
+        """تعطيل القياس (تبقى البيانات المسجلة حتى clear)"""
+        self.enabled = False
+    
+    def begin_job(self, label: str) -> Optional[str]:
+        """معرّف مهمة جديد تُجمع تحته فترات المهمة، أو None عند التعطيل"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._job_counter += 1
+            return f"{self._job_counter}:{os.path.basename(label)}"
+    
+    def span(self, name: str, job: Optional[str] = None, **args):
+        """فترة مقاسة لكتلة with"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, job, args)
+    
+    def record(self, name: str, job: Optional[str], start_ns: int, end_ns: int, args: Dict = None):
+        """تسجيل فترة منتهية"""
+        thread = threading.current_thread()
+        duration_ms = (end_ns - start_ns) / 1e6
+        
+        with self._lock:
+            self._events.append((name, job, start_ns, end_ns, thread.ident, args))
+            self._thread_names.setdefault(thread.ident, thread.name)
+            stages = self._histograms.setdefault(job or '-', {})
+            histogram = stages.get(name)
+            if histogram is None:
+                histogram = stages[name] = _Histogram()
+            histogram.add(duration_ms)
+    
+    def summary(self, job: str = None) -> Dict[str, Dict[str, Dict]]:
+        """المدرجات التكرارية: {المهمة: {المرحلة: إحصاءات}}"""
+        with self._lock:
+            return {
+                job_id: {name: histogram.to_dict() for name, histogram in stages.items()}
+                for job_id, stages in self._histograms.items()
+                if job is None or job_id == job
+            }
+    
+    def chrome_trace(self) -> Dict:
+        """الأحداث بصيغة Chrome trace-event (فترات كاملة ph=X بالميكروثانية)"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in thread_names.items()
+        ]
+        for name, job, start_ns, end_ns, tid, args in events:
+            event_args = dict(args or {})
+            if job is not None:
+                event_args['job'] = job
+            trace_events.append({
+                'name': name,
+                'cat': 'media',
+                'ph': 'X',
+                'ts': (start_ns - self._origin) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': event_args
+            })
+        
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+    
+    def export_chrome_trace(self, path: str) -> bool:
+        """كتابة الأحداث إلى ملف JSON"""
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f, ensure_ascii=False, default=str)
+            return True
+        except OSError as e:
+            print(f"خطأ في حفظ ملف القياس: {e}")
+            return False
+    
+    def clear(self):
+        """حذف جميع الأحداث والمدرجات"""
+        with self._lock:
+            self._events.clear()
+            self._histograms.clear()
+            self._thread_names.clear()
+
+_tracer = Tracer(os.environ.get('MEDIACUT_TRACE', '').lower() in ('1', 'true', 'yes'))
+
+def get_tracer() -> Tracer:
+    """المسجل المشترك للعملية"""
+    return _tracer
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""إعداد الاختبارات: استيراد المشروع من أي مجلد، وملفات وسائط مولّدة لاختبارات FFmpeg"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import AppConfig
+
+@pytest.fixture
+def ffmpeg_config() -> AppConfig:
+    """إعدادات تشير إلى FFmpeg مثبت؛ يتخطى الاختبار إن لم يوجد"""
+    config = AppConfig()
+    found, message = config.validate_ffmpeg_installation()
+    if not found:
+        pytest.skip(message)
+    config.processing_settings['index_cache_max_mb'] = 0
+    return config
+
+@pytest.fixture
+def sample_video(ffmpeg_config, tmp_path) -> str:
+    """ملف فيديو وصوت قصير (20 ثانية، إطار مفتاحي كل ثانية)"""
+    path = str(tmp_path / 'sample.mp4')
+    subprocess.run([
+        ffmpeg_config.ffmpeg_path, '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', 'testsrc2=size=160x120:rate=25:duration=20',
+        '-f', 'lavfi', '-i', 'sine=frequency=440:duration=20',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', '25', '-c:a', 'aac', path
+    ], check=True)
+    return path
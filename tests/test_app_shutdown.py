@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""اختبار إيقاف المعالجة عند إغلاق التطبيق"""
+
+from types import SimpleNamespace
+
+import pytest
+
+tk = pytest.importorskip('tkinter')
+
+from app import MediaCutProApp
+
+class FakeProcessor:
+    """معالج يسجل طلب الإيقاف"""
+    
+    stopped = False
+    
+    def stop_processing(self):
+        self.stopped = True
+
+def test_closing_stops_processor_created_before_startup_finished():
+    application = MediaCutProApp()
+    # بدأ المستخدم مهمة قبل finish_startup فأنشأت النافذة المعالج بنفسها
+    processor = FakeProcessor()
+    application.main_window = SimpleNamespace(media_processor=processor)
+    
+    with pytest.raises(SystemExit):
+        application.on_closing()
+    assert processor.stopped
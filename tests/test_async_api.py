@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""اختبارات واجهة asyncio"""
+
+import os
+import asyncio
+
+from core.async_api import split
+
+def test_split_creates_missing_output_directory(ffmpeg_config, sample_video, tmp_path):
+    """مجلد الإخراج غير الموجود يُنشأ ولا يُستبدل بمجلد الملف الأصلي"""
+    output_directory = str(tmp_path / 'new' / 'dir')
+    
+    result = asyncio.run(split(sample_video, 0.25, 'mp4', output_directory, config=ffmpeg_config))
+    
+    assert result.success, result.message
+    assert os.path.dirname(result.output_dir) == output_directory
+    assert len(os.listdir(result.output_dir)) == len(result.segments) == 2
+
+def test_split_reports_unusable_output_directory(ffmpeg_config, sample_video, tmp_path):
+    """تعذر إنشاء المجلد خطأ يُبلّغ عنه، لا كتابة في مكان آخر"""
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    
+    result = asyncio.run(split(sample_video, 0.25, 'mp4', str(blocker / 'dir'), config=ffmpeg_config))
+    
+    assert not result.success
+    assert not result.segments
+    # لا مجلد أجزاء بجوار الملف الأصلي
+    assert sorted(os.listdir(tmp_path)) == ['file', 'sample.mp4']
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""اختبارات استئناف الطابور الدائم"""
+
+import pytest
+
+from config.settings import AppConfig
+from core.batch_queue import BatchQueue
+from core.media_processor import MediaProcessor
+from core.process_registry import ProcessCancelledError
+
+INPUT_FILE = '/media/lecture.mkv'
+
+class FakeSplitter:
+    """بديل FFmpeg: مخطط قابل للتغيير وتشغيل أجزاء يسجل ما نُفذ ويوقف الطابور عند الطلب"""
+    
+    def __init__(self, monkeypatch, processor: MediaProcessor):
+        self.boundaries = [0.0, 10.0, 20.0, 30.0]
+        self.stop_at = None         # (الجزء، الطابور): إيقاف الطابور عند بدء هذا الجزء
+        self.runs = []
+        monkeypatch.setattr(processor, 'probe_many', lambda file_paths, workers=None: {})
+        monkeypatch.setattr(processor, 'get_media_info', lambda file_path: {'duration': 30.0})
+        monkeypatch.setattr(processor, 'calculate_segments', self.calculate_segments)
+        monkeypatch.setattr(processor, 'run_segment', self.run_segment)
+    
+    def calculate_segments(self, total_duration, segment_duration, input_file=None, planner=None):
+        return list(zip(self.boundaries[:-1], self.boundaries[1:]))
+    
+    def run_segment(self, input_file, output_file, start_time, end_time, output_format,
+                    on_progress=None, registry=None):
+        if self.stop_at and self.stop_at[0] == (start_time, end_time):
+            # انقطاع التشغيل في منتصف المهمة
+            self.stop_at[1].stop()
+            raise ProcessCancelledError()
+        self.runs.append((start_time, end_time))
+        with open(output_file, 'wb') as f:
+            f.write(b'part')
+        return 0, b''
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path):
+    config = AppConfig()
+    config.processing_settings['max_concurrent_processes'] = 1
+    processor = MediaProcessor(config)
+    splitter = FakeSplitter(monkeypatch, processor)
+    
+    def make_queue() -> BatchQueue:
+        # طابور جديد من الملف نفسه كما بعد إعادة تشغيل البرنامج
+        return BatchQueue(config, processor, state_path=str(tmp_path / 'queue.json'))
+    
+    queue = make_queue()
+    queue.add(INPUT_FILE, 0.5, 'mkv', str(tmp_path))
+    return config, splitter, queue, make_queue
+
+def test_resume_reuses_the_saved_cut_plan(setup):
+    config, splitter, queue, make_queue = setup
+    splitter.stop_at = ((20.0, 30.0), queue)
+    assert queue.run() == {'done': 0, 'failed': 0}
+    
+    # المخطط يعطي الآن حدوداً مختلفة
+    splitter.stop_at = None
+    splitter.boundaries = [0.0, 12.0, 24.0, 30.0]
+    splitter.runs.clear()
+    
+    resumed = make_queue()
+    assert resumed.run() == {'done': 1, 'failed': 0}
+    assert splitter.runs == [(20.0, 30.0)]
+    assert next(iter(resumed.jobs.values()))['segments'] == [[0.0, 10.0], [10.0, 20.0], [20.0, 30.0]]
+
+def test_resume_redoes_parts_after_codec_settings_change(setup):
+    config, splitter, queue, make_queue = setup
+    splitter.stop_at = ((20.0, 30.0), queue)
+    queue.run()
+    
+    splitter.stop_at = None
+    splitter.runs.clear()
+    config.processing_settings['codec_mode'] = 'transcode'
+    
+    assert make_queue().run() == {'done': 1, 'failed': 0}
+    assert splitter.runs == [(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""اختبارات دمج تحديثات التقدم"""
+
+import time
+import threading
+
+from core.progress import ProgressPublisher
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    """انتظار تحقق شرط مع مهلة"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+def test_updates_are_coalesced_and_the_last_one_is_delivered():
+    received = []
+    publisher = ProgressPublisher(lambda percentage, message: received.append(percentage), 0.05)
+    
+    for i in range(1, 101):
+        publisher.publish(float(i), '')
+    
+    assert received == [1.0]
+    assert wait_until(lambda: received[-1] == 100.0)
+    assert len(received) == 2
+
+def test_one_flush_thread_serves_every_interval():
+    threads = set()
+    
+    def on_progress(percentage: float, message: str):
+        threads.add(threading.current_thread())
+    
+    publisher = ProgressPublisher(on_progress, 0.01)
+    before = threading.active_count()
+    
+    for i in range(40):
+        publisher.publish(float(i), '')
+        time.sleep(0.003)
+        publisher.publish(float(i) + 0.5, '')
+        assert threading.active_count() <= before + 1
+    
+    assert wait_until(lambda: publisher._pending is None)
+    assert len(threads - {threading.current_thread()}) == 1
+
+def test_flush_and_reset_cancel_the_scheduled_update():
+    received = []
+    publisher = ProgressPublisher(lambda percentage, message: received.append(percentage), 0.05)
+    
+    publisher.publish(1.0, '')
+    publisher.publish(2.0, '')
+    publisher.flush()
+    assert received == [1.0, 2.0]
+    
+    publisher.publish(3.0, '')
+    publisher.reset()
+    time.sleep(0.1)
+    assert received == [1.0, 2.0]
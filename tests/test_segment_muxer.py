@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""اختبارات أمر مقسّم segment في محرك single_pass"""
+
+from fractions import Fraction
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+
+# 23.976 إطار/ثانية مع إطار مفتاحي كل 1445 إطاراً
+FRAME_DURATION = Fraction(1001, 24000)
+GOP_FRAMES = 1445
+
+def make_processor(monkeypatch) -> MediaProcessor:
+    """معالج بدون فحص ملف حقيقي"""
+    processor = MediaProcessor(AppConfig())
+    monkeypatch.setattr(processor, 'analyze_media_streams', lambda file_path: {
+        'video_streams': [], 'audio_streams': [], 'subtitle_streams': [], 'total_streams': 0
+    })
+    return processor
+
+def emitted_segment_times(cmd):
+    return cmd[cmd.index('-segment_times') + 1].split(',')
+
+def segments_for(boundaries):
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def test_segment_times_do_not_pass_keyframes(monkeypatch):
+    """نقاط القطع المرسلة لا تتجاوز الإطارات المفتاحية المخططة بإطاراتها غير الصحيحة"""
+    processor = make_processor(monkeypatch)
+    keyframes = [FRAME_DURATION * GOP_FRAMES * k for k in range(1, 8)]
+    # ffprobe يطبع pts_time مقرّباً إلى أقرب ميكروثانية (للأعلى أحياناً)
+    planned = [round(float(keyframe), 6) for keyframe in keyframes]
+    segments = segments_for([0.0] + planned + [planned[-1] + 30.0])
+    
+    cmd = processor.build_segment_muxer_command('input.mp4', '/tmp/out', segments, 'mp4')
+    emitted = emitted_segment_times(cmd)
+    
+    assert len(emitted) == len(keyframes)
+    for value, keyframe in zip(emitted, keyframes):
+        # عند الإطار المفتاحي أو قبله، وبعد الإطار الذي يسبقه
+        assert Fraction(value) <= keyframe
+        assert keyframe - Fraction(value) < FRAME_DURATION / 2
+
+def test_segment_times_are_not_rounded_to_milliseconds(monkeypatch):
+    """الحد 60.268542 لا يُرسل كـ 60.269 (بعد الإطار المفتاحي)"""
+    processor = make_processor(monkeypatch)
+    keyframe = FRAME_DURATION * GOP_FRAMES
+    
+    cmd = processor.build_segment_muxer_command(
+        'input.mp4', '/tmp/out', segments_for([0.0, 60.268542, 120.0]), 'mp4'
+    )
+    value = Fraction(emitted_segment_times(cmd)[0])
+    
+    assert keyframe - FRAME_DURATION / 2 < value <= keyframe
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""اختبارات خادم المهام عبر HTTP على منفذ يختاره النظام"""
+
+import json
+import threading
+import http.client
+
+import pytest
+
+from core.media_processor import MediaProcessor
+from core.server import create_server
+
+class Gate:
+    """يؤخر بدء المعالجة الفعلية حتى يُفتح، ليبقى العامل مشغولاً أثناء ملء الطابور"""
+    
+    def __init__(self, monkeypatch):
+        self.started = threading.Event()
+        self.opened = threading.Event()
+        process_media_file = MediaProcessor.process_media_file
+        
+        def gated(processor, *args, **kwargs):
+            self.started.set()
+            self.opened.wait(30)
+            return process_media_file(processor, *args, **kwargs)
+        
+        monkeypatch.setattr(MediaProcessor, 'process_media_file', gated)
+
+@pytest.fixture
+def server(ffmpeg_config):
+    """خادم بعامل واحد وطابور يتسع لمهمة واحدة"""
+    server = create_server(ffmpeg_config, port=0, workers=1, queue_size=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.job_server.shutdown()
+
+def request(server, method: str, path: str, body: dict = None):
+    """إرسال طلب وإرجاع (الرمز، الترويسات، النص)"""
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        payload = json.dumps(body) if body is not None else None
+        connection.request(method, path, payload, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read().decode('utf-8')
+    finally:
+        connection.close()
+
+def read_events(server, job_id: str):
+    """قراءة بث SSE كاملاً حتى يغلقه الخادم وإرجاع [(الحدث، البيانات)]"""
+    status, headers, text = request(server, 'GET', f"/jobs/{job_id}/events")
+    assert status == 200
+    assert headers['Content-Type'].startswith('text/event-stream')
+    events = []
+    for block in text.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+def test_submit_backpressure_cancel_and_events(monkeypatch, server, sample_video, tmp_path):
+    gate = Gate(monkeypatch)
+    job = {'input_file': sample_video, 'duration': 0.2, 'output_dir': str(tmp_path / 'out')}
+    
+    status, headers, text = request(server, 'POST', '/jobs', job)
+    assert status == 202
+    running = json.loads(text)
+    assert headers['Location'] == f"/jobs/{running['id']}"
+    assert gate.started.wait(10)
+    
+    # العامل مشغول: الأولى تنتظر في الطابور والثانية تُرفض
+    status, _, text = request(server, 'POST', '/jobs', job)
+    assert status == 202
+    queued = json.loads(text)
+    status, headers, _ = request(server, 'POST', '/jobs', job)
+    assert status == 503
+    assert headers['Retry-After'] == '5'
+    
+    # إلغاء المنتظرة يحرر مكانها فوراً
+    status, _, text = request(server, 'DELETE', f"/jobs/{queued['id']}")
+    assert status == 200
+    assert json.loads(text)['status'] == 'cancelled'
+    status, _, text = request(server, 'GET', '/jobs')
+    assert json.loads(text)['queued'] == 0
+    status, _, _ = request(server, 'POST', '/jobs', dict(job, output_dir=str(tmp_path / 'next')))
+    assert status == 202
+    
+    gate.opened.set()
+    events = read_events(server, running['id'])
+    assert [name for name, _ in events[:-1]] == ['progress'] * (len(events) - 1)
+    assert events[-1][0] == 'done'
+    assert events[-1][1]['status'] == 'done'
+    
+    status, _, text = request(server, 'GET', f"/jobs/{running['id']}/outputs")
+    assert len(json.loads(text)['files']) == 2
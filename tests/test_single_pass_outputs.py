@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""اختبارات محرك single_pass مع مجلد إخراج يحتوي أجزاء تشغيل سابق"""
+
+import os
+
+import pytest
+
+from config.settings import AppConfig
+from core.media_processor import MediaProcessor
+from core.process_registry import ProcessCancelledError
+
+INPUT_FILE = '/media/lecture.mkv'
+SEGMENTS = [(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)]
+
+@pytest.fixture
+def processor(monkeypatch) -> MediaProcessor:
+    """معالج بدون فحص ملف حقيقي"""
+    processor = MediaProcessor(AppConfig())
+    monkeypatch.setattr(processor, 'analyze_media_streams', lambda file_path: {
+        'video_streams': [], 'audio_streams': [], 'subtitle_streams': [], 'total_streams': 0
+    })
+    return processor
+
+@pytest.fixture
+def previous_parts(processor, tmp_path):
+    """أجزاء تشغيل سابق بأسماء أجزاء هذا التشغيل نفسها"""
+    parts = [processor.generate_output_filename(INPUT_FILE, str(tmp_path), i + 1, 'mkv') for i in range(3)]
+    for part in parts:
+        with open(part, 'wb') as f:
+            f.write(b'previous run')
+        # وقت تعديل قديم حتى تختلف الكتابة الجديدة عنه مهما كانت دقة نظام الملفات
+        os.utime(part, (1000000000, 1000000000))
+    return parts
+
+def read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def fake_muxer(monkeypatch, processor, write_parts, result):
+    """استبدال FFmpeg بدالة تكتب أجزاء معينة ثم تعيد result (أو ترفعه)"""
+    def run_ffmpeg(cmd, on_progress=None, registry=None):
+        for part, data in write_parts:
+            with open(part, 'wb') as f:
+                f.write(data)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    monkeypatch.setattr(processor, '_run_ffmpeg', run_ffmpeg)
+
+def test_failure_removes_only_the_part_this_run_was_writing(monkeypatch, processor, previous_parts, tmp_path):
+    fake_muxer(monkeypatch, processor,
+               [(previous_parts[0], b'complete'), (previous_parts[1], b'partial')], (1, b'error'))
+    
+    assert processor._split_single_pass(INPUT_FILE, str(tmp_path), SEGMENTS, 'mkv') == 0
+    assert read(previous_parts[0]) == b'complete'
+    assert not os.path.exists(previous_parts[1])
+    assert read(previous_parts[2]) == b'previous run'
+
+def test_cancel_before_writing_keeps_previous_parts(monkeypatch, processor, previous_parts, tmp_path):
+    fake_muxer(monkeypatch, processor, [], ProcessCancelledError())
+    
+    assert processor._split_single_pass(INPUT_FILE, str(tmp_path), SEGMENTS, 'mkv') == 0
+    assert [read(part) for part in previous_parts] == [b'previous run'] * 3
+
+def test_stale_parts_are_not_counted_as_produced(monkeypatch, processor, previous_parts, tmp_path):
+    # المقسّم دمج آخر جزء في السابق (لا إطار مفتاحي بعد آخر نقطة قطع)
+    fake_muxer(monkeypatch, processor,
+               [(previous_parts[0], b'part 1'), (previous_parts[1], b'part 2 + tail')], (0, b''))
+    
+    assert processor._split_single_pass(INPUT_FILE, str(tmp_path), SEGMENTS, 'mkv') == 2
+    assert read(previous_parts[2]) == b'previous run'
@@ -4,19 +4,23 @@ Main application window - simplified and optimized version
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk
 import os
-import threading
-import time
+
+from ui.styles import AnimationScheduler
 
 class MainWindow:
     """النافذة الرئيسية للتطبيق"""
     
-    def __init__(self, root, config, media_processor):
-        """تهيئة النافذة الرئيسية"""
+    def __init__(self, root, config, media_processor=None):
+        """تهيئة النافذة الرئيسية
+        
+        media_processor اختياري: عند غيابه يُنشأ عند أول حاجة إليه
+        (get_media_processor) لتُرسم النافذة قبل تحميل وحدات المعالجة.
+        """
         self.root = root
         self.config = config
-        self.media_processor = media_processor
+        self.media_processor = None
         
         # متغيرات الواجهة
         self.selected_file = tk.StringVar()
@@ -28,24 +32,32 @@ class MainWindow:
         self.is_processing = False
         self.last_output_path = ""
         
-        # متغيرات الأنيميشن
+        # متغيرات الأنيميشن (كلها على مؤقت after() واحد دون خيوط)
+        self.animation_scheduler = AnimationScheduler(root)
         self.spinner_pattern = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         self.spinner_index = 0
-        self.animation_thread = None
         self.animation_running = False
         
         # أنيميشن شريط الحالة المستمر
-        self.status_spinner_thread = None
         self.status_animation_running = False
         
         # متغيرات التقدم المحسنة
         self.current_progress = 0.0
         self.current_message = "Ready"
-        self.smooth_update_thread = None
+        
+        # جسر التقدم بين خيط المعالجة وخيط الواجهة:
+        # خيط المعالجة يكتب آخر قيمة فقط، ومؤقت after() واحد يطبقها بمعدل ثابت
+        self.update_interval_ms = 33    # ~30 تحديث في الثانية مهما كان عدد أحداث FFmpeg
+        self._pending_progress = None   # آخر (النسبة، الرسالة) من خيط المعالجة
+        self._applied_progress = None   # آخر قيمة طُبقت على الواجهة
+        self._pending_completion = None # (النجاح، الرسالة، مسار الإخراج) عند انتهاء المعالجة
+        self._poll_after_id = None
         
         # إعداد الواجهة
         self.setup_ui()
         self.setup_callbacks()
+        if media_processor is not None:
+            self.attach_media_processor(media_processor)
     
     def setup_ui(self):
         """إعداد واجهة المستخدم المبسطة"""
@@ -246,7 +258,8 @@ class MainWindow:
         
         dialog.destroy()
         
-        # عرض الرسالة العادية
+        # عرض الرسالة العادية (تحميل الوحدة عند أول رسالة)
+        from tkinter import messagebox
         if msg_type == "info":
             return messagebox.showinfo(title, message)
         elif msg_type == "error":
@@ -286,42 +299,35 @@ class MainWindow:
         """بدء أنيميشن الـ spinner في قسم التقدم"""
         if not self.status_animation_running:
             self.status_animation_running = True
-            # تحديث فوري أولاً
-            self.spinner_var.set("⠋")
-            # بدء الخيط
-            self.status_spinner_thread = threading.Thread(target=self._animate_status_spinner, daemon=True)
-            self.status_spinner_thread.start()
+            self.animation_scheduler.add('status_spinner', self._animate_status_spinner, 100)  # سرعة دوران أسرع
     
     def stop_status_animation(self):
         """إيقاف أنيميشن شريط الحالة"""
         self.status_animation_running = False
-        if self.status_spinner_thread and self.status_spinner_thread.is_alive():
-            self.status_spinner_thread.join(timeout=0.1)
-        self.status_spinner_thread = None
+        self.animation_scheduler.remove('status_spinner')
     
     def _animate_status_spinner(self):
         """دوران الأنيميشن في قسم التقدم بجانب النسبة المئوية"""
-        while self.status_animation_running:
-            try:
-                # الحصول على الرمز الحالي للأنيميشن
-                spinner = self.spinner_pattern[self.spinner_index % len(self.spinner_pattern)]
-                
-                # تحديث الأنيميشن بأمان
-                self.root.after(0, lambda text=spinner: self.spinner_var.set(text))
-                
-                # تحديث مؤشر الأنيميشن
-                self.spinner_index = (self.spinner_index + 1) % len(self.spinner_pattern)
-                
-                time.sleep(0.1)  # سرعة دوران أسرع
-                
-            except Exception:
-                break
+        spinner = self.spinner_pattern[self.spinner_index % len(self.spinner_pattern)]
+        self.spinner_var.set(spinner)
+        self.spinner_index = (self.spinner_index + 1) % len(self.spinner_pattern)
     
     def setup_callbacks(self):
         """إعداد الاستدعاءات"""
         self.selected_file.trace_add('write', self.on_file_changed)
-        self.media_processor.set_progress_callback(self.update_progress)
-        self.media_processor.set_completion_callback(self.on_processing_completed)
+    
+    def attach_media_processor(self, media_processor):
+        """ربط معالج الوسائط باستدعاءات النافذة"""
+        self.media_processor = media_processor
+        media_processor.set_progress_callback(self.update_progress)
+        media_processor.set_completion_callback(self.post_completion)
+    
+    def get_media_processor(self):
+        """معالج الوسائط، مع إنشائه عند أول استخدام"""
+        if self.media_processor is None:
+            from core.media_processor import MediaProcessor
+            self.attach_media_processor(MediaProcessor(self.config))
+        return self.media_processor
     
     def browse_file(self):
         """تصفح الملفات"""
@@ -332,6 +338,7 @@ class MainWindow:
             ("جميع الملفات", "*.*")
         ]
         
+        from tkinter import filedialog
         filename = filedialog.askopenfilename(
             title="اختر ملف وسائط",
             filetypes=file_types
@@ -348,6 +355,7 @@ class MainWindow:
     
     def browse_output(self):
         """تصفح مجلد الإخراج"""
+        from tkinter import filedialog
         directory = filedialog.askdirectory(title="اختر مجلد الإخراج")
         if directory:
             self.output_directory.set(directory)
@@ -399,12 +407,18 @@ class MainWindow:
         output_format = format_text.split(' - ')[0] if ' - ' in format_text else format_text
         output_dir = self.output_directory.get() if self.output_directory.get() else None
         
-        success = self.media_processor.process_media_file_async(
+        self._pending_progress = None
+        self._applied_progress = None
+        self._pending_completion = None
+        
+        success = self.get_media_processor().process_media_file_async(
             input_file, duration, output_format, output_dir
         )
         
         if not success:
             self.on_processing_completed(False, "فشل في بدء المعالجة", "")
+        else:
+            self.start_update_polling()
     
     def stop_processing(self):
         """إيقاف المعالجة"""
@@ -433,74 +447,87 @@ class MainWindow:
         return True
     
     def update_progress(self, percentage, message):
-        """تحديث التقدم مع عرض المعلومات في المكان المناسب"""
-        # تحديث التقدم والرسالة بشكل آمن
-        self.current_progress = float(percentage)
-        self.current_message = str(message)
+        """استقبال التقدم من خيط المعالجة
         
-        # تحديث شريط التقدم
-        self.root.after(0, lambda: self.progress_var.set(self.current_progress))
+        لا تلمس عناصر Tk: تكتب آخر قيمة في خانة واحدة (إسناد ذري)
+        ويطبقها _poll_updates على خيط الواجهة، فتُدمج القيم المتوسطة.
+        """
+        self._pending_progress = (float(percentage), str(message))
+    
+    def post_completion(self, success, message, output_path):
+        """استقبال إشعار الإنجاز من خيط المعالجة وتسليمه لخيط الواجهة"""
+        self._pending_completion = (success, message, output_path)
+    
+    def start_update_polling(self):
+        """بدء مؤقت تطبيق التقدم على خيط الواجهة"""
+        if self._poll_after_id is None:
+            self._poll_after_id = self.root.after(self.update_interval_ms, self._poll_updates)
+    
+    def _poll_updates(self):
+        """تطبيق آخر تقدم وإشعار الإنجاز (على خيط الواجهة)"""
+        self._poll_after_id = None
+        
+        progress = self._pending_progress
+        if progress is not None and progress is not self._applied_progress:
+            self._applied_progress = progress
+            self._apply_progress(*progress)
+        
+        completion = self._pending_completion
+        if completion is not None:
+            self._pending_completion = None
+            self.on_processing_completed(*completion)
+            return
+        
+        if self.is_processing:
+            self._poll_after_id = self.root.after(self.update_interval_ms, self._poll_updates)
+    
+    def _apply_progress(self, percentage, message):
+        """تحديث شريط التقدم ومعلوماته"""
+        self.current_progress = percentage
+        self.current_message = message
+        self.progress_var.set(percentage)
         
         # عرض معلومات التقدم في المكان المخصص
-        if self.current_progress > 0:
-            progress_text = f"{self.current_message} ({self.current_progress:.1f}%)"
-            self.root.after(0, lambda: self.progress_info_var.set(progress_text))
+        if percentage > 0:
+            self.progress_info_var.set(f"{message} ({percentage:.1f}%)")
         else:
-            self.root.after(0, lambda: self.progress_info_var.set(""))
-        
-        # إجباري تحديث الواجهة
-        self.root.update_idletasks()
+            self.progress_info_var.set("")
     
     def start_animation(self):
         """بدء الأنيميشن المستمر"""
         if not self.animation_running:
             self.animation_running = True
-            self.animation_thread = threading.Thread(target=self._animate_spinner, daemon=True)
-            self.animation_thread.start()
+            self.animation_scheduler.add('spinner', self._animate_spinner, 200)  # سرعة دوران أبطأ قليلاً لوضوح أكثر
     
     def start_smooth_updates(self):
         """بدء التحديثات السلسة للنص"""
-        if not self.smooth_update_thread:
-            self.smooth_update_thread = threading.Thread(target=self._smooth_text_updates, daemon=True)
-            self.smooth_update_thread.start()
+        self.animation_scheduler.add('smooth_text', self._smooth_text_updates, 200)
     
     def stop_animation(self):
         """إيقاف الأنيميشن"""
         self.animation_running = False
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.animation_thread.join(timeout=0.1)
-        
-        if self.smooth_update_thread and self.smooth_update_thread.is_alive():
-            self.smooth_update_thread.join(timeout=0.1)
-        
-        self.smooth_update_thread = None
+        self.animation_scheduler.remove('spinner')
+        self.animation_scheduler.remove('smooth_text')
     
     def _animate_spinner(self):
-        """تحديث الأنيميشن في خيط منفصل - يستمر في الدوران"""
-        while self.animation_running:
-            self.spinner_index = (self.spinner_index + 1) % len(self.spinner_pattern)
-            time.sleep(0.2)  # سرعة دوران أبطأ قليلاً لوضوح أكثر
+        """تقدم مؤشر الأنيميشن - يستمر في الدوران"""
+        self.spinner_index = (self.spinner_index + 1) % len(self.spinner_pattern)
     
     def _smooth_text_updates(self):
         """تحديث النص بسلاسة مع الأنيميشن"""
-        while self.animation_running and self.is_processing:
-            try:
-                # الحصول على الرمز الحالي للأنيميشن
-                spinner = self.spinner_pattern[self.spinner_index % len(self.spinner_pattern)]
-                
-                # تنسيق الرسالة مع الأنيميشن والنسبة
-                if self.current_progress < 100:
-                    animated_text = f"{spinner} {self.current_message} ({self.current_progress:.1f}%)"
-                else:
-                    animated_text = f"✅ {self.current_message} (100.0%)"
-                
-                # تحديث النص بأمان
-                self.root.after(0, lambda text=animated_text: self.status_var.set(text))
-                
-                time.sleep(0.2)  # تحديث النص مع الأنيميشن - أبطأ لوضوح أكثر
-                
-            except Exception:
-                break
+        if not (self.animation_running and self.is_processing):
+            return False
+        
+        # الحصول على الرمز الحالي للأنيميشن
+        spinner = self.spinner_pattern[self.spinner_index % len(self.spinner_pattern)]
+        
+        # تنسيق الرسالة مع الأنيميشن والنسبة
+        if self.current_progress < 100:
+            animated_text = f"{spinner} {self.current_message} ({self.current_progress:.1f}%)"
+        else:
+            animated_text = f"✅ {self.current_message} (100.0%)"
+        
+        self.status_var.set(animated_text)
     
     def on_processing_completed(self, success, message, output_path):
         """إنجاز المعالجة"""
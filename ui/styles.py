@@ -4,6 +4,7 @@
 يحتوي على تحسينات بصرية وتنسيق متقدم لواجهة Tkinter
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk
 
@@ -187,49 +188,135 @@ class TooltipManager:
         widget.bind("<Enter>", on_enter)
         widget.bind("<Leave>", on_leave)
 
+class AnimationScheduler:
+    """مؤقت واحد على حلقة أحداث Tk يقود جميع الحركات
+    
+    كل حركة دالة تُستدعى كل period_ms على خيط الواجهة؛ يُجدول استدعاء after()
+    واحد فقط لأقرب موعد، فلا خيوط ولا استيقاظ عند عدم وجود حركات.
+    يتوقف المؤقت عند تصغير النافذة ويُستأنف عند إظهارها.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self.tasks = {}         # الاسم -> [الدالة، الفترة بالثواني، الموعد القادم]
+        self.paused = False
+        self._after_id = None
+        
+        root.bind('<Unmap>', self._on_unmap, add='+')
+        root.bind('<Map>', self._on_map, add='+')
+    
+    def add(self, name, callback, period_ms):
+        """تسجيل حركة (تستبدل حركة سابقة بنفس الاسم) وتشغيلها فوراً"""
+        self.tasks[name] = [callback, period_ms / 1000.0, time.monotonic()]
+        self._reschedule()
+    
+    def remove(self, name):
+        """إيقاف حركة"""
+        self.tasks.pop(name, None)
+        if not self.tasks:
+            self._cancel()
+    
+    def is_running(self, name):
+        """هل الحركة مسجلة"""
+        return name in self.tasks
+    
+    def _on_unmap(self, event):
+        # الحدث يصل أيضاً من العناصر الفرعية عبر وسم النافذة الرئيسية
+        if event.widget is self.root:
+            self.paused = True
+            self._cancel()
+    
+    def _on_map(self, event):
+        if event.widget is self.root and self.paused:
+            self.paused = False
+            now = time.monotonic()
+            for task in self.tasks.values():
+                task[2] = min(task[2], now)
+            self._reschedule()
+    
+    def _cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _reschedule(self):
+        """جدولة استدعاء واحد لأقرب موعد"""
+        self._cancel()
+        if self.paused or not self.tasks:
+            return
+        delay = min(task[2] for task in self.tasks.values()) - time.monotonic()
+        self._after_id = self.root.after(max(1, int(delay * 1000)), self._tick)
+    
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        
+        for name, task in list(self.tasks.items()):
+            callback, period, due = task
+            if due > now:
+                continue
+            # الموعد القادم من الموعد المحدد لا من الآن، مع عدم تكديس الاستدعاءات المتأخرة
+            task[2] = due + period if due + period > now else now + period
+            try:
+                if callback() is False:
+                    self.tasks.pop(name, None)
+            except tk.TclError:
+                # العنصر أُتلف
+                self.tasks.pop(name, None)
+        
+        self._reschedule()
+
 class AnimationManager:
     """مدير الحركات البسيطة"""
     
-    def __init__(self, root):
+    def __init__(self, root, scheduler=None):
         self.root = root
+        self.scheduler = scheduler or AnimationScheduler(root)
         self.animations = {}
     
     def fade_in(self, widget, duration=500):
         """تأثير ظهور تدريجي"""
         steps = 20
-        step_time = duration // steps
-        alpha_step = 1.0 / steps
+        state = {'step': 0}
         
-        def animate_step(current_alpha, step):
-            if step <= steps:
-                try:
-                    widget.configure(state='normal')
-                    # تطبيق التأثير البصري
-                    self.root.after(step_time, lambda: animate_step(current_alpha + alpha_step, step + 1))
-                except:
-                    pass
+        def animate_step():
+            state['step'] += 1
+            widget.configure(state='normal')
+            # تطبيق التأثير البصري
+            if state['step'] >= steps:
+                self.animations.pop(widget, None)
+                return False
         
-        animate_step(0, 1)
+        self._start(widget, 'fade', animate_step, duration // steps)
     
     def pulse_color(self, widget, color1, color2, duration=1000):
         """تأثير تغيير لون نابض"""
         def pulse():
-            try:
-                current_bg = widget.cget('background')
-                new_color = color2 if current_bg == color1 else color1
-                widget.configure(background=new_color)
-                self.root.after(duration, pulse)
-            except:
-                pass
+            current_bg = widget.cget('background')
+            new_color = color2 if current_bg == color1 else color1
+            widget.configure(background=new_color)
         
-        pulse()
+        self._start(widget, 'pulse', pulse, duration)
+    
+    def stop(self, widget):
+        """إيقاف حركة العنصر"""
+        name = self.animations.pop(widget, None)
+        if name:
+            self.scheduler.remove(name)
+    
+    def _start(self, widget, kind, callback, period_ms):
+        self.stop(widget)
+        name = f"{kind}:{widget}"
+        self.animations[widget] = name
+        self.scheduler.add(name, callback, period_ms)
 
 class ProgressIndicator:
     """مؤشر تقدم محسن"""
     
-    def __init__(self, parent, style_manager):
+    def __init__(self, parent, style_manager, scheduler=None):
         self.parent = parent
         self.style_manager = style_manager
+        self.scheduler = scheduler
         self.is_active = False
         
         # إطار المؤشر
@@ -291,7 +378,11 @@ class ProgressIndicator:
     def start_indeterminate(self, status_text="جاري المعالجة..."):
         """بدء وضع التقدم غير المحدد"""
         self.progress_bar.config(mode='indeterminate')
-        self.progress_bar.start(10)
+        if self.scheduler:
+            # خطوة كل 50 ملّي ثانية عبر المؤقت المشترك بدلاً من مؤقت ttk الخاص (كل 10)
+            self.scheduler.add(self._task_name(), lambda: self.progress_bar.step(5), 50)
+        else:
+            self.progress_bar.start(10)
         self.status_label.config(text=status_text)
         self.percentage_label.config(text="")
         self.is_active = True
@@ -299,10 +390,16 @@ class ProgressIndicator:
     def stop_indeterminate(self):
         """إيقاف وضع التقدم غير المحدد"""
         if self.is_active:
-            self.progress_bar.stop()
+            if self.scheduler:
+                self.scheduler.remove(self._task_name())
+            else:
+                self.progress_bar.stop()
             self.progress_bar.config(mode='determinate')
             self.is_active = False
     
+    def _task_name(self):
+        return f"indeterminate:{self.progress_bar}"
+    
     def reset(self):
         """إعادة تعيين المؤشر"""
         self.stop_indeterminate()